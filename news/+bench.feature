@@ -0,0 +1 @@
+Added the `transmute bench` command, to generate reproducible synthetic exports, measure the throughput of the pipeline against them, and compare benchmark results.
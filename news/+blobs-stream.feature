@@ -0,0 +1 @@
+Blobs are now decoded and written to disk in chunks, reducing the peak memory used when exporting large files. The peak RSS of the process is logged, in debug mode, after each blob is written.
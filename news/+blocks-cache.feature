@@ -0,0 +1 @@
+Added a persistent cache of the HTML to Volto blocks conversions, with its hits and misses in the final report.
@@ -0,0 +1 @@
+Added the `blocks_workers` setting, to convert the HTML of the items to Volto blocks in a process pool, ahead of the pipeline.
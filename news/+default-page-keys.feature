@@ -0,0 +1 @@
+Containers waiting for their default page now only keep the keys merged into it in memory, instead of the whole item.
@@ -0,0 +1 @@
+Items scheduled for post-processing are now kept in memory and written once, after their post-processing steps ran, unless `defer_post_processing` is disabled.
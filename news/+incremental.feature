@@ -0,0 +1 @@
+Added the `--incremental` option to `transmute run`, to only process the content files changed since the previous incremental run.
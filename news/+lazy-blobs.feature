@@ -0,0 +1 @@
+Added the `lazy` option to `[steps.blobs]`, keeping blob payloads in the source files, as references, until they are exported.
@@ -0,0 +1 @@
+Source files are now listed with `os.scandir` in a thread pool, and the listing is cached until a folder of the export changes.
@@ -0,0 +1 @@
+The `export_*.json` metadata files are parsed incrementally, building the default pages, ordering and local roles mappings without loading the whole files in memory.
@@ -0,0 +1 @@
+Stream the metadata, relations and redirects files to disk, filtering them as they are written instead of copying the metadata first.
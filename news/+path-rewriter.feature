@@ -0,0 +1 @@
+Path export prefixes, cleanup rules and prefix replacements are compiled once into a path rewriter, keeping the cost per item low with thousands of rules.
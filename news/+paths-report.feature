@@ -0,0 +1 @@
+The paths report is now kept in compact columns and written in chunks to `report_transmute.csv` while the pipeline runs, optionally compressed with `paths_report_compress`.
@@ -0,0 +1 @@
+Content files are now loaded ahead by a thread pool, configured by `prefetch` and `prefetch_max_mb` in `[config]`, with prefetch hits and misses displayed in the progress panel.
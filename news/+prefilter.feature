@@ -0,0 +1 @@
+Drop items with header steps, such as the UID, date and path filters, before the blob payloads of the items are decoded.
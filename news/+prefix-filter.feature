@@ -0,0 +1 @@
+Match item paths against `paths.filter` prefixes using an index of prefix lengths, instead of testing every prefix.
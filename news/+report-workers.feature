@@ -0,0 +1 @@
+Added the `--workers` option to `transmute report`, to count the items of large exports in a process pool.
@@ -0,0 +1 @@
+Added periodic checkpoints of the pipeline state, taken every `checkpoint_interval` source files and at most once every `checkpoint_seconds`, and the `--resume` option to `transmute run`, to continue an interrupted run.
@@ -0,0 +1 @@
+Added the `transmute index` command, building an incremental SQLite index of the content files of an export, used by `transmute run --index` and `transmute report --index`.
@@ -0,0 +1 @@
+Added the `state_store` setting, to keep the lookup tables of the pipeline state in an SQLite database instead of memory on very large exports.
@@ -0,0 +1 @@
+Pipeline steps can declare the item types and fields they apply to with `applies_to`, and the pipeline runs, for each type, a cached plan with only the steps that may apply to it.
@@ -0,0 +1 @@
+Added the `sync_step` decorator, to declare one-in one-out pipeline steps as plain functions that the pipeline runs fused, as a single call per item.
@@ -0,0 +1 @@
+Added per-step timings, with call counts, mean, p95 and max latency, and items dropped and produced, written to `report_step_timings.csv` and `report_step_timings.json` and displayed in the user interface.
@@ -0,0 +1 @@
+Added the `--workers` option to `transmute run`, to process the content files in multiple worker processes.
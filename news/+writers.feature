@@ -0,0 +1 @@
+Exported items are now written to disk by a pool of writer tasks, configured by `writers` and `writers_queue_size` in `[config]`, overlapping disk writes with the item transformations. Items that could not be written are counted as dropped by `_error`, and left out of the metadata.
@@ -15,10 +15,10 @@ def get_logger() -> logging.Logger:
     from collective.transmute.settings import logger_settings
 
     global _LOGGER
-    is_debug, path = logger_settings(Path.cwd())
 
     # Initialize logger if not already done
     if _LOGGER is None:
+        is_debug, path = logger_settings(Path.cwd())
         level = logging.DEBUG if is_debug else logging.INFO
         logger = logging.getLogger(PACKAGE_NAME)
         logger.setLevel(level)
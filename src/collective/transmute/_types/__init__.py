@@ -1,9 +1,21 @@
+from .bench import BenchComparison
+from .bench import BenchCorpus
 from .cli import ContextObject
 from .console import ConsoleArea
 from .console import ConsolePanel
+from .files import BlobReference
+from .files import BlocksCacheStats
+from .files import IndexEntry
+from .files import IndexStats
+from .files import ItemExport
 from .files import ItemFiles
+from .files import JSONArray
+from .files import JSONObject
+from .files import JSONValue
+from .files import ReaderStats
 from .files import SourceFiles
 from .pipeline import ItemProcessor
+from .pipeline import PipelineCheckpoint
 from .pipeline import PipelineItemReport
 from .pipeline import PipelineProgress
 from .pipeline import PipelineState
@@ -14,6 +26,10 @@ from .pipeline import ReportItemGenerator
 from .pipeline import ReportProgress
 from .pipeline import ReportState
 from .pipeline import ReportStep
+from .pipeline import ShardResult
+from .pipeline import ShardTask
+from .pipeline import StepFilter
+from .pipeline import SyncPipelineStep
 from .plone import MetadataInfo
 from .plone import PloneItem
 from .plone import PloneItemGenerator
@@ -21,16 +37,36 @@ from .plone import PloneItemLocalRoles
 from .plone import VoltoBlock
 from .plone import VoltoBlocksInfo
 from .plone import WorkflowHistoryEntry
+from .settings import PrefixSet
 from .settings import TransmuteSettings
+from .timings import StepStats
+from .timings import StepTimings
+from .transforms import PATH_REPORT_HEADERS
+from .transforms import PathReportSink
+from .transforms import PathTransforms
 
 
 __all__ = [
+    "PATH_REPORT_HEADERS",
+    "BenchComparison",
+    "BenchCorpus",
+    "BlobReference",
+    "BlocksCacheStats",
     "ConsoleArea",
     "ConsolePanel",
     "ContextObject",
+    "IndexEntry",
+    "IndexStats",
+    "ItemExport",
     "ItemFiles",
     "ItemProcessor",
+    "JSONArray",
+    "JSONObject",
+    "JSONValue",
     "MetadataInfo",
+    "PathReportSink",
+    "PathTransforms",
+    "PipelineCheckpoint",
     "PipelineItemReport",
     "PipelineProgress",
     "PipelineState",
@@ -38,13 +74,21 @@ __all__ = [
     "PloneItem",
     "PloneItemGenerator",
     "PloneItemLocalRoles",
+    "PrefixSet",
     "PrepareStep",
     "PrepareStepGenerator",
+    "ReaderStats",
     "ReportItemGenerator",
     "ReportProgress",
     "ReportState",
     "ReportStep",
+    "ShardResult",
+    "ShardTask",
     "SourceFiles",
+    "StepFilter",
+    "StepStats",
+    "StepTimings",
+    "SyncPipelineStep",
     "TransmuteSettings",
     "VoltoBlock",
     "VoltoBlocksInfo",
@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from dataclasses import field
+
+
+__all__ = [
+    "BenchComparison",
+    "BenchCorpus",
+]
+
+
+DEFAULT_TYPE_MIX: dict[str, float] = {
+    "Folder": 0.15,
+    "Document": 0.4,
+    "News Item": 0.15,
+    "Collection": 0.05,
+    "File": 0.1,
+    "Image": 0.1,
+    "Link": 0.05,
+}
+"""Default share of each content type in a synthetic corpus."""
+
+
+@dataclass
+class BenchCorpus:
+    """Shape of a synthetic ``collective.exportimport`` corpus."""
+
+    items: int = 1000
+    """Number of content items."""
+    depth: int = 4
+    """Maximum depth of the content tree."""
+    types: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_TYPE_MIX))
+    """Relative weight of each content type."""
+    uid_queries: float = 0.5
+    """Share of Collections with a path criterion referencing a UID."""
+    default_pages: float = 0.3
+    """Share of Folders with a Document as default page."""
+    blob_size: int = 16 * 1024
+    """Size, in bytes, of each File and Image blob."""
+    redirects: float = 0.1
+    """Share of items with a redirect."""
+    relations: float = 0.1
+    """Share of items related to another item."""
+    seed: int = 0
+    """Seed of the random generator, for reproducible corpora."""
+
+
+@dataclass
+class BenchComparison:
+    """Comparison of a metric between two benchmark results."""
+
+    metric: str
+    """Name of the metric."""
+    baseline: float
+    """Value in the baseline result."""
+    current: float
+    """Value in the current result."""
+    higher_is_better: bool = False
+    """If an increase of the metric is an improvement."""
+    threshold: float = 0.1
+    """Relative change above which a worse value is a regression."""
+
+    @property
+    def change(self) -> float:
+        """Relative change of the metric, from the baseline."""
+        if not self.baseline:
+            return 0.0
+        return (self.current - self.baseline) / self.baseline
+
+    @property
+    def regression(self) -> bool:
+        """If the metric got worse by more than the threshold."""
+        change = -self.change if self.higher_is_better else self.change
+        return change > self.threshold
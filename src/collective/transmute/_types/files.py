@@ -1,5 +1,7 @@
+from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 
 @dataclass
@@ -12,3 +14,125 @@ class SourceFiles:
 class ItemFiles:
     data: str
     blob_files: list[str]
+
+
+class BlobReference:
+    """Base64 payload of a blob, kept in the source file until it is exported."""
+
+    __slots__ = ("length", "offset", "path", "source")
+
+    def __init__(
+        self, path: Path, offset: int, length: int, source: bytes | None = None
+    ):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.source = source
+        """Contents of the source file, when kept in memory."""
+
+    def __repr__(self) -> str:
+        return f"BlobReference({self.path}, {self.offset}, {self.length})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BlobReference):
+            return NotImplemented
+        return (self.path, self.offset, self.length) == (
+            other.path,
+            other.offset,
+            other.length,
+        )
+
+    def read(self) -> str:
+        """Read the base64 payload from the source file."""
+        if self.source is not None:
+            end = self.offset + self.length
+            return self.source[self.offset : end].decode("utf-8")
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            return f.read(self.length).decode("utf-8")
+
+
+@dataclass
+class ItemExport:
+    files: ItemFiles
+    data_path: Path
+    data: dict
+    blobs: list[tuple[Path, str | BlobReference]]
+    write_data: bool = True
+    """Write the data file, ``False`` when it is written after post-processing."""
+
+
+@dataclass
+class ReaderStats:
+    hits: int = 0
+    """Files already loaded when requested by the pipeline."""
+    misses: int = 0
+    """Files the pipeline had to wait for."""
+
+
+@dataclass
+class BlocksCacheStats:
+    hits: int = 0
+    """HTML conversions found in the blocks cache."""
+    misses: int = 0
+    """HTML conversions not found in the blocks cache."""
+
+
+@dataclass
+class IndexEntry:
+    """Summary of a content file, stored in the source index."""
+
+    path: str
+    """Path of the file, relative to the export folder."""
+    size: int
+    """Size of the file, in bytes."""
+    mtime_ns: int
+    """Modification time of the file when it was indexed."""
+    uid: str
+    id: str
+    """The ``@id`` of the item."""
+    parent: str
+    """The ``@id`` of the parent of the item."""
+    type: str | None
+    review_state: str | None
+    created: str | None
+    modified: str | None
+    effective: str | None
+    title: str | None
+    workflow: str | None
+    """The first workflow of the ``workflow_history`` of the item."""
+    layout: str | None
+    subjects: list[str]
+    creators: list[str]
+    blobs: dict[str, int]
+    """Size, in bytes, of the blob of each blob field."""
+
+
+@dataclass
+class IndexStats:
+    added: int = 0
+    """Files added to the source index."""
+    updated: int = 0
+    """Files indexed again, as they changed since the last update."""
+    removed: int = 0
+    """Files removed from the source index."""
+    unchanged: int = 0
+    """Files not read again."""
+
+
+@dataclass
+class JSONObject:
+    """Members of a JSON object, encoded one by one as they are iterated."""
+
+    items: Iterable[tuple[str, Any]]
+
+
+@dataclass
+class JSONArray:
+    """Values of a JSON array, encoded one by one as they are iterated."""
+
+    values: Iterable[Any]
+
+
+JSONValue = JSONObject | JSONArray | dict | list | str | int | float | bool | None
+"""Value written by ``stream_json``."""
@@ -1,11 +1,20 @@
 from .console import ConsoleArea
+from .files import BlocksCacheStats
+from .files import ReaderStats
 from .plone import MetadataInfo
 from .plone import PloneItem
 from .plone import PloneItemGenerator
 from .settings import TransmuteSettings
+from .timings import StepTimings
+from .transforms import PathTransforms
 from collections import defaultdict
 from collections.abc import AsyncGenerator
-from collections.abc import Iterator
+from collections.abc import Callable
+from collections.abc import Collection
+from collections.abc import MutableMapping
+from collections.abc import MutableSequence
+from collections.abc import MutableSet
+from collections.abc import Sequence
 from dataclasses import dataclass
 from dataclasses import field
 from pathlib import Path
@@ -17,6 +26,7 @@ from typing import TypedDict
 
 __all__ = [
     "ItemProcessor",
+    "PipelineCheckpoint",
     "PipelineItemReport",
     "PipelineProgress",
     "PipelineState",
@@ -26,6 +36,10 @@ __all__ = [
     "ReportProgress",
     "ReportState",
     "ReportStep",
+    "ShardResult",
+    "ShardTask",
+    "StepFilter",
+    "SyncPipelineStep",
 ]
 
 
@@ -44,10 +58,10 @@ class PipelineProgress:
     dropped_id: str
     """Task ID for dropped items."""
 
-    def advance(self, task: str) -> None:
+    def advance(self, task: str, advance: int = 1) -> None:
         progress = getattr(self, task)
         task_id = getattr(self, f"{task}_id")
-        progress.advance(task_id)
+        progress.advance(task_id, advance)
 
     def total(self, task: str, total: int) -> None:
         progress = getattr(self, task)
@@ -66,10 +80,10 @@ class ReportProgress:
     processed_id: str
     """Task ID for processed items."""
 
-    def advance(self, task: str = "processed") -> None:
+    def advance(self, task: str = "processed", advance: int = 1) -> None:
         progress = getattr(self, task)
         task_id = getattr(self, f"{task}_id")
-        progress.advance(task_id)
+        progress.advance(task_id, advance)
 
 
 @dataclass
@@ -141,9 +155,9 @@ class PipelineState:
     """Count of dropped items by type."""
     progress: PipelineProgress = field(repr=False)
     """Progress tracking for pipeline tasks."""
-    seen: set = field(default_factory=set, repr=False)
+    seen: MutableSet[str] = field(default_factory=set, repr=False)
     """Set of seen item identifiers."""
-    uids: dict = field(default_factory=dict, repr=False)
+    uids: MutableMapping[str, str] = field(default_factory=dict, repr=False)
     """
     Mapping of UIDs to items.
 
@@ -151,20 +165,166 @@ class PipelineState:
     run. One possible case is when we merge the default page of an item with the
     item itself.
     """
-    uid_path: dict = field(default_factory=dict, repr=False)
+    uid_path: MutableMapping[str, str] = field(default_factory=dict, repr=False)
     """Mapping of UIDs to paths."""
-    path_transforms: list[PipelineItemReport] = field(default_factory=list, repr=False)
-    """List of item path transformations."""
-    paths: list[tuple[str, str, str]] = field(default_factory=list, repr=False)
-    """List of item paths and related info."""
+    path_transforms: PathTransforms = field(default_factory=PathTransforms, repr=False)
+    """Item path transformations, reported by the paths report."""
+    paths: MutableSequence[tuple[str, str, str]] = field(
+        default_factory=list, repr=False
+    )
+    """
+    List of item paths and related info.
+
+    ``seen``, ``uids``, ``uid_path`` and ``paths`` are kept in memory, or in a
+    disk-backed store (see :mod:`collective.transmute.pipeline.store`).
+    """
     post_processing: dict[str, list[str]] = field(default_factory=dict, repr=False)
     """Items scheduled for post-processing."""
+    deferred: dict[str, bytes] = field(default_factory=dict, repr=False)
+    """
+    Serialized data of the items scheduled for post-processing, by UID.
+
+    With ``defer_post_processing``, these items are written once, after their
+    post-processing steps ran.
+    """
     annotations: dict[str, dict[str, Any]] = field(default_factory=dict, repr=False)
     """Additional annotations for items."""
     metadata: MetadataInfo | None = field(default=None, repr=False)
     """Metadata for the pipeline run."""
     write_report: bool = field(default=True, repr=True)
     """Flag to control if we should write the paths report."""
+    reader: ReaderStats = field(default_factory=ReaderStats, repr=False)
+    """Prefetch statistics of the content files reader."""
+    blocks_cache: BlocksCacheStats = field(default_factory=BlocksCacheStats, repr=False)
+    """Statistics of the blocks cache."""
+    timings: StepTimings = field(default_factory=StepTimings, repr=False)
+    """Timings of the pipeline steps."""
+
+
+@dataclass
+class ShardTask:
+    """
+    Work order for a shard of content files processed by a worker process.
+    """
+
+    index: int
+    """Index of the shard."""
+    files: list[tuple[int, Path]]
+    """Content files in this shard, with their position in the full run."""
+    settings: TransmuteSettings = field(repr=False)
+    """Settings used by the worker."""
+    content_folder: Path
+    """Folder where the items are exported."""
+    metadata_path: Path
+    """Path of the metadata file."""
+    default_page: dict[str, str] = field(default_factory=dict, repr=False)
+    """Default page mapping for the parents owned by this shard."""
+    annotations: dict[str, Any] = field(default_factory=dict, repr=False)
+    """Annotations produced by the prepare steps."""
+    write_report: bool = True
+    """Flag to control if the paths report is collected."""
+
+
+@dataclass
+class ShardResult:
+    """
+    Partial pipeline state produced by a worker process for a single shard.
+
+    Lists holding ordered data are stored as ``(position, entries)`` chunks, where
+    ``position`` is the position of the source file in the full run. This allows
+    the results to be merged in the same order a single process run would use.
+    """
+
+    index: int
+    """Index of the shard."""
+    total: int
+    """Number of items in the shard, including new items."""
+    processed: int
+    """Number of items processed."""
+    exported: dict[str, int] = field(default_factory=dict)
+    """Count of exported items by type."""
+    dropped: dict[str, int] = field(default_factory=dict)
+    """Count of dropped items by step."""
+    seen: set = field(default_factory=set, repr=False)
+    """Set of seen item identifiers."""
+    uids: dict = field(default_factory=dict, repr=False)
+    """Mapping of UIDs to final UIDs."""
+    uid_path: dict = field(default_factory=dict, repr=False)
+    """Mapping of UIDs to paths."""
+    paths: list[tuple[str, str, str]] = field(default_factory=list, repr=False)
+    """List of item paths and related info."""
+    post_processing: dict[str, list[str]] = field(default_factory=dict, repr=False)
+    """Items scheduled for post-processing."""
+    deferred: dict[str, bytes] = field(default_factory=dict, repr=False)
+    """Serialized data of the items waiting for post-processing, by UID."""
+    annotations: dict[str, Any] = field(default_factory=dict, repr=False)
+    """Annotations at the end of the shard run."""
+    path_transforms: list[tuple[int, list]] = field(default_factory=list, repr=False)
+    """Path transformation reports, per source file."""
+    relations: list[tuple[int, list]] = field(default_factory=list, repr=False)
+    """Relations added by the steps, per source file."""
+    blob_files: list[tuple[int, list]] = field(default_factory=list, repr=False)
+    """Exported blob files, per source file."""
+    redirects: dict[str, str] = field(default_factory=dict, repr=False)
+    """Redirects added during the run."""
+    fix_relations: dict[str, str] = field(default_factory=dict, repr=False)
+    """UIDs of default pages replaced by their parent UID."""
+    processing_default_page: dict = field(default_factory=dict, repr=False)
+    """Parents still waiting for their default page."""
+    default_page: dict[str, str] = field(default_factory=dict, repr=False)
+    """Default page mapping entries not consumed by the shard."""
+    reader: ReaderStats = field(default_factory=ReaderStats, repr=False)
+    """Prefetch statistics of the content files reader."""
+    blocks_cache: BlocksCacheStats = field(default_factory=BlocksCacheStats, repr=False)
+    """Statistics of the blocks cache."""
+    timings: StepTimings = field(default_factory=StepTimings, repr=False)
+    """Timings of the pipeline steps."""
+
+
+@dataclass
+class PipelineCheckpoint:
+    """
+    Snapshot of the pipeline state, used to resume an interrupted run.
+    """
+
+    fingerprint: str
+    """Hash of the settings and content files of the run."""
+    position: int
+    """Number of source files fully processed and exported."""
+    total: int
+    """Total number of items to process."""
+    processed: int
+    """Number of items processed."""
+    exported: dict[str, int] = field(default_factory=dict)
+    """Count of exported items by type."""
+    dropped: dict[str, int] = field(default_factory=dict)
+    """Count of dropped items by step."""
+    seen: set = field(default_factory=set, repr=False)
+    """Set of seen item identifiers."""
+    uids: dict = field(default_factory=dict, repr=False)
+    """Mapping of UIDs to final UIDs."""
+    uid_path: dict = field(default_factory=dict, repr=False)
+    """Mapping of UIDs to paths."""
+    path_transforms: PathTransforms = field(default_factory=PathTransforms, repr=False)
+    """Item path transformations, including the size of the rows already written."""
+    paths: list[tuple[str, str, str]] = field(default_factory=list, repr=False)
+    """List of item paths and related info."""
+    post_processing: dict[str, list[str]] = field(default_factory=dict, repr=False)
+    """Items scheduled for post-processing."""
+    deferred: dict[str, bytes] = field(default_factory=dict, repr=False)
+    """Serialized data of the items waiting for post-processing, by UID."""
+    annotations: dict[str, Any] = field(default_factory=dict, repr=False)
+    """Annotations of the run."""
+    metadata: MetadataInfo | None = field(default=None, repr=False)
+    """Metadata of the run."""
+    drop: set[str] = field(default_factory=set, repr=False)
+    """Paths in the drop filter, updated when items are dropped."""
+    reader: ReaderStats = field(default_factory=ReaderStats, repr=False)
+    """Prefetch statistics of the content files reader."""
+    blocks_cache: BlocksCacheStats = field(default_factory=BlocksCacheStats, repr=False)
+    """Statistics of the blocks cache."""
+    timings: StepTimings = field(default_factory=StepTimings, repr=False)
+    """Timings of the pipeline steps."""
 
 
 @dataclass
@@ -173,8 +333,8 @@ class ReportState:
     State and summary for reporting on pipeline results.
     """
 
-    files: Iterator
-    """Iterator over files to report on."""
+    files: Sequence[Path]
+    """Files to report on."""
     types: defaultdict[str, int]
     """Count of items by type."""
     creators: defaultdict[str, int]
@@ -227,6 +387,34 @@ class PipelineStep(Protocol):
         ...
 
 
+class SyncPipelineStep(Protocol):
+    """
+    Protocol for the function of a synchronous pipeline step.
+
+    A synchronous step processes a single item and returns it, or ``None`` to
+    drop it. It cannot produce new items. See
+    :func:`collective.transmute.utils.pipeline.sync_step`.
+    """
+
+    __name__: str
+
+    def __call__(
+        self, item: PloneItem, state: PipelineState, settings: TransmuteSettings
+    ) -> PloneItem | None:
+        """
+        Process a single item in the pipeline.
+
+        Args:
+            item (PloneItem): The item to process.
+            state (PipelineState): The current pipeline state.
+            settings (TransmuteSettings): The pipeline settings.
+
+        Returns:
+            PloneItem | None: The processed item, or ``None`` to drop it.
+        """
+        ...
+
+
 class ItemProcessor(Protocol):
     """
     Protocol for a processor function for a single item.
@@ -270,3 +458,19 @@ class ReportStep(Protocol):
     def __call__(
         self, state: PipelineState, settings: TransmuteSettings, consoles: ConsoleArea
     ) -> ReportItemGenerator: ...
+
+
+@dataclass(frozen=True)
+class StepFilter:
+    """
+    Items a pipeline step applies to, see
+    :func:`collective.transmute.utils.pipeline.applies_to`.
+
+    A step applies to an item if its ``@type`` is one of ``types``, or if it has
+    one of ``fields``. Other items are passed on without running the step.
+    """
+
+    types: Collection[str] | Callable[[TransmuteSettings], Collection[str]] | None
+    """Item types, or a function returning them from the settings."""
+    fields: frozenset[str] = frozenset()
+    """Item fields."""
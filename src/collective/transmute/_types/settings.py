@@ -1,3 +1,5 @@
+from collections import Counter
+from collections.abc import Iterable
 from dataclasses import dataclass
 from dataclasses import field
 from pathlib import Path
@@ -5,7 +7,104 @@ from typing import Any
 from typing import TypedDict
 
 
-__all__ = ["TransmuteSettings"]
+__all__ = ["PrefixSet", "TransmuteSettings"]
+
+
+class PrefixSet(set[str]):
+    """
+    Set of path prefixes, indexed by prefix length.
+
+    The index is kept up to date when prefixes are added or removed, so a path
+    is matched with one set lookup per distinct prefix length, instead of one
+    ``startswith`` call per prefix.
+    """
+
+    def __init__(self, values: Iterable[str] = ()):
+        super().__init__(values)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        """Rebuild the index of prefix lengths."""
+        self._counts: Counter[int] = Counter(len(value) for value in self)
+        self._lengths: list[int] | None = None
+
+    @property
+    def lengths(self) -> list[int]:
+        """Distinct prefix lengths, in ascending order."""
+        if self._lengths is None:
+            self._lengths = sorted(self._counts)
+        return self._lengths
+
+    def match(self, path: str) -> str | None:
+        """Return the shortest prefix of a path in the set, if any."""
+        for length in self.lengths:
+            if length > len(path):
+                break
+            if (prefix := path[:length]) in self:
+                return prefix
+        return None
+
+    def add(self, value: str) -> None:
+        if value not in self:
+            super().add(value)
+            if not self._counts[len(value)]:
+                self._lengths = None
+            self._counts[len(value)] += 1
+
+    def discard(self, value: str) -> None:
+        if value in self:
+            super().discard(value)
+            self._counts[len(value)] -= 1
+            if not self._counts[len(value)]:
+                del self._counts[len(value)]
+                self._lengths = None
+
+    def remove(self, value: str) -> None:
+        if value not in self:
+            raise KeyError(value)
+        self.discard(value)
+
+    def update(self, *others: Iterable[str]) -> None:
+        for other in others:
+            for value in other:
+                self.add(value)
+
+    def __ior__(self, other):  # type: ignore[override,misc]
+        self.update(other)
+        return self
+
+    def pop(self) -> str:
+        value = super().pop()
+        self._reindex()
+        return value
+
+    def clear(self) -> None:
+        super().clear()
+        self._reindex()
+
+    def difference_update(self, *others: Iterable[Any]) -> None:
+        super().difference_update(*others)
+        self._reindex()
+
+    def intersection_update(self, *others: Iterable[Any]) -> None:
+        super().intersection_update(*others)
+        self._reindex()
+
+    def symmetric_difference_update(self, other: Iterable[str]) -> None:
+        super().symmetric_difference_update(other)
+        self._reindex()
+
+    def __iand__(self, other):  # type: ignore[override,misc]
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other):  # type: ignore[override,misc]
+        self.difference_update(other)
+        return self
+
+    def __ixor__(self, other):  # type: ignore[override,misc]
+        self.symmetric_difference_update(other)
+        return self
 
 
 class TransmuteSettingsConfig(TypedDict):
@@ -56,8 +155,8 @@ class TransmuteSettingsReviewState(TypedDict):
 
 
 class PathsFilter(TypedDict):
-    allowed: set[str]
-    drop: set[str]
+    allowed: PrefixSet
+    drop: PrefixSet
 
 
 class TransmuteSettingsPaths(TypedDict):
@@ -105,6 +204,6 @@ class TransmuteSettings:
         return self.pipeline["do_not_add_drop"]
 
     @property
-    def paths_filter_allowed(self) -> set[str]:
+    def paths_filter_allowed(self) -> PrefixSet:
         """Return list of allowed paths."""
         return self.paths["filter"]["allowed"]
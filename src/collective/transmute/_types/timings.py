@@ -0,0 +1,130 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from time import perf_counter
+
+import math
+
+
+__all__ = [
+    "StepStats",
+    "StepTimings",
+]
+
+
+_BUCKET_BASE = 1.1
+"""Ratio between the upper bounds of two consecutive latency buckets."""
+
+_BUCKET_UNIT = 1e-6
+"""Upper bound, in seconds, of the first latency bucket."""
+
+
+def _bucket(duration: float) -> int:
+    """Return the latency bucket of a duration."""
+    if duration <= _BUCKET_UNIT:
+        return 0
+    return math.ceil(math.log(duration / _BUCKET_UNIT, _BUCKET_BASE))
+
+
+@dataclass
+class StepStats:
+    """
+    Call count, latency and item counters of a step.
+
+    Latencies are kept in logarithmic buckets, 10% wide, so percentiles can be
+    estimated, and statistics merged, without storing every duration.
+    """
+
+    calls: int = 0
+    """Number of calls."""
+    total: float = 0.0
+    """Cumulative time, in seconds."""
+    max: float = 0.0
+    """Maximum time of a call, in seconds."""
+    dropped: int = 0
+    """Number of items dropped by the step."""
+    produced: int = 0
+    """Number of new items produced by the step."""
+    buckets: dict[int, int] = field(default_factory=dict, repr=False)
+    """Number of calls per latency bucket."""
+
+    def add(self, duration: float, dropped: bool = False, produced: int = 0) -> None:
+        """Record a call of the step."""
+        self.calls += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.dropped += int(dropped)
+        self.produced += produced
+        bucket = _bucket(duration)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other: "StepStats") -> None:
+        """Add the statistics of another run of the step."""
+        self.calls += other.calls
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.dropped += other.dropped
+        self.produced += other.produced
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    @property
+    def mean(self) -> float:
+        """Mean time of a call, in seconds."""
+        return self.total / self.calls if self.calls else 0.0
+
+    def percentile(self, value: float) -> float:
+        """Return an estimate, in seconds, of a latency percentile (0 to 100)."""
+        threshold = self.calls * value / 100
+        count = 0
+        for bucket in sorted(self.buckets):
+            count += self.buckets[bucket]
+            if count >= threshold:
+                return min(_BUCKET_UNIT * _BUCKET_BASE**bucket, self.max)
+        return self.max
+
+
+@dataclass
+class StepTimings:
+    """
+    Timings of the steps of a pipeline run, grouped by stage.
+
+    Stages are ``run`` (the phases of the pipeline), ``prepare``, ``step``,
+    ``export``, ``post_process`` and ``report``.
+    """
+
+    steps: dict[tuple[str, str], StepStats] = field(default_factory=dict)
+    """Statistics by stage and step name."""
+
+    def get(self, stage: str, name: str) -> StepStats:
+        """Return the statistics of a step, creating them if needed."""
+        key = (stage, name)
+        if (stats := self.steps.get(key)) is None:
+            stats = self.steps[key] = StepStats()
+        return stats
+
+    def record(
+        self,
+        stage: str,
+        name: str,
+        duration: float,
+        dropped: bool = False,
+        produced: int = 0,
+    ) -> None:
+        """Record a call of a step."""
+        self.get(stage, name).add(duration, dropped, produced)
+
+    @contextmanager
+    def measure(self, stage: str, name: str) -> Iterator[None]:
+        """Context manager recording the time spent in its block."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, name, perf_counter() - start)
+
+    def merge(self, other: "StepTimings") -> None:
+        """Add the timings of another run, like a shard of the pipeline."""
+        for (stage, name), stats in other.steps.items():
+            self.get(stage, name).merge(stats)
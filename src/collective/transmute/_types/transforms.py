@@ -0,0 +1,180 @@
+from array import array
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from typing import Any
+from typing import Protocol
+
+
+__all__ = [
+    "PATH_REPORT_HEADERS",
+    "PathReportSink",
+    "PathTransforms",
+]
+
+
+PATH_REPORT_HEADERS: tuple[str, ...] = (
+    "filename",
+    "src_path",
+    "src_uid",
+    "src_type",
+    "src_state",
+    "dst_path",
+    "dst_uid",
+    "dst_type",
+    "dst_state",
+    "last_step",
+    "status",
+    "src_level",
+    "dst_level",
+    "src_workflow",
+    "dst_workflow",
+)
+"""Columns of the paths report, in order."""
+
+_TEXT_COLUMNS = frozenset(("filename", "src_path", "src_uid", "dst_path", "dst_uid"))
+"""Columns with mostly distinct values, kept as they are."""
+
+_LEVEL_COLUMNS = frozenset(("src_level", "dst_level"))
+"""Columns holding the level of a path."""
+
+_NO_LEVEL = -(2**31)
+"""Level stored for an item without a path, reported as ``--``."""
+
+_NO_LEVEL_VALUE = "--"
+
+
+class PathReportSink(Protocol):
+    """
+    Destination of the rows moved out of a :class:`PathTransforms` accumulator.
+    """
+
+    chunk_size: int
+    """Number of rows kept in memory before they are written."""
+
+    def write(self, rows: list[tuple]) -> int:
+        """Write rows, in the order of the report columns.
+
+        Returns the size, in bytes, of the data written so far.
+        """
+        ...
+
+
+class PathTransforms:
+    """
+    Columnar accumulator of the path transformation reports of a pipeline run.
+
+    Each report is stored as one entry per column: file names, paths and UIDs in
+    lists, levels in integer arrays, and types, review states, workflows, step
+    names and statuses, which have few distinct values, as indexes into a table
+    of interned strings.
+
+    With a ``sink``, :meth:`spill` moves the rows out of memory in chunks, so
+    the report is written while the pipeline runs. Iteration and ``len`` only
+    cover the rows still in memory, while :attr:`total` counts all rows.
+    """
+
+    def __init__(self, rows: Iterable[Mapping[str, Any]] = ()):
+        self._strings: list[Any] = []
+        self._interned: dict[Any, int] = {}
+        self._columns: dict[str, list | array] = {
+            name: [] if name in _TEXT_COLUMNS else array("i")
+            for name in PATH_REPORT_HEADERS
+        }
+        self.spilled: int = 0
+        """Number of rows moved out of memory."""
+        self.spilled_bytes: int = 0
+        """Size, in bytes, of the data written by the sink."""
+        self.sink: PathReportSink | None = None
+        """Destination of the spilled rows, not kept when pickled."""
+        self.extend(rows)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state["sink"] = None
+        return state
+
+    def _intern(self, value: Any) -> int:
+        index = self._interned.get(value)
+        if index is None:
+            index = self._interned[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def append(self, report: Mapping[str, Any]) -> None:
+        """Add the report of an item."""
+        for name, column in self._columns.items():
+            value = report.get(name)
+            if name in _TEXT_COLUMNS:
+                column.append(value)
+            elif name in _LEVEL_COLUMNS:
+                column.append(value if isinstance(value, int) else _NO_LEVEL)
+            else:
+                column.append(self._intern(value))
+
+    def extend(self, reports: Iterable[Mapping[str, Any]]) -> None:
+        """Add the reports of several items, spilling full chunks to the sink."""
+        for report in reports:
+            self.append(report)
+            if self.sink and len(self) >= self.sink.chunk_size:
+                self.spill()
+
+    def _value(self, name: str, value: Any) -> Any:
+        if name in _TEXT_COLUMNS:
+            return value
+        if name in _LEVEL_COLUMNS:
+            return _NO_LEVEL_VALUE if value == _NO_LEVEL else value
+        return self._strings[value]
+
+    def _tuples(self, start: int = 0) -> Iterator[tuple]:
+        columns = [(name, column[start:]) for name, column in self._columns.items()]
+        for values in zip(*(column for _, column in columns), strict=True):
+            yield tuple(
+                self._value(name, value)
+                for (name, _), value in zip(columns, values, strict=True)
+            )
+
+    def rows(self, start: int = 0) -> Iterator[dict[str, Any]]:
+        """
+        Iterate over the reports from a position, counted among all rows.
+
+        Raises ``IndexError`` if some of the requested rows were spilled.
+        """
+        if start < self.spilled:
+            raise IndexError(f"Row {start} was already spilled")
+        for values in self._tuples(start - self.spilled):
+            yield dict(zip(PATH_REPORT_HEADERS, values, strict=True))
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return self.rows(self.spilled)
+
+    def __len__(self) -> int:
+        return len(self._columns["filename"])
+
+    @property
+    def total(self) -> int:
+        """Number of rows added, including the spilled ones."""
+        return self.spilled + len(self)
+
+    def clear(self) -> None:
+        """Remove the rows held in memory."""
+        for column in self._columns.values():
+            del column[:]
+
+    def take(self) -> list[tuple]:
+        """Move the rows held in memory out, in the order of the report columns."""
+        rows = list(self._tuples())
+        self.clear()
+        self.spilled += len(rows)
+        return rows
+
+    def spill(self, force: bool = False) -> None:
+        """
+        Write the rows held in memory to the sink, once a chunk is complete.
+
+        Does nothing without a sink. With ``force``, incomplete chunks are also
+        written.
+        """
+        sink = self.sink
+        if sink and self and (force or len(self) >= sink.chunk_size):
+            self.spilled_bytes = sink.write(self.take())
@@ -0,0 +1,28 @@
+"""
+Benchmarks for ``collective.transmute``.
+
+This package generates reproducible synthetic ``collective.exportimport`` exports,
+runs the full pipeline against them, and compares the results of two benchmark runs.
+
+Example:
+    .. code-block:: pycon
+
+        >>> generate_corpus(corpus_path, t.BenchCorpus(items=5000))
+        >>> result = run_benchmark(corpus_path, dst, settings)
+        >>> compare_results(baseline, result)
+"""
+
+from collective.transmute.bench.compare import compare_results
+from collective.transmute.bench.compare import load_result
+from collective.transmute.bench.corpus import generate_corpus
+from collective.transmute.bench.corpus import read_corpus
+from collective.transmute.bench.runner import run_benchmark
+
+
+__all__ = [
+    "compare_results",
+    "generate_corpus",
+    "load_result",
+    "read_corpus",
+    "run_benchmark",
+]
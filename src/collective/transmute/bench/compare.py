@@ -0,0 +1,104 @@
+"""
+Comparison of benchmark results for ``collective.transmute``.
+
+This module compares two results of :func:`collective.transmute.bench.run_benchmark`
+and flags the metrics that got worse by more than a threshold: throughput, peak
+memory usage, and the time spent in each phase and step of the pipeline.
+"""
+
+from collective.transmute import _types as t
+from collective.transmute.bench.runner import RESULT_VERSION
+from pathlib import Path
+
+import json
+
+
+METRICS: tuple[tuple[str, bool], ...] = (
+    ("items_per_second", True),
+    ("elapsed", False),
+    ("peak_rss", False),
+)
+"""Global metrics of a result, and if a higher value is an improvement."""
+
+
+def load_result(path: Path) -> dict:
+    """
+    Load a benchmark result.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the JSON result file.
+
+    Returns
+    -------
+    dict
+        The benchmark result.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a benchmark result in a supported format.
+    """
+    data = json.loads(path.read_text())
+    if not isinstance(data, dict) or data.get("version") != RESULT_VERSION:
+        raise ValueError(f"{path} is not a supported benchmark result")
+    return data
+
+
+def _timings(result: dict) -> dict[str, float]:
+    """Return the time spent in each phase and step of a result."""
+    times = {f"phase:{name}": value for name, value in result["phases"].items()}
+    for row in result["timings"]:
+        times[f"{row['stage']}:{row['step']}"] = row["total_s"]
+    return times
+
+
+def compare_results(
+    baseline: dict, current: dict, threshold: float = 0.1, min_time: float = 0.05
+) -> list[t.BenchComparison]:
+    """
+    Compare two benchmark results.
+
+    Parameters
+    ----------
+    baseline : dict
+        The reference result.
+    current : dict
+        The result to check.
+    threshold : float
+        Relative change above which a worse value is a regression.
+    min_time : float
+        Phases and steps taking less time, in seconds, in both results are not
+        compared, as their timings are mostly noise.
+
+    Returns
+    -------
+    list[BenchComparison]
+        The global metrics, followed by the phases and steps found in both results.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> comparisons = compare_results(baseline, current)
+        >>> [item.metric for item in comparisons if item.regression]
+        ['phase:process_items']
+    """
+    comparisons = [
+        t.BenchComparison(
+            metric, baseline[metric], current[metric], higher_is_better, threshold
+        )
+        for metric, higher_is_better in METRICS
+    ]
+    baseline_times = _timings(baseline)
+    current_times = _timings(current)
+    for metric, value in baseline_times.items():
+        if metric not in current_times:
+            continue
+        if max(value, current_times[metric]) < min_time:
+            continue
+        comparisons.append(
+            t.BenchComparison(metric, value, current_times[metric], False, threshold)
+        )
+    return comparisons
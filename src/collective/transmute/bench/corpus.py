@@ -0,0 +1,281 @@
+"""
+Synthetic corpus generator for ``collective.transmute`` benchmarks.
+
+This module writes reproducible ``collective.exportimport`` exports, with a
+configurable number of items, tree depth, content type mix, Collections with UID
+path queries, default pages, blob sizes, redirects and relations.
+"""
+
+from collective.transmute import _types as t
+from collective.transmute.utils import files as file_utils
+from dataclasses import asdict
+from datetime import datetime
+from datetime import timedelta
+from pathlib import Path
+
+import base64
+import json
+import random
+
+
+SITE_URL = "http://localhost:8080/Plone"
+"""URL of the site root in the generated items."""
+
+SITE_ROOT = "/Plone"
+"""Path of the site root in the generated metadata."""
+
+CONTENT_FOLDER = "Plone"
+"""Folder, inside the corpus, holding the content files."""
+
+CORPUS_FILE = "export_bench_corpus.json"
+"""File, inside the corpus, describing its shape.
+
+Like other ``export_`` files, it is listed as a metadata file, and ignored by
+the pipeline.
+"""
+
+_SUMMARY_KEYS = ("@id", "@type", "UID", "id", "title")
+
+_WORDS = (
+    "archive",
+    "campus",
+    "event",
+    "faculty",
+    "library",
+    "news",
+    "office",
+    "project",
+    "report",
+    "research",
+    "service",
+    "student",
+)
+
+_BLOB_TYPES = {
+    "File": ("file", "application/octet-stream", "bin"),
+    "Image": ("image", "image/png", "png"),
+    "News Item": ("image", "image/jpeg", "jpg"),
+}
+
+_START_DATE = datetime(2015, 1, 1)
+
+
+class _CorpusBuilder:
+    """Build the items and metadata of a synthetic corpus."""
+
+    def __init__(self, spec: t.BenchCorpus):
+        self.spec = spec
+        self.rng = random.Random(spec.seed)  # noqa: S311
+        self.items: list[dict] = []
+        """Summary of the generated items, without their blobs."""
+        self.folders: list[tuple[dict, int]] = []
+        """Folders, with their depth, that can still hold items."""
+        self.first_document: dict[str, dict] = {}
+        """First Document of each Folder, by Folder UID."""
+        self.types = list(spec.types)
+        self.weights = list(spec.types.values())
+
+    def _uid(self) -> str:
+        return f"{self.rng.getrandbits(128):032x}"
+
+    def _words(self, count: int) -> str:
+        return " ".join(self.rng.choice(_WORDS) for _ in range(count))
+
+    def _parent(self) -> tuple[dict | None, int]:
+        """Pick the parent Folder of a new item, ``None`` for the site root."""
+        if not self.folders or self.rng.random() < 0.1:
+            return None, 0
+        return self.rng.choice(self.folders)
+
+    def _blob(self, type_: str, item_id: str) -> tuple[str, dict]:
+        field, content_type, extension = _BLOB_TYPES[type_]
+        data = self.rng.randbytes(self.spec.blob_size)
+        return field, {
+            "content-type": content_type,
+            "data": base64.b64encode(data).decode("ascii"),
+            "encoding": "base64",
+            "filename": f"{item_id}.{extension}",
+        }
+
+    def _query(self) -> list[dict]:
+        query: list[dict] = [
+            {
+                "i": "portal_type",
+                "o": "plone.app.querystring.operation.selection.any",
+                "v": ["Document", "News Item"],
+            }
+        ]
+        if self.folders:
+            folder, _ = self.rng.choice(self.folders)
+            if self.rng.random() < self.spec.uid_queries:
+                value = f"{folder['UID']}::-1"
+            else:
+                value = folder["@id"].replace(SITE_URL, SITE_ROOT, 1)
+            query.append({
+                "i": "path",
+                "o": "plone.app.querystring.operation.string.path",
+                "v": value,
+            })
+        return query
+
+    def _add_type_data(self, item: dict, type_: str) -> None:
+        """Add the fields specific to a content type."""
+        if type_ in ("Document", "News Item"):
+            paragraphs = (f"<p>{self._words(30)}</p>" for _ in range(3))
+            item["text"] = {"content-type": "text/html", "data": "".join(paragraphs)}
+        if type_ in _BLOB_TYPES and self.spec.blob_size > 0:
+            field, blob = self._blob(type_, item["id"])
+            item[field] = blob
+        match type_:
+            case "Collection":
+                item["query"] = self._query()
+                item["sort_on"] = "effective"
+                item["sort_reversed"] = True
+                item["limit"] = 100
+            case "Link":
+                item["remoteUrl"] = f"https://example.com/{item['id']}"
+            case "Folder":
+                item["layout"] = "listing_view"
+
+    def add_item(self, position: int) -> dict:
+        """Create the item at a position of the corpus."""
+        type_ = self.rng.choices(self.types, self.weights)[0]
+        parent, depth = self._parent()
+        parent_url = parent["@id"] if parent else SITE_URL
+        item_id = f"{self._words(1)}-{position}"
+        date = (_START_DATE + timedelta(hours=position)).isoformat() + "+00:00"
+        item: dict = {
+            "@id": f"{parent_url}/{item_id}",
+            "@type": type_,
+            "UID": self._uid(),
+            "id": item_id,
+            "title": self._words(4).title(),
+            "description": self._words(12),
+            "created": date,
+            "modified": date,
+            "effective": date,
+            "expires": None,
+            "creators": ["admin"],
+            "contributors": [],
+            "subjects": sorted({self._words(1) for _ in range(2)}),
+            "language": "en",
+            "review_state": "published",
+            "exclude_from_nav": False,
+            "is_folderish": type_ == "Folder",
+            "layout": "view",
+        }
+        if parent:
+            item["parent"] = {key: parent[key] for key in _SUMMARY_KEYS if key != "id"}
+        self._add_type_data(item, type_)
+        summary = {key: item[key] for key in _SUMMARY_KEYS}
+        if type_ == "Folder" and depth < self.spec.depth:
+            self.folders.append((summary, depth + 1))
+        elif type_ == "Document" and parent:
+            self.first_document.setdefault(parent["UID"], summary)
+        self.items.append(summary)
+        return item
+
+    def default_pages(self) -> list[dict]:
+        """Pick the default pages of the Folders."""
+        data = []
+        for folder_uid, item in self.first_document.items():
+            if self.rng.random() < self.spec.default_pages:
+                data.append({
+                    "default_page": item["id"],
+                    "default_page_uuid": item["UID"],
+                    "uuid": folder_uid,
+                })
+        return data
+
+    def redirects(self) -> dict[str, str]:
+        """Create redirects from old paths to some of the items."""
+        data = {}
+        for item in self.items:
+            if self.rng.random() < self.spec.redirects:
+                path = item["@id"].replace(SITE_URL, SITE_ROOT, 1)
+                data[f"{SITE_ROOT}/old/{item['id']}"] = path
+        return data
+
+    def relations(self) -> list[dict]:
+        """Relate some of the items to another item."""
+        data = []
+        for item in self.items[1:]:
+            if self.rng.random() < self.spec.relations:
+                target = self.rng.choice(self.items)
+                if target is item:
+                    continue
+                data.append({
+                    "from_attribute": "relatedItems",
+                    "from_uuid": item["UID"],
+                    "to_uuid": target["UID"],
+                })
+        return data
+
+
+def generate_corpus(dst: Path, spec: t.BenchCorpus) -> dict[str, int]:
+    """
+    Write a synthetic ``collective.exportimport`` export.
+
+    The same specification, including its seed, always produces the same export.
+
+    Parameters
+    ----------
+    dst : Path
+        Folder receiving the export. Existing files with the same names are
+        overwritten.
+    spec : BenchCorpus
+        The shape of the corpus.
+
+    Returns
+    -------
+    dict[str, int]
+        Number of items by content type, and number of default pages, redirects
+        and relations.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> generate_corpus(Path("corpus"), t.BenchCorpus(items=10))["items"]
+        10
+    """
+    builder = _CorpusBuilder(spec)
+    content = dst / CONTENT_FOLDER
+    content.mkdir(parents=True, exist_ok=True)
+    counts: dict[str, int] = {"items": spec.items}
+    for position in range(1, spec.items + 1):
+        item = builder.add_item(position)
+        counts[item["@type"]] = counts.get(item["@type"], 0) + 1
+        (content / f"{position}.json").write_bytes(file_utils.json_dumps(item))
+    metadata: dict[str, dict | list] = {
+        "defaultpages": builder.default_pages(),
+        "redirects": builder.redirects(),
+        "relations": builder.relations(),
+    }
+    for key, data in metadata.items():
+        (dst / f"export_{key}.json").write_bytes(file_utils.json_dumps(data))
+        counts[key] = len(data)
+    info = {"corpus": asdict(spec), "counts": counts}
+    (dst / CORPUS_FILE).write_bytes(file_utils.json_dumps(info))
+    return counts
+
+
+def read_corpus(src: Path) -> dict | None:
+    """
+    Read the shape of a synthetic corpus.
+
+    Parameters
+    ----------
+    src : Path
+        Folder of the export.
+
+    Returns
+    -------
+    dict or None
+        The corpus specification, under ``corpus``, and its item counts, under
+        ``counts``, or ``None`` if the export is not a synthetic corpus.
+    """
+    path = src / CORPUS_FILE
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
@@ -0,0 +1,136 @@
+"""
+Benchmark runner for ``collective.transmute``.
+
+This module runs the full pipeline against an export, usually a synthetic corpus
+(see :mod:`collective.transmute.bench.corpus`), and records its throughput, peak
+memory usage and per-phase timings in a JSON serializable result.
+"""
+
+from collections import defaultdict
+from collective.transmute import __version__
+from collective.transmute import _types as t
+from collective.transmute import layout
+from collective.transmute.bench import corpus
+from collective.transmute.pipeline import pipeline
+from collective.transmute.reports.timings import timings_rows
+from collective.transmute.utils import files as file_utils
+from collective.transmute.utils.performance import peak_rss
+from copy import deepcopy
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+
+import asyncio
+import platform
+import shutil
+
+
+RESULT_VERSION = 1
+"""Version of the format of benchmark results."""
+
+
+def _create_state(app_layout: layout.TransmuteLayout, total: int) -> t.PipelineState:
+    """Initialize a PipelineState object."""
+    app_layout.initialize_progress(total)
+    return t.PipelineState(
+        total,
+        processed=0,
+        exported=defaultdict(int),
+        dropped=defaultdict(int),
+        progress=app_layout.progress,
+        write_report=False,
+    )
+
+
+def _phases(state: t.PipelineState, elapsed: float) -> dict[str, float]:
+    """Return the time spent in each phase of a pipeline run, in seconds."""
+    phases: dict[str, float] = defaultdict(float)
+    for (stage, name), stats in state.timings.steps.items():
+        if stage == "run":
+            phases[name] += stats.total
+        elif stage == "report":
+            phases["reports"] += stats.total
+    phases["other"] = max(elapsed - sum(phases.values()), 0.0)
+    return {name: round(value, 4) for name, value in phases.items()}
+
+
+def _run_once(
+    src_files: t.SourceFiles,
+    dst: Path,
+    settings: t.TransmuteSettings,
+    workers: int,
+) -> tuple[float, t.PipelineState]:
+    """Run the pipeline on an empty destination, returning its duration."""
+    shutil.rmtree(dst, ignore_errors=True)
+    (dst / "content").mkdir(parents=True)
+    # The pipeline updates the settings, like the list of dropped paths
+    settings = deepcopy(settings)
+    settings.config["reports_location"] = str(dst)
+    app_layout = layout.TransmuteLayout(title="Benchmark")
+    state = _create_state(app_layout, len(src_files.content))
+    start = perf_counter()
+    asyncio.run(
+        pipeline(src_files, dst, state, app_layout.consoles, settings, workers=workers)
+    )
+    return perf_counter() - start, state
+
+
+def run_benchmark(
+    src: Path,
+    dst: Path,
+    settings: t.TransmuteSettings,
+    workers: int = 1,
+    repeat: int = 1,
+) -> dict:
+    """
+    Run the pipeline against an export and measure its performance.
+
+    Parameters
+    ----------
+    src : Path
+        The export, in ``collective.exportimport`` format.
+    dst : Path
+        Destination folder of the pipeline, emptied before each run.
+    settings : TransmuteSettings
+        The transmute settings object. Each run uses a copy of it.
+    workers : int
+        Number of worker processes of the pipeline.
+    repeat : int
+        Number of runs. The result reports the run with the median duration.
+
+    Returns
+    -------
+    dict
+        The benchmark result: items per second, peak RSS, per-phase timings and
+        step timings, with information about the environment.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> result = run_benchmark(src, dst, settings)
+        >>> result["items_per_second"] > 0
+        True
+    """
+    src_files = file_utils.get_src_files(src)
+    runs = [_run_once(src_files, dst, settings, workers) for _ in range(max(repeat, 1))]
+    elapsed, state = sorted(runs, key=lambda run: run[0])[len(runs) // 2]
+    return {
+        "version": RESULT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "package_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "source": str(src),
+        "corpus": corpus.read_corpus(src),
+        "workers": workers,
+        "runs": [round(run[0], 4) for run in runs],
+        "items": state.total,
+        "exported": sum(state.exported.values()),
+        "dropped": sum(state.dropped.values()),
+        "elapsed": round(elapsed, 4),
+        "items_per_second": round(state.total / elapsed, 2) if elapsed else 0.0,
+        "peak_rss": peak_rss(),
+        "phases": _phases(state, elapsed),
+        "timings": timings_rows(state.timings),
+    }
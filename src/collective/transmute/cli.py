@@ -9,9 +9,12 @@ Example:
 
         uv run transmute settings
         uv run transmute sanity
+        uv run transmute bench run corpus
 """
 
 from collective.transmute._types import ContextObject
+from collective.transmute.commands.bench import app as app_bench
+from collective.transmute.commands.index import app as app_index
 from collective.transmute.commands.info import app as app_info
 from collective.transmute.commands.report import app as app_report
 from collective.transmute.commands.sanity import app as app_sanity
@@ -24,7 +27,7 @@ import typer
 
 app = typer.Typer(no_args_is_help=True)
 
-SUBCOMMANDS_IGNORE_SETTINGS = {"info", "settings"}
+SUBCOMMANDS_IGNORE_SETTINGS = {"bench", "info", "settings"}
 
 
 @app.callback(invoke_without_command=True)
@@ -51,8 +54,12 @@ def main(ctx: typer.Context) -> None:
 app.add_typer(app_info, name="info")
 app.add_typer(app_transmute)
 app.add_typer(app_report)
+app.add_typer(app_index)
 app.add_typer(app_settings, name="settings")
 app.add_typer(app_sanity)
+app.add_typer(
+    app_bench, name="bench", help="Benchmark the pipeline with synthetic exports."
+)
 
 
 def cli():
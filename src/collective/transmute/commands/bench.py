@@ -0,0 +1,153 @@
+from collective.transmute import _types as t
+from collective.transmute import bench
+from collective.transmute.utils import files as file_utils
+from pathlib import Path
+from typing import Annotated
+
+import tempfile
+import typer
+
+
+app = typer.Typer(no_args_is_help=True)
+
+
+def _type_mix(values: list[str]) -> dict[str, float]:
+    """Parse content type weights, given as ``Type=weight``."""
+    mix: dict[str, float] = {}
+    for value in values:
+        type_, _, weight = value.rpartition("=")
+        try:
+            mix[type_] = float(weight)
+        except ValueError:
+            type_ = ""
+        if not type_:
+            raise typer.BadParameter(
+                f"{value} is not a Type=weight pair", param_hint="--type"
+            )
+    return mix
+
+
+@app.command()
+def generate(
+    dst: Annotated[Path, typer.Argument(help="Folder receiving the export")],
+    items: Annotated[int, typer.Option(help="Number of content items", min=1)] = 1000,
+    depth: Annotated[
+        int, typer.Option(help="Maximum depth of the content tree", min=1)
+    ] = 4,
+    types: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--type",
+            help="Weight of a content type, as Type=weight. Repeat for each type",
+        ),
+    ] = None,
+    uid_queries: Annotated[
+        float,
+        typer.Option(
+            help="Share of Collections with a UID path query", min=0.0, max=1.0
+        ),
+    ] = 0.5,
+    default_pages: Annotated[
+        float,
+        typer.Option(help="Share of Folders with a default page", min=0.0, max=1.0),
+    ] = 0.3,
+    blob_size: Annotated[
+        int, typer.Option(help="Size, in bytes, of File and Image blobs", min=0)
+    ] = 16 * 1024,
+    redirects: Annotated[
+        float, typer.Option(help="Share of items with a redirect", min=0.0, max=1.0)
+    ] = 0.1,
+    relations: Annotated[
+        float,
+        typer.Option(help="Share of items related to another item", min=0.0, max=1.0),
+    ] = 0.1,
+    seed: Annotated[int, typer.Option(help="Seed of the random generator")] = 0,
+):
+    """Generate a synthetic ``collective.exportimport`` export in ``dst``."""
+    spec = t.BenchCorpus(
+        items=items,
+        depth=depth,
+        uid_queries=uid_queries,
+        default_pages=default_pages,
+        blob_size=blob_size,
+        redirects=redirects,
+        relations=relations,
+        seed=seed,
+    )
+    if types:
+        spec.types = _type_mix(types)
+    counts = bench.generate_corpus(dst, spec)
+    typer.echo(f"Generated a corpus of {items} items in {dst}")
+    for key, value in counts.items():
+        typer.echo(f" - {key}: {value}")
+
+
+@app.command(name="run")
+def run_bench(
+    ctx: typer.Context,
+    src: Annotated[Path, typer.Argument(help="Export to run the pipeline against")],
+    output: Annotated[Path, typer.Option(help="Path of the JSON result file")] = Path(
+        "bench-result.json"
+    ),
+    workers: Annotated[
+        int, typer.Option(help="Number of worker processes of the pipeline", min=1)
+    ] = 1,
+    repeat: Annotated[
+        int,
+        typer.Option(help="Number of runs, the median one is reported", min=1),
+    ] = 1,
+):
+    """Run the pipeline against ``src`` and record its performance."""
+    if ctx.obj is None:
+        typer.echo("Did not find a transmute.toml file.")
+        raise typer.Exit(1)
+    settings: t.TransmuteSettings = ctx.obj.settings
+    if not file_utils.check_path(src):
+        typer.echo(f"{src} does not exist")
+        raise typer.Exit(1)
+    with tempfile.TemporaryDirectory(prefix="transmute-bench-") as tmp_dir:
+        result = bench.run_benchmark(src, Path(tmp_dir), settings, workers, repeat)
+    output.write_bytes(file_utils.json_dumps(result))
+    typer.echo(f"Processed {result['items']} items in {result['elapsed']} seconds")
+    typer.echo(f" - Items per second: {result['items_per_second']}")
+    typer.echo(f" - Peak RSS: {result['peak_rss'] / 2**20:.1f} MiB")
+    for name, value in result["phases"].items():
+        typer.echo(f" - {name}: {value} seconds")
+    typer.echo(f"Wrote benchmark result to {output}")
+
+
+@app.command()
+def compare(
+    baseline: Annotated[Path, typer.Argument(help="Reference result file")],
+    current: Annotated[Path, typer.Argument(help="Result file to check")],
+    threshold: Annotated[
+        float,
+        typer.Option(help="Relative change flagged as a regression", min=0.0),
+    ] = 0.1,
+    min_time: Annotated[
+        float,
+        typer.Option(help="Ignore phases and steps faster than this, in seconds"),
+    ] = 0.05,
+):
+    """Compare two benchmark results, failing if ``current`` has regressions."""
+    try:
+        comparisons = bench.compare_results(
+            bench.load_result(baseline),
+            bench.load_result(current),
+            threshold,
+            min_time,
+        )
+    except (OSError, ValueError) as exc:
+        typer.echo(str(exc))
+        raise typer.Exit(1) from None
+    regressions = [item for item in comparisons if item.regression]
+    for item in comparisons:
+        flag = "  REGRESSION" if item.regression else ""
+        typer.echo(
+            f"{item.metric}: {item.baseline} -> {item.current} "
+            f"({item.change:+.1%}){flag}"
+        )
+    if regressions:
+        typer.echo(f"Found {len(regressions)} regressions")
+        raise typer.Exit(1)
+    typer.echo("No regressions found")
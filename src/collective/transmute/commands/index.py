@@ -0,0 +1,43 @@
+from collective.transmute import _types as t
+from collective.transmute.utils import files as file_utils
+from collective.transmute.utils import index as index_utils
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+
+app = typer.Typer()
+
+
+@app.command()
+def index(
+    ctx: typer.Context,
+    src: Annotated[Path, typer.Argument(help="Source path of the migration data")],
+    workers: Annotated[
+        int,
+        typer.Option(
+            help="Number of worker processes used to read the changed files",
+            min=1,
+        ),
+    ] = 1,
+    rebuild: Annotated[
+        bool,
+        typer.Option(help="Read all content files again"),
+    ] = False,
+) -> None:
+    """Builds, or updates, the source index of the export data in src directory."""
+    settings: t.TransmuteSettings = ctx.obj.settings
+    if not file_utils.check_path(src):
+        typer.echo(f"{src} does not exist")
+        raise typer.Exit(1) from None
+    src_files = file_utils.get_src_files(src)
+    with index_utils.open_index(src, settings) as source_index:
+        if rebuild:
+            source_index.clear()
+        stats = source_index.update(src_files.content, workers)
+        typer.echo(f"Source index: {source_index.path}")
+    typer.echo(f" - Added: {stats.added}")
+    typer.echo(f" - Updated: {stats.updated}")
+    typer.echo(f" - Removed: {stats.removed}")
+    typer.echo(f" - Unchanged: {stats.unchanged}")
@@ -1,26 +1,41 @@
 from collections import defaultdict
-from collections.abc import Iterator
+from collections.abc import Sequence
 from collective.transmute import _types as t
 from collective.transmute import get_logger
 from collective.transmute import layout
 from collective.transmute.utils import files as file_utils
+from collective.transmute.utils import index as index_utils
 from collective.transmute.utils import report_time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Annotated
+from typing import Any
 
 import asyncio
+import multiprocessing
+import orjson
+import os
 import typer
 
 
 app = typer.Typer()
 
 
+REPORT_CHUNK_SIZE = 500
+"""Number of files read by a worker in a single task."""
+
+_COUNTERS = ("types", "creators", "subjects")
+"""Counters of the report, by key."""
+
+_NESTED_COUNTERS = ("workflows", "layout")
+"""Counters of the report, by two keys."""
+
+
 def _create_state(
-    app_layout: layout.ApplicationLayout, files: Iterator
+    app_layout: layout.ApplicationLayout, files: Sequence[Path]
 ) -> t.ReportState:
     """Initialize a ReportState object."""
-    total = len(list(files))
-    app_layout.initialize_progress(total)
+    app_layout.initialize_progress(len(files))
     return t.ReportState(
         files=files,
         types=defaultdict(int),
@@ -41,40 +56,141 @@ async def _write_type_report(dst: Path, type_: str, state: t.ReportState) -> Pat
     return await file_utils.csv_dump(type_data, headers, report_path)
 
 
-async def _create_report(dst: Path, state: t.ReportState, report_types: list) -> Path:
-    logger = get_logger()
+def _add_entry(
+    counters: dict[str, Any],
+    source_file: str,
+    entry: t.IndexEntry,
+    report_types: list[str],
+) -> None:
+    """Add the entry of an item to the counters and per-type rows of a report."""
+    type_ = entry.type
+    counters["types"][type_] += 1
+    review_state = entry.review_state or "-"
+    if type_ in report_types:
+        counters["type_report"][type_].append({
+            "source_file": source_file,
+            "@id": entry.id,
+            "UID": entry.uid,
+            "@type": type_,
+            "title": entry.title,
+            "review_state": review_state,
+        })
+    counters["workflows"][entry.workflow or "-"][review_state] += 1
+    for subject in entry.subjects:
+        counters["subjects"][subject] += 1
+    for creator in entry.creators:
+        counters["creators"][creator] += 1
+    if entry.layout:
+        counters["layout"][type_][entry.layout] += 1
+
+
+def _add_item(
+    counters: dict[str, Any], source_file: str, item: dict, report_types: list[str]
+) -> None:
+    """Add an item to the counters and per-type rows of a report."""
+    _add_entry(counters, source_file, index_utils.item_entry(item), report_types)
+
+
+def _state_counters(state: t.ReportState) -> dict[str, Any]:
+    """Return the counters and per-type rows of a report state, by name."""
+    names = (*_COUNTERS, *_NESTED_COUNTERS, "type_report")
+    return {name: getattr(state, name) for name in names}
+
+
+def _report_files(files: list[Path], report_types: list[str]) -> dict[str, Any]:
+    """
+    Count the items of a chunk of content files, in a worker process.
+
+    Returns the partial counters and per-type rows, as plain dictionaries, in the
+    order a serial run would add them.
+    """
+    counters: dict[str, Any] = {name: defaultdict(int) for name in _COUNTERS}
+    for name in _NESTED_COUNTERS:
+        counters[name] = defaultdict(lambda: defaultdict(int))
+    counters["type_report"] = defaultdict(list)
+    for filepath in files:
+        item = orjson.loads(filepath.read_bytes())
+        _add_item(counters, filepath.name, item, report_types)
+    partial: dict[str, Any] = {name: dict(counters[name]) for name in _COUNTERS}
+    for name in _NESTED_COUNTERS:
+        partial[name] = {key: dict(value) for key, value in counters[name].items()}
+    partial["type_report"] = dict(counters["type_report"])
+    return partial
+
+
+def _merge(state: t.ReportState, partial: dict[str, Any]) -> None:
+    """Add the partial counters and per-type rows of a chunk to the report state."""
+    for name in _COUNTERS:
+        counter = getattr(state, name)
+        for key, value in partial[name].items():
+            counter[key] += value
+    for name in _NESTED_COUNTERS:
+        counter = getattr(state, name)
+        for key, values in partial[name].items():
+            for sub_key, value in values.items():
+                counter[key][sub_key] += value
+    for type_, rows in partial["type_report"].items():
+        state.type_report[type_].extend(rows)
+
+
+async def _count_items(state: t.ReportState, report_types: list[str]) -> None:
+    """Count the items of all content files in this process."""
+    counters = _state_counters(state)
     async for source_file, item in file_utils.json_reader(state.files):
-        type_ = item.get("@type")
-        state.types[type_] += 1
-        if type_ in report_types:
-            id_ = item.get("@id")
-            UID = item.get("UID")
-            title = item.get("title")
-            review_state = item.get("review_state", "-") or "-"
-            state.type_report[type_].append({
-                "source_file": source_file,
-                "@id": id_,
-                "UID": UID,
-                "@type": type_,
-                "title": title,
-                "review_state": review_state,
-            })
-        workflow_history: dict[str, list] = item.get("workflow_history", {}) or {}
-        workflows = tuple(workflow_history.keys())
-        workflow: str = workflows[0] if workflows else "-"
-        review_state = item.get("review_state", "-") or "-"
-        state.workflows[workflow][review_state] += 1
-        subjects = item.get("subjects", []) or []
-        for subject in subjects:
-            state.subjects[subject] += 1
-        for creator in item.get("creators", []):
-            state.creators[creator] += 1
-        if layout := item.get("layout"):
-            type_info = state.layout[type_]
-            if layout not in type_info:
-                type_info[layout] = 0
-            state.layout[type_][layout] += 1
+        _add_item(counters, source_file, item, report_types)
         state.progress.advance("processed")
+
+
+async def _count_items_parallel(
+    state: t.ReportState, report_types: list[str], workers: int
+) -> None:
+    """
+    Count the items of all content files in a process pool.
+
+    Chunks of files are counted by the workers, and merged in the order of the
+    files, so the report is the same as a serial run.
+    """
+    files = list(state.files)
+    chunks = [
+        files[idx : idx + REPORT_CHUNK_SIZE]
+        for idx in range(0, len(files), REPORT_CHUNK_SIZE)
+    ]
+    loop = asyncio.get_running_loop()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [
+            loop.run_in_executor(pool, _report_files, chunk, report_types)
+            for chunk in chunks
+        ]
+        for chunk, future in zip(chunks, futures, strict=True):
+            _merge(state, await future)
+            state.progress.advance("processed", len(chunk))
+
+
+def _count_entries(
+    state: t.ReportState, report_types: list[str], index: index_utils.SourceIndex
+) -> None:
+    """Count the items of all content files from their entries in the index."""
+    counters = _state_counters(state)
+    for entry in index.entries(state.files):
+        _add_entry(counters, os.path.basename(entry.path), entry, report_types)
+        state.progress.advance("processed")
+
+
+async def _create_report(
+    dst: Path,
+    state: t.ReportState,
+    report_types: list,
+    workers: int = 1,
+    index: index_utils.SourceIndex | None = None,
+) -> Path:
+    logger = get_logger()
+    if index:
+        _count_entries(state, report_types, index)
+    elif workers > 1:
+        await _count_items_parallel(state, report_types, workers)
+    else:
+        await _count_items(state, report_types)
     data = state.to_dict()
     report_path = Path(dst / "report-raw-data.json").resolve()
     path = await file_utils.json_dump(data, report_path)
@@ -107,6 +223,17 @@ def report(
             help="Portal types to report on. Please provide as comma-separated values.",
         ),
     ] = "",
+    workers: Annotated[
+        int,
+        typer.Option(
+            help="Number of worker processes used to read the content files",
+            min=1,
+        ),
+    ] = 1,
+    index: Annotated[
+        bool,
+        typer.Option(help="Count the items from the source index, updating it first"),
+    ] = False,
 ):
     """Generates a JSON file with a report of export data in src directory."""
     settings: t.TransmuteSettings = ctx.obj.settings
@@ -128,5 +255,18 @@ def report(
         consoles.print(f"- Found {len(src_files.content)} files to be processed")
         state = _create_state(app_layout, src_files.content)
         app_layout.update_layout(state)
-        with report_time("Report", consoles):
-            asyncio.run(_create_report(dst, state, report_types))
+        if not index:
+            with report_time("Report", consoles):
+                asyncio.run(_create_report(dst, state, report_types, workers))
+            return
+        with index_utils.open_index(src, settings) as source_index:
+            with report_time("Index", consoles):
+                stats = source_index.update(src_files.content, workers)
+            consoles.print(
+                f"- Indexed {stats.added + stats.updated} files "
+                f"({stats.unchanged} unchanged, {stats.removed} removed)"
+            )
+            with report_time("Report", consoles):
+                asyncio.run(
+                    _create_report(dst, state, report_types, index=source_index)
+                )
@@ -3,6 +3,7 @@ from collective.transmute import _types as t
 from collective.transmute import layout
 from collective.transmute.pipeline import pipeline
 from collective.transmute.utils import files as file_utils
+from collective.transmute.utils import index as index_utils
 from collective.transmute.utils import report_time
 from pathlib import Path
 from typing import Annotated
@@ -46,17 +47,45 @@ def _run_pipeline(
     clean_up: bool,
     write_report: bool,
     settings: t.TransmuteSettings,
+    workers: int = 1,
+    incremental: bool = False,
+    resume: bool = False,
+    index: bool = False,
 ):
     consoles.print(f"Listing content in {src}")
     src_files = file_utils.get_src_files(src)
     total = len(src_files.content)
     consoles.print(f"- Found {total} files to be processed")
+    headers: list[tuple[str, str]] | None = None
+    if index:
+        with (
+            index_utils.open_index(src, settings) as source_index,
+            report_time("Index", consoles),
+        ):
+            stats = source_index.update(src_files.content, workers)
+            headers = source_index.headers(src_files.content)
+        consoles.print(
+            f"- Indexed {stats.added + stats.updated} files "
+            f"({stats.unchanged} unchanged, {stats.removed} removed)"
+        )
     if clean_up:
         _remove_existing_data(dst, consoles)
     state = _create_state(app_layout, total, write_report=write_report)
     app_layout.update_layout(state)
     with report_time("Transmute", consoles):
-        asyncio.run(pipeline(src_files, dst, state, consoles, settings))
+        asyncio.run(
+            pipeline(
+                src_files,
+                dst,
+                state,
+                consoles,
+                settings,
+                workers=workers,
+                incremental=incremental,
+                resume=resume,
+                headers=headers,
+            )
+        )
 
 
 @app.command()
@@ -78,11 +107,47 @@ def run(
         bool,
         typer.Option(help="Use rich UI"),
     ] = True,
+    workers: Annotated[
+        int,
+        typer.Option(
+            help="Number of worker processes used to process the content files",
+            min=1,
+        ),
+    ] = 1,
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            help="Only process content files changed since the last incremental run"
+        ),
+    ] = False,
+    resume: Annotated[
+        bool,
+        typer.Option(help="Continue an interrupted run from its last checkpoint"),
+    ] = False,
+    index: Annotated[
+        bool,
+        typer.Option(
+            help="Plan --workers and --incremental runs from the source index"
+        ),
+    ] = False,
 ):
     """Transmutes data from ``src`` folder (in ``collective.exportimport`` format)
     to ``plone.exportimport`` format in the ``dst`` folder.
     """
     settings: t.TransmuteSettings = ctx.obj.settings
+    if incremental and (clean_up or workers > 1):
+        typer.echo("--incremental cannot be used with --clean-up or --workers")
+        raise typer.Exit(1) from None
+    if resume and (clean_up or incremental or workers > 1):
+        typer.echo(
+            "--resume cannot be used with --clean-up, --incremental or --workers"
+        )
+        raise typer.Exit(1) from None
+    if (incremental or resume) and settings.config.get("state_store") == "sqlite":
+        typer.echo(
+            '--incremental and --resume cannot be used with state_store="sqlite"'
+        )
+        raise typer.Exit(1) from None
     # Check if paths exist
     file_utils.check_paths(src, dst)
     app_layout = layout.TransmuteLayout(title=f"{src} -> {dst}")
@@ -90,8 +155,30 @@ def run(
     if ui:
         with layout.live(app_layout, redirect_stderr=False):
             _run_pipeline(
-                src, dst, app_layout, consoles, clean_up, write_report, settings
+                src,
+                dst,
+                app_layout,
+                consoles,
+                clean_up,
+                write_report,
+                settings,
+                workers,
+                incremental,
+                resume,
+                index,
             )
     else:
         consoles.disable_ui()
-        _run_pipeline(src, dst, app_layout, consoles, clean_up, write_report, settings)
+        _run_pipeline(
+            src,
+            dst,
+            app_layout,
+            consoles,
+            clean_up,
+            write_report,
+            settings,
+            workers,
+            incremental,
+            resume,
+            index,
+        )
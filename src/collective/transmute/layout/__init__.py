@@ -119,7 +119,101 @@ class TransmuteReport:
         return Panel(grid, title=self.title, border_style="green")
 
 
-def progress_panel(progress: t.PipelineProgress | t.ReportProgress) -> Panel:
+class ReaderReport:
+    """
+    Display the prefetch counters of the content files reader.
+
+    Parameters
+    ----------
+    stats : ReaderStats
+        The reader statistics to display.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> report = ReaderReport(state.reader)
+    """
+
+    def __init__(self, stats: t.ReaderStats):
+        self.stats = stats
+
+    def __rich__(self) -> str:
+        """
+        Render the prefetch counters.
+
+        Returns
+        -------
+        str
+            The prefetch hits and misses.
+        """
+        stats = self.stats
+        return (
+            f"[b]Prefetch[/b] [green]{stats.hits} hits[/green] "
+            f"[red]{stats.misses} misses[/red]"
+        )
+
+
+class TimingsReport:
+    """
+    Display the pipeline steps with the highest cumulative time.
+
+    Parameters
+    ----------
+    timings : StepTimings
+        The step timings to display.
+    limit : int, optional
+        Maximum number of steps to display (default: 8).
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> report = TimingsReport(state.timings)
+        >>> panel = report.__rich__()
+    """
+
+    def __init__(self, timings: t.StepTimings, limit: int = 8):
+        self.timings = timings
+        self.limit = limit
+
+    def __rich__(self) -> Panel:
+        """
+        Render the step timings as a Rich Panel.
+
+        Returns
+        -------
+        Panel
+            A Rich Panel object displaying the step timings.
+        """
+        table = Table(expand=True, box=None, padding=(0, 1))
+        table.add_column("Step", justify="left", ratio=3, no_wrap=True)
+        table.add_column("Calls", justify="right", ratio=1)
+        table.add_column("Mean", justify="right", ratio=1)
+        table.add_column("p95", justify="right", ratio=1)
+        table.add_column("Total", justify="right", ratio=1)
+        steps = sorted(
+            self.timings.steps.items(), key=lambda item: item[1].total, reverse=True
+        )
+        for (stage, name), stats in steps:
+            if stage == "run":
+                continue
+            table.add_row(
+                name,
+                f"{stats.calls}",
+                f"{stats.mean * 1000:.1f}ms",
+                f"{stats.percentile(95) * 1000:.1f}ms",
+                f"{stats.total:.1f}s",
+            )
+            if table.row_count >= self.limit:
+                break
+        return Panel(table, title="Timings", border_style="green")
+
+
+def progress_panel(
+    progress: t.PipelineProgress | t.ReportProgress,
+    reader: t.ReaderStats | None = None,
+) -> Panel:
     """
     Create a progress panel for the current pipeline or report progress.
 
@@ -127,6 +221,8 @@ def progress_panel(progress: t.PipelineProgress | t.ReportProgress) -> Panel:
     ----------
     progress : PipelineProgress or ReportProgress
         The progress object to display.
+    reader : ReaderStats, optional
+        Prefetch statistics of the content files reader to display.
 
     Returns
     -------
@@ -137,6 +233,8 @@ def progress_panel(progress: t.PipelineProgress | t.ReportProgress) -> Panel:
     progress_table.add_row(progress.processed)
     if isinstance(progress, t.PipelineProgress):
         progress_table.add_row(progress.dropped)
+    if reader is not None:
+        progress_table.add_row(ReaderReport(reader))
     return Panel(
         progress_table,
         title="[b]Progress",
@@ -298,11 +396,12 @@ class TransmuteLayout(ApplicationLayout):
             The pipeline state object.
         """
         layout = self.layout
-        layout["footer"].update(progress_panel(state.progress))
+        layout["footer"].update(progress_panel(state.progress, state.reader))
         grid = Table.grid(expand=True)
         grid.add_column(justify="left", ratio=1)
         grid.add_row(TransmuteReport(state.exported, "Transmuted"))
         grid.add_row(TransmuteReport(state.dropped, "Dropped"))
+        grid.add_row(TimingsReport(state.timings))
         layout["side"].update(
             Panel(
                 grid,
@@ -13,19 +13,33 @@ Example:
         ... )
 """
 
+from collections.abc import AsyncIterator
 from collections.abc import Callable
 from collective.transmute import _types as t
 from collective.transmute import get_logger
+from collective.transmute.pipeline import checkpoint as checkpoint_utils
+from collective.transmute.pipeline import incremental as incremental_run
 from collective.transmute.pipeline import prepare
 from collective.transmute.pipeline import report
+from collective.transmute.pipeline import shards
+from collective.transmute.pipeline import store as state_store
+from collective.transmute.pipeline.checkpoint import Checkpointer
 from collective.transmute.pipeline.pipeline import run_pipeline
+from collective.transmute.pipeline.pipeline import step_planner
+from collective.transmute.pipeline.writer import ItemWriter
+from collective.transmute.reports import paths as paths_report
 from collective.transmute.settings import get_settings
+from collective.transmute.utils import blocks as blocks_utils
 from collective.transmute.utils import exportimport as ei_utils
 from collective.transmute.utils import files as file_utils
 from collective.transmute.utils import load_all_steps
 from collective.transmute.utils import redirects as redirect_utils
 from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
+from typing import cast
+
+import orjson
 
 
 ITEM_PLACEHOLDER = "--"
@@ -162,14 +176,92 @@ async def _write_metadata(
     settings: t.TransmuteSettings,
 ):
     # Sort data files according to path
-    state.paths.sort()
-    metadata._data_files_ = [i[-1] for i in state.paths]
+    metadata._data_files_ = [i[-1] for i in state_store.sorted_paths(state.paths)]
     metadata_file = await file_utils.export_metadata(
         metadata, state, consoles, settings
     )
     return metadata_file
 
 
+def _deferred(
+    item: t.PloneItem, state: t.PipelineState, enabled: bool, old_uid: str | None
+) -> dict[str, bytes] | None:
+    """Return where to keep the data of an item scheduled for post-processing."""
+    post_processing = state.post_processing
+    scheduled = item["UID"] in post_processing or (old_uid in post_processing)
+    return state.deferred if enabled and scheduled else None
+
+
+def _record_export(
+    state: t.PipelineState,
+    item_type: str,
+    item_uid: str,
+    item_path: str,
+    old_uid: str | None,
+    item_files: t.ItemFiles,
+) -> None:
+    """Update the pipeline state with an item written to disk."""
+    metadata = cast(t.MetadataInfo, state.metadata)
+    metadata._blob_files_.extend(item_files.blob_files)
+    uids = state.uids
+    uid_path = state.uid_path
+    state.exported[item_type] += 1
+    state.seen.add(item_uid)
+    uids[item_uid] = item_uid
+    uid_path[item_uid] = item_path
+    state.paths.append((item_path, item_uid, item_files.data))
+    # Map the old_uid to the new uid
+    if old_uid:
+        uids[old_uid] = item_uid
+        uid_path[old_uid] = item_path
+        if post_steps := state.post_processing.pop(old_uid, None):
+            state.post_processing[item_uid] = post_steps
+
+
+def _record_write_error(
+    state: t.PipelineState, item_uid: str, old_uid: str | None, exc: Exception
+) -> None:
+    """Count an item that could not be written as dropped by an error."""
+    state.progress.advance("dropped")
+    state.dropped["_error"] += 1
+    state.deferred.pop(item_uid, None)
+    for uid in (item_uid, old_uid):
+        if uid:
+            state.post_processing.pop(uid, None)
+
+
+async def _post_process_items(
+    state: t.PipelineState, content_folder: Path, consoles: t.ConsoleArea
+) -> AsyncIterator[t.PloneItem]:
+    """Yield the items scheduled for post-processing, from memory or disk."""
+    # Process uids
+    uids = set()
+    for uid in state.post_processing:
+        if uid in state.uids:
+            uids.add(state.uids[uid])
+        else:
+            consoles.debug(f"UID {uid} not found in state.uids")
+    deferred = state.deferred
+    in_memory = [uid for uid in deferred if uid in uids]
+    uids.difference_update(in_memory)
+    for uid in in_memory:
+        yield orjson.loads(deferred.pop(uid))
+    # Get data paths
+    content_files = [
+        content_folder / path for _, uid, path in state.paths if uid in uids
+    ]
+    async for _, raw_item in file_utils.json_reader(content_files):
+        yield raw_item
+
+
+async def _write_deferred(state: t.PipelineState, content_folder: Path) -> None:
+    """Write the deferred items left without post-processing steps."""
+    deferred = state.deferred
+    while deferred:
+        _, data = deferred.popitem()
+        await file_utils.export_item(orjson.loads(data), content_folder)
+
+
 async def post_process(
     state: t.PipelineState,
     consoles: t.ConsoleArea,
@@ -177,6 +269,19 @@ async def post_process(
     settings: t.TransmuteSettings,
     debugger: Callable,
 ):
+    """
+    Run the post-processing steps of the items scheduled for them.
+
+    Items kept in memory by ``defer_post_processing`` are written here, once.
+    Other items are read back from the destination folder and written again.
+
+    Args:
+        state (PipelineState): The pipeline state object.
+        consoles (ConsoleArea): Console logging utility.
+        content_folder (Path): Folder where the items are exported.
+        settings (TransmuteSettings): The transmute settings object.
+        debugger (Callable): Debug logging function.
+    """
     metadata = state.metadata
     if not metadata:
         consoles.debug("No metadata found, skipping post-processing")
@@ -185,32 +290,22 @@ async def post_process(
     consoles.debug(
         f"Starting pipeline post-processing of {total_post_processing} items"
     )
-    # Process uids
-    uids = []
-    for uid in state.post_processing:
-        if uid in state.uids:
-            uids.append(state.uids[uid])
-        else:
-            consoles.debug(f"UID {uid} not found in state.uids")
-    # Get data paths
-    content_files = [
-        content_folder / path for _, uid, path in state.paths if uid in uids
-    ]
     # Process
-    async for _, raw_item in file_utils.json_reader(content_files):
+    async for raw_item in _post_process_items(state, content_folder, consoles):
         uid = raw_item["UID"]
         data_folder = content_folder / uid
         steps_names = tuple(state.post_processing[uid])
         steps = load_all_steps(steps_names)
         async for item, last_step, is_new in run_pipeline(
-            steps, raw_item, state, consoles, settings
+            steps, raw_item, state, consoles, settings, "post_process"
         ):
             if not item:
                 # Dropped item, we need to remove it
                 file_utils.remove_data(data_folder, consoles)
                 debugger(f"Item {uid} dropped during post-processing")
                 continue
-            item_files = await file_utils.export_item(item, content_folder)
+            with state.timings.measure("post_process", "export_item"):
+                item_files = await file_utils.export_item(item, content_folder)
             if is_new:
                 # This should not happen, but just in case we log it
                 debugger(f"New item found during post-processing: {item.get('UID')}")
@@ -218,49 +313,117 @@ async def post_process(
                 metadata._blob_files_.extend(item_files.blob_files)
                 state.paths.append((item["@id"], item["UID"], data_file))
             debugger(f"Post-processing: Item {uid} last step {last_step}")
+    await _write_deferred(state, content_folder)
 
 
-async def pipeline(
-    src_files: t.SourceFiles,
-    dst: Path,
+def _lazy_blob_fields(settings: t.TransmuteSettings) -> tuple[str, ...]:
+    """Return the blob fields to keep in the source files while processing."""
+    blobs_settings: dict = settings.steps.get("blobs", {})
+    if not blobs_settings.get("lazy", False):
+        return ()
+    return tuple(blobs_settings.get("field_names", ()))
+
+
+def _reader(
+    steps: tuple[t.PipelineStep, ...],
+    content_files: list[Path],
+    state: t.PipelineState,
+    settings: t.TransmuteSettings,
+) -> AsyncIterator[tuple[str, t.PloneItem]]:
+    """
+    Return the reader of the content files, reading ahead for block conversions.
+
+    Blob payloads are kept in the source files, when blobs are lazy, or until the
+    items pass the pre-filter of the pipeline. In the latter case, the payloads
+    are then sliced from the contents of the files already read.
+    """
+    config = settings.config
+    blob_fields = _lazy_blob_fields(settings)
+    keep_data = not blob_fields
+    if keep_data:
+        blob_fields = step_planner(steps, settings).payload_fields
+    reader = file_utils.json_reader(
+        content_files,
+        prefetch=config.get("prefetch", 8),
+        max_bytes=config.get("prefetch_max_mb", 256) * 1024 * 1024,
+        stats=state.reader,
+        blob_fields=blob_fields,
+        keep_data=keep_data,
+    )
+    if converter := blocks_utils.active_converter():
+        return converter.read_ahead(reader)
+    return reader
+
+
+async def process_items(
+    steps: tuple[t.PipelineStep, ...],
+    content_files: list[Path],
     state: t.PipelineState,
     consoles: t.ConsoleArea,
-    settings: t.TransmuteSettings | None = None,
+    settings: t.TransmuteSettings,
+    content_folder: Path,
+    debugger: Callable,
+    file_done: Callable[[int], None] | None = None,
+    checkpoint: Checkpointer | None = None,
 ):
-    if not settings:
-        settings = get_settings()
-    content_folder = dst / "content"
-    consoles.debug("Metadata: Loading")
-    metadata: t.MetadataInfo = await ei_utils.initialize_metadata(
-        src_files, content_folder
-    )
-    consoles.debug("Metadata: Loaded")
-    # Add metadata to the state
-    state.metadata = metadata
-    steps: tuple[t.PipelineStep, ...] = all_steps(settings)
-    content_files: list[Path] = src_files.content
+    """
+    Run the pipeline steps for every content file and export the results.
+
+    This is the main loop of the pipeline. It updates the pipeline state with
+    the exported and dropped items, the UID and path mappings, and the report
+    of path transformations. Exported items are recorded once they are written
+    to disk; items that could not be written are counted as dropped by
+    ``_error``.
+
+    Args:
+        steps (tuple[PipelineStep, ...]): Pipeline steps to run.
+        content_files (list[Path]): Content files to process, in order.
+        state (PipelineState): The pipeline state object.
+        consoles (ConsoleArea): Console logging utility.
+        settings (TransmuteSettings): The transmute settings object.
+        content_folder (Path): Folder where the items are exported.
+        debugger (Callable): Debug logging function.
+        file_done (Callable[[int], None] | None): Optional callback, called with
+            the position of each source file in ``content_files`` after all
+            items produced by it were handled and written.
+        checkpoint (Checkpointer | None): Optional checkpointer, saving the
+            pipeline state at regular intervals, once all items produced by the
+            processed source files are written.
+
+    Example:
+        .. code-block:: pycon
+
+            >>> await process_items(
+            ...     steps, content_files, state, consoles, settings,
+            ...     content_folder, debugger
+            ... )
+    """
+    metadata = cast(t.MetadataInfo, state.metadata)
     # Pipeline state variables
     total = state.total
     processed = state.processed
-    exported = state.exported
     dropped = state.dropped
     progress = state.progress
-    seen = state.seen
-    uids = state.uids
-    uid_path = state.uid_path
     path_transforms = state.path_transforms
-    paths = state.paths
-    consoles.debug(f"Starting pipeline processing of {state.total} items")
 
     site_root = settings.site_root["dest"]
     redirects = metadata.redirects
 
-    with pipeline_debugger(consoles, state) as debugger:
-        # Run the prepare steps of the pipeline
-        await prepare.prepare_pipeline(state, settings, consoles)
-
-        logger = get_logger()
-        async for filename, raw_item in file_utils.json_reader(content_files):
+    logger = get_logger()
+    config = settings.config
+    writer = ItemWriter(
+        content_folder,
+        consoles,
+        workers=config.get("writers", 4),
+        queue_size=config.get("writers_queue_size", 64),
+        timings=state.timings,
+    )
+    defer = config.get("defer_post_processing", True)
+    reader = _reader(steps, content_files, state, settings)
+    position = -1
+    async with writer:
+        async for filename, raw_item in reader:
+            position += 1
             src_item = {
                 "filename": filename,
                 "src_path": raw_item.get("@id"),
@@ -304,23 +467,23 @@ async def pipeline(
                     path_transforms.append(
                         t.PipelineItemReport(**report_src, **dst_item)
                     )
-                    item_files = await file_utils.export_item(item, content_folder)
-                    # Update metadata
-                    data_file = item_files.data
-                    metadata._blob_files_.extend(item_files.blob_files)
-                    item_path = item["@id"]
                     item_uid = item["UID"]
-                    exported[item["@type"]] += 1
-                    seen.add(item_uid)
-                    uids[item_uid] = item_uid
-                    uid_path[item_uid] = item_path
-                    paths.append((item_path, item_uid, data_file))
-                    # Map the old_uid to the new uid
-                    if old_uid := item.pop("_UID", None):
-                        uids[old_uid] = item_uid
-                        uid_path[old_uid] = item_path
-                        if post_steps := state.post_processing.pop(old_uid, None):
-                            state.post_processing[item_uid] = post_steps
+                    old_uid = item.pop("_UID", None)
+                    await writer.submit(
+                        item,
+                        _deferred(item, state, defer, old_uid),
+                        on_written=partial(
+                            _record_export,
+                            state,
+                            item["@type"],
+                            item_uid,
+                            item["@id"],
+                            old_uid,
+                        ),
+                        on_failed=partial(
+                            _record_write_error, state, item_uid, old_uid
+                        ),
+                    )
             except Exception as exc:
                 item_id = raw_item.get("@id", "unknown")
                 item_uid = raw_item.get("UID", "unknown")
@@ -333,15 +496,209 @@ async def pipeline(
                 progress.advance("processed")
                 progress.advance("dropped")
                 dropped["_error"] += 1
-
-        if state.post_processing:
-            await post_process(state, consoles, content_folder, settings, debugger)
+            if file_done:
+                await writer.flush()
+                file_done(position)
+            if checkpoint and checkpoint.due(position):
+                await writer.flush()
+                state.processed = processed
+                state.total = total
+                await checkpoint.save(state, settings, position)
+            path_transforms.spill()
 
     # Update state with final counts
     state.processed = processed
     state.total = total
+
+
+def _checkpointer(
+    src_files: t.SourceFiles,
+    dst: Path,
+    consoles: t.ConsoleArea,
+    settings: t.TransmuteSettings,
+    enabled: bool,
+    resume: bool,
+    spool: Path | None = None,
+) -> tuple[Checkpointer | None, t.PipelineCheckpoint | None]:
+    """
+    Return the checkpointer of a run and, when resuming, the last checkpoint.
+
+    A checkpoint is only resumed from if ``spool``, the spool of the paths
+    report, still holds the rows written before it.
+    """
+    config = settings.config
+    interval: int = config.get("checkpoint_interval", 1000)
+    if not enabled or not (interval > 0 or resume):
+        return None, None
+    fingerprint = checkpoint_utils.fingerprint(settings, src_files)
+    seconds: float = config.get("checkpoint_seconds", 300)
+    checkpointer = Checkpointer(dst, fingerprint, interval, seconds)
+    resume_data = checkpointer.load() if resume else None
+    if (
+        resume_data
+        and spool
+        and not paths_report.spool_complete(
+            spool, resume_data.path_transforms.spilled_bytes
+        )
+    ):
+        consoles.print_log(
+            f"The paths report spool {spool} is missing or incomplete, "
+            "the checkpoint cannot be used"
+        )
+        resume_data = None
+    if resume and not resume_data:
+        consoles.print_log("No checkpoint found for this run, starting from scratch")
+    return checkpointer, resume_data
+
+
+def _state_store(
+    dst: Path,
+    state: t.PipelineState,
+    settings: t.TransmuteSettings,
+    enabled: bool,
+) -> state_store.StateStore | None:
+    """Move the lookup tables of the state to the configured store, if any."""
+    store = state_store.open_store(dst, settings) if enabled else None
+    if store:
+        store.attach(state)
+    return store
+
+
+async def _finish_run(
+    run: incremental_run.IncrementalRun | None,
+    checkpointer: Checkpointer | None,
+    store: state_store.StateStore | None,
+    spool: paths_report.PathsReportSpool | None,
+) -> None:
+    """Save the incremental manifest, and remove the files of a completed run."""
+    if run:
+        await run.save()
+    if checkpointer:
+        checkpointer.remove()
+    if store:
+        store.close()
+    if spool and spool.transforms.sink is spool:
+        # The paths report step did not run
+        spool.discard()
+
+
+async def pipeline(
+    src_files: t.SourceFiles,
+    dst: Path,
+    state: t.PipelineState,
+    consoles: t.ConsoleArea,
+    settings: t.TransmuteSettings | None = None,
+    workers: int = 1,
+    incremental: bool = False,
+    resume: bool = False,
+    headers: list[tuple[str, str]] | None = None,
+):
+    """
+    Run the full pipeline: metadata loading, item processing, post-processing,
+    final reports and metadata export.
+
+    Args:
+        src_files (SourceFiles): Source metadata and content files.
+        dst (Path): Destination folder.
+        state (PipelineState): The pipeline state object.
+        consoles (ConsoleArea): Console logging utility.
+        settings (TransmuteSettings | None): The transmute settings object.
+        workers (int): Number of worker processes. With more than one worker, the
+            content files are split into shards and processed in a process pool
+            (see :mod:`collective.transmute.pipeline.shards`).
+        incremental (bool): Only process the content files that changed since the
+            previous incremental run, replaying the others from the manifest stored
+            in ``dst`` (see :mod:`collective.transmute.pipeline.incremental`).
+        resume (bool): Continue an interrupted run from its last checkpoint (see
+            :mod:`collective.transmute.pipeline.checkpoint`).
+        headers (list[tuple[str, str]] | None): ``(UID, @id)`` of each content file,
+            from the source index (see :mod:`collective.transmute.utils.index`).
+            Used to plan sharded and incremental runs without reading the files.
+
+    Returns:
+        Path: The path of the metadata file.
+    """
+    if not settings:
+        settings = get_settings()
+    content_folder = dst / "content"
+    run: incremental_run.IncrementalRun | None = None
+    if incremental:
+        run = incremental_run.IncrementalRun(dst, settings, src_files.metadata, headers)
+    else:
+        incremental_run.remove_manifest(dst)
+    store = _state_store(dst, state, settings, not (incremental or resume))
+    checkpointer, resume_data = _checkpointer(
+        src_files,
+        dst,
+        consoles,
+        settings,
+        workers == 1 and not incremental and not store,
+        resume,
+        paths_report.spool_path(dst, settings) if state.write_report else None,
+    )
+    consoles.debug("Metadata: Loading")
+    metadata: t.MetadataInfo = await ei_utils.initialize_metadata(
+        src_files, content_folder
+    )
+    consoles.debug("Metadata: Loaded")
+    # Add metadata to the state
+    state.metadata = metadata
+    steps: tuple[t.PipelineStep, ...] = all_steps(settings)
+    content_files: list[Path] = src_files.content
+
+    timings = state.timings
+    with pipeline_debugger(consoles, state) as debugger:
+        # Run the prepare steps of the pipeline
+        with timings.measure("run", "prepare_pipeline"):
+            await prepare.prepare_pipeline(state, settings, consoles)
+
+        if checkpointer and resume_data:
+            checkpointer.restore(resume_data, state, settings)
+            metadata = cast(t.MetadataInfo, state.metadata)
+            content_files = content_files[resume_data.position :]
+            consoles.print_log(
+                f"Resuming from checkpoint after {resume_data.position} files"
+            )
+        spool = paths_report.open_paths_report(state, settings, dst)
+
+        with (
+            timings.measure("run", "process_items"),
+            blocks_utils.blocks_cache(settings, state.blocks_cache),
+        ):
+            async with blocks_utils.blocks_converter(settings, workers == 1):
+                if workers > 1:
+                    await shards.run_sharded(
+                        content_files,
+                        state,
+                        consoles,
+                        settings,
+                        content_folder,
+                        workers,
+                        headers,
+                    )
+                elif run:
+                    await run.process(
+                        steps, content_files, state, consoles, content_folder, debugger
+                    )
+                else:
+                    await process_items(
+                        steps,
+                        content_files,
+                        state,
+                        consoles,
+                        settings,
+                        content_folder,
+                        debugger,
+                        checkpoint=checkpointer,
+                    )
+
+        if state.post_processing or state.deferred:
+            with timings.measure("run", "post_process"):
+                await post_process(state, consoles, content_folder, settings, debugger)
+
     # Reports after pipeline execution
     await report.final_reports(state, settings, consoles)
     # Write metadata file
     metadata_file = await _write_metadata(metadata, state, consoles, settings)
+    await _finish_run(run, checkpointer, store, spool)
     return metadata_file
@@ -0,0 +1,215 @@
+"""
+Checkpoints of the pipeline state for ``collective.transmute``.
+
+While the content files are processed, the pipeline state is periodically saved,
+as a pickle, in the destination folder. A checkpoint is only taken after all
+items produced by the processed source files were written to disk, so an
+interrupted run can be resumed from the first source file not yet processed.
+
+Each checkpoint holds the whole state, so its cost grows with the number of
+processed items. Checkpoints are then spaced both by a number of source files
+and by a minimum time, and the state is serialized in a worker thread, keeping
+the event loop responsive.
+Post-processing, reports and metadata export then run as if the run had never
+been interrupted.
+
+A checkpoint is only used by a run with the same settings and content files, and
+is removed once the run is completed.
+
+Example:
+    .. code-block:: pycon
+
+        >>> checkpointer = Checkpointer(dst, fingerprint, interval=1000, seconds=300)
+        >>> if data := checkpointer.load():
+        ...     checkpointer.restore(data, state, settings)
+"""
+
+from collective.transmute import _types as t
+from collective.transmute.pipeline import incremental
+from pathlib import Path
+from time import monotonic
+from typing import cast
+
+import asyncio
+import hashlib
+import os
+import pickle
+
+
+CHECKPOINT_FILE = ".transmute-checkpoint.pickle"
+"""Name of the checkpoint file, stored in the destination folder."""
+
+
+def fingerprint(settings: t.TransmuteSettings, src_files: t.SourceFiles) -> str:
+    """
+    Return the hash identifying the inputs of a run.
+
+    Args:
+        settings (TransmuteSettings): The transmute settings object.
+        src_files (SourceFiles): Source metadata and content files.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(incremental.settings_hash(settings, src_files.metadata).encode())
+    digest.update(incremental.types_hash(settings, settings.types).encode())
+    for filepath in src_files.content:
+        digest.update(str(filepath).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class Checkpointer:
+    """
+    Save and restore checkpoints of the pipeline state.
+
+    Args:
+        dst (Path): Destination folder, holding the checkpoint.
+        fingerprint (str): Hash identifying the inputs of the run.
+        interval (int): Number of source files processed between checkpoints.
+            Use ``0`` to disable checkpoints.
+        seconds (float): Minimum time, in seconds, between checkpoints. The
+            time is counted from the start of the run for the first checkpoint.
+    """
+
+    def __init__(self, dst: Path, fingerprint: str, interval: int, seconds: float = 0):
+        self.path = dst / CHECKPOINT_FILE
+        self.fingerprint = fingerprint
+        self.interval = interval
+        self.seconds = seconds
+        self.offset = 0
+        """Position of the first source file processed by this run."""
+        self.last_save = monotonic()
+        """Time of the last checkpoint, or of the start of the run."""
+
+    def due(self, position: int) -> bool:
+        """
+        Check if a checkpoint should be taken after a source file.
+
+        Args:
+            position (int): Position of the source file among the files
+                processed by this run.
+
+        Returns:
+            bool: ``True`` if a checkpoint should be taken.
+        """
+        if self.interval <= 0:
+            return False
+        if (self.offset + position + 1) % self.interval:
+            return False
+        return monotonic() - self.last_save >= self.seconds
+
+    async def save(
+        self, state: t.PipelineState, settings: t.TransmuteSettings, position: int
+    ) -> Path:
+        """
+        Save the pipeline state after a source file.
+
+        All items produced up to this source file must be written to disk, and
+        the state must not change until the checkpoint is saved: it is
+        serialized in a worker thread.
+
+        Args:
+            state (PipelineState): The pipeline state object, with up to date
+                counters.
+            settings (TransmuteSettings): The transmute settings object.
+            position (int): Position of the source file among the files
+                processed by this run.
+
+        Returns:
+            Path: The path of the checkpoint file.
+        """
+        data = t.PipelineCheckpoint(
+            fingerprint=self.fingerprint,
+            position=self.offset + position + 1,
+            total=state.total,
+            processed=state.processed,
+            exported=dict(state.exported),
+            dropped=dict(state.dropped),
+            seen=state.seen,
+            uids=state.uids,
+            uid_path=state.uid_path,
+            path_transforms=state.path_transforms,
+            paths=state.paths,
+            post_processing=state.post_processing,
+            deferred=state.deferred,
+            annotations=state.annotations,
+            metadata=state.metadata,
+            drop=settings.paths["filter"]["drop"],
+            reader=state.reader,
+            blocks_cache=state.blocks_cache,
+            timings=state.timings,
+        )
+        await asyncio.to_thread(self._dump, data)
+        self.last_save = monotonic()
+        return self.path
+
+    def _dump(self, data: t.PipelineCheckpoint) -> None:
+        """Write a checkpoint to disk."""
+        # Write to a temporary file first, to always keep a valid checkpoint
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as fh:
+            pickle.dump(data, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> t.PipelineCheckpoint | None:
+        """
+        Load the checkpoint of a previous run with the same inputs.
+
+        Returns:
+            PipelineCheckpoint | None: The checkpoint, if a valid one exists.
+        """
+        try:
+            with open(self.path, "rb") as fh:
+                data = pickle.load(fh)  # noqa: S301
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        if not isinstance(data, t.PipelineCheckpoint):
+            return None
+        if data.fingerprint != self.fingerprint:
+            return None
+        return data
+
+    def restore(
+        self,
+        data: t.PipelineCheckpoint,
+        state: t.PipelineState,
+        settings: t.TransmuteSettings,
+    ) -> None:
+        """
+        Restore the pipeline state from a checkpoint.
+
+        Args:
+            data (PipelineCheckpoint): The checkpoint.
+            state (PipelineState): The pipeline state object.
+            settings (TransmuteSettings): The transmute settings object.
+        """
+        self.offset = data.position
+        state.total = data.total
+        state.processed = data.processed
+        state.exported.update(data.exported)
+        state.dropped.update(data.dropped)
+        state.seen = data.seen
+        state.uids = data.uids
+        state.uid_path = data.uid_path
+        state.path_transforms = data.path_transforms
+        state.paths = data.paths
+        state.post_processing = data.post_processing
+        state.deferred = data.deferred
+        state.annotations = data.annotations
+        state.metadata = cast(t.MetadataInfo, data.metadata)
+        state.reader.hits = data.reader.hits
+        state.reader.misses = data.reader.misses
+        state.blocks_cache.hits = data.blocks_cache.hits
+        state.blocks_cache.misses = data.blocks_cache.misses
+        state.timings.steps = data.timings.steps
+        settings.paths["filter"]["drop"] = data.drop
+        progress = state.progress
+        progress.total("processed", state.total)
+        progress.advance("processed", state.processed)
+        progress.advance("dropped", sum(state.dropped.values()))
+
+    def remove(self) -> None:
+        """Remove the checkpoint, if any."""
+        self.path.unlink(missing_ok=True)
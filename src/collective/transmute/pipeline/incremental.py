@@ -0,0 +1,589 @@
+"""
+Incremental runs of the pipeline for ``collective.transmute``.
+
+A manifest stored in the destination folder records, for every source file, a
+hash of its contents, a hash of the settings of the types it produced, and the
+changes its processing made to the pipeline state: exported ``data.json`` and
+blob paths, UID mappings, relations, report entries and counters.
+
+On the next incremental run, files whose inputs and effective configuration did
+not change are not processed again: their recorded changes are replayed into the
+pipeline state, so ``__metadata__.json``, the relations and the redirects are
+rebuilt exactly as in a full run. The remaining files are processed by the
+pipeline steps.
+
+Rerun rules
+    A file is processed again when it is new or its contents changed, when the
+    settings of one of its types changed, when it was scheduled for
+    post-processing or failed on the previous run, when the path of a file
+    processed again, or removed, is a prefix of its path, or when it is part of
+    a default page pair with a file that is processed again. Paths are matched
+    as plain string prefixes, as done by the drop filter of ``process_paths``,
+    so a file whose item drops its descendants also drops siblings such as
+    ``/public`` and ``/publicity``. A change to any other setting, to the
+    pipeline steps, to the metadata files or to the ``collective.transmute``
+    version invalidates the whole manifest.
+
+Example:
+    .. code-block:: pycon
+
+        >>> run = IncrementalRun(dst, settings, src_files.metadata)
+        >>> await run.process(
+        ...     steps, content_files, state, consoles, content_folder, debugger
+        ... )
+        >>> await run.save()
+"""
+
+from collections import defaultdict
+from collections.abc import Callable
+from collections.abc import Iterable
+from collective.transmute import __version__
+from collective.transmute import _types as t
+from collective.transmute.utils import files as file_utils
+from collective.transmute.utils.rewrite import get_path_rewriter
+from dataclasses import fields
+from itertools import islice
+from pathlib import Path
+from typing import Any
+from typing import cast
+
+import hashlib
+import orjson
+import shutil
+
+
+MANIFEST_FILE = ".transmute-manifest.json"
+"""Name of the manifest file, stored in the destination folder."""
+
+MANIFEST_VERSION = 1
+"""Version of the manifest format."""
+
+_IGNORED_SETTINGS = ("config", "types", "_raw_data")
+"""Settings sections not part of the global settings hash."""
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+"""Size of the chunks read when hashing a file."""
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize sets in a stable order and any other object as a string."""
+    if isinstance(value, set | frozenset):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def _hash(value: Any) -> str:
+    """Return a stable hash of a JSON serializable value."""
+    data = orjson.dumps(value, default=_json_default, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_digest(filepath: Path) -> str:
+    """
+    Return the hash of the contents of a file.
+
+    Args:
+        filepath (Path): The file to hash.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as fh:
+        while chunk := fh.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def settings_hash(settings: t.TransmuteSettings, metadata_files: list[Path]) -> str:
+    """
+    Return the hash of everything, but the types settings, affecting all items.
+
+    Args:
+        settings (TransmuteSettings): The transmute settings object.
+        metadata_files (list[Path]): Metadata files of the export.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    data: dict[str, Any] = {
+        item.name: getattr(settings, item.name)
+        for item in fields(settings)
+        if item.name not in _IGNORED_SETTINGS
+    }
+    data["types.processor"] = settings.types.get("processor")
+    data["metadata"] = {path.name: file_digest(path) for path in sorted(metadata_files)}
+    data["version"] = __version__
+    data["manifest"] = MANIFEST_VERSION
+    return _hash(data)
+
+
+def types_hash(settings: t.TransmuteSettings, types: Iterable[str]) -> str:
+    """
+    Return the hash of the settings of a group of types.
+
+    Args:
+        settings (TransmuteSettings): The transmute settings object.
+        types (Iterable[str]): Names of the types.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    return _hash({name: settings.types.get(name) for name in sorted(types)})
+
+
+def manifest_path(dst: Path) -> Path:
+    """Return the path of the manifest file in the destination folder."""
+    return dst / MANIFEST_FILE
+
+
+def remove_manifest(dst: Path) -> None:
+    """Remove the manifest, if any, from the destination folder."""
+    manifest_path(dst).unlink(missing_ok=True)
+
+
+def _source_path(item_id: str, settings: t.TransmuteSettings) -> str:
+    """Return the path of a source item, as reported by the pipeline."""
+    return get_path_rewriter(settings).remove_export_prefixes(item_id or "")
+
+
+def _tail(mapping: dict, size: int) -> dict:
+    """Return the last ``size`` entries added to a dictionary."""
+    if size <= 0:
+        return {}
+    return dict(reversed(list(islice(reversed(mapping.items()), size))))
+
+
+class FileRecorder:
+    """
+    Record the changes the processing of each source file makes to the state.
+
+    Call :meth:`mark` before a file is processed and :meth:`record` after it.
+
+    Args:
+        state (PipelineState): The pipeline state object.
+        settings (TransmuteSettings): The transmute settings object.
+    """
+
+    def __init__(self, state: t.PipelineState, settings: t.TransmuteSettings):
+        self.state = state
+        self.settings = settings
+        self.metadata = cast(t.MetadataInfo, state.metadata)
+        self._default_pages = set(self.metadata.default_page)
+        self._drop_uids = set(state.annotations.get("drop_uids", {}))
+        self._drop = set(settings.paths["filter"]["drop"])
+        self._marks: dict[str, Any] = {}
+        self.mark()
+
+    def mark(self) -> None:
+        """Take a snapshot of the state before processing a file."""
+        state = self.state
+        metadata = self.metadata
+        annotations = state.annotations
+        self._marks = {
+            "exported": dict(state.exported),
+            "dropped": dict(state.dropped),
+            "paths": len(state.paths),
+            "path_transforms": state.path_transforms.total,
+            "relations": len(metadata.relations),
+            "blob_files": len(metadata._blob_files_),
+            "uids": len(state.uids),
+            "uid_path": len(state.uid_path),
+            "fix_relations": len(metadata.__fix_relations__),
+            "prefixes": dict(annotations.get("dropped_by_path_prefix", {})),
+        }
+
+    def _consumed(self, pending: set[str], current: dict, uids: list[str]) -> list:
+        """Return the UIDs removed from ``current`` by the processed file."""
+        consumed = [uid for uid in uids if uid in pending and uid not in current]
+        pending.difference_update(consumed)
+        return consumed
+
+    def _drop_paths(self) -> list[str]:
+        """Return the paths added to the drop filter by the processed file."""
+        drop = self.settings.paths["filter"]["drop"]
+        if len(drop) == len(self._drop):
+            return []
+        added = drop - self._drop
+        self._drop.update(added)
+        return sorted(added)
+
+    @staticmethod
+    def _delta(before: dict, after: dict) -> dict[str, int]:
+        """Return the difference between two counters."""
+        delta = {key: value - before.get(key, 0) for key, value in after.items()}
+        return {key: value for key, value in delta.items() if value}
+
+    def record(self) -> dict[str, Any]:
+        """
+        Return the changes made to the state since the last :meth:`mark`.
+
+        Returns:
+            dict[str, Any]: The record of the processed file.
+        """
+        state = self.state
+        metadata = self.metadata
+        marks = self._marks
+        exported = self._delta(marks["exported"], state.exported)
+        dropped = self._delta(marks["dropped"], state.dropped)
+        paths = [list(path) for path in state.paths[marks["paths"] :]]
+        transforms = list(state.path_transforms.rows(marks["path_transforms"]))
+        src_uids = list(dict.fromkeys(e["src_uid"] for e in transforms if e["src_uid"]))
+        types = {e["src_type"] for e in transforms} | {
+            e["dst_type"] for e in transforms
+        }
+        types = {name for name in types if name and name != "--"}
+        prefixes = state.annotations.get("dropped_by_path_prefix", {})
+        return {
+            "processed": sum(exported.values()) + sum(dropped.values()),
+            "exported": exported,
+            "dropped": dropped,
+            "paths": paths,
+            "path_transforms": transforms,
+            "relations": metadata.relations[marks["relations"] :],
+            "blob_files": metadata._blob_files_[marks["blob_files"] :],
+            "uids": _tail(state.uids, len(state.uids) - marks["uids"]),
+            "uid_path": _tail(state.uid_path, len(state.uid_path) - marks["uid_path"]),
+            "fix_relations": _tail(
+                metadata.__fix_relations__,
+                len(metadata.__fix_relations__) - marks["fix_relations"],
+            ),
+            "default_page": self._consumed(
+                self._default_pages, metadata.default_page, src_uids
+            ),
+            "drop_uids": self._consumed(
+                self._drop_uids, state.annotations.get("drop_uids", {}), src_uids
+            ),
+            "drop_paths": self._drop_paths(),
+            "dropped_by_path_prefix": self._delta(marks["prefixes"], prefixes),
+            "src_path": transforms[0]["src_path"] if transforms else None,
+            "src_uids": src_uids,
+            "types": sorted(types),
+            "post_processing": any(path[1] in state.post_processing for path in paths),
+            "error": "_error" in dropped,
+        }
+
+    def replay(self, record: dict[str, Any], site_root: str) -> None:
+        """
+        Apply the record of an unchanged file to the state.
+
+        Args:
+            record (dict[str, Any]): The record of the file, from the manifest.
+            site_root (str): The destination site root, used for redirects.
+        """
+        # Imported here to avoid a circular import with the pipeline package
+        from collective.transmute.pipeline import _handle_redirects
+
+        state = self.state
+        metadata = self.metadata
+        processed = record["processed"]
+        state.processed += processed
+        state.total += processed - 1
+        state.progress.total("processed", state.total)
+        state.progress.advance("processed", processed)
+        state.progress.advance("dropped", sum(record["dropped"].values()))
+        for name, value in record["exported"].items():
+            state.exported[name] += value
+        for name, value in record["dropped"].items():
+            state.dropped[name] += value
+        for item_path, item_uid, data_file in record["paths"]:
+            state.paths.append((item_path, item_uid, data_file))
+            state.seen.add(item_uid)
+        state.uids.update(record["uids"])
+        state.uid_path.update(record["uid_path"])
+        for entry in record["path_transforms"]:
+            state.path_transforms.append(entry)
+            _handle_redirects(entry, entry, metadata.redirects, site_root)
+        state.path_transforms.spill()
+        metadata.relations.extend(record["relations"])
+        metadata._blob_files_.extend(record["blob_files"])
+        metadata.__fix_relations__.update(record["fix_relations"])
+        for uid in record["default_page"]:
+            metadata.default_page.pop(uid, None)
+            self._default_pages.discard(uid)
+        drop_uids = state.annotations.get("drop_uids", {})
+        for uid in record["drop_uids"]:
+            drop_uids.pop(uid, None)
+            self._drop_uids.discard(uid)
+        self.settings.paths["filter"]["drop"].update(record["drop_paths"])
+        self._drop.update(record["drop_paths"])
+        if prefixes := record["dropped_by_path_prefix"]:
+            counter = state.annotations.setdefault(
+                "dropped_by_path_prefix", defaultdict(int)
+            )
+            for prefix, value in prefixes.items():
+                counter[prefix] = counter.get(prefix, 0) + value
+
+
+def _segments(rerun: list[bool]) -> list[tuple[bool, int, int]]:
+    """Split the file positions in consecutive ``(rerun, start, end)`` segments."""
+    segments: list[tuple[bool, int, int]] = []
+    start = 0
+    for position in range(1, len(rerun) + 1):
+        if position == len(rerun) or rerun[position] != rerun[start]:
+            segments.append((rerun[start], start, position))
+            start = position
+    return segments
+
+
+class IncrementalRun:
+    """
+    Process the content files, replaying unchanged files from the manifest.
+
+    The settings hash is computed when the object is created, so it must be
+    created before the prepare steps of the pipeline run.
+
+    Args:
+        dst (Path): Destination folder, holding the manifest.
+        settings (TransmuteSettings): The transmute settings object.
+        metadata_files (list[Path]): Metadata files of the export.
+        headers (list[tuple[str, str]] | None): ``UID`` and ``@id`` of each content
+            file, read from the changed files when not given.
+    """
+
+    def __init__(
+        self,
+        dst: Path,
+        settings: t.TransmuteSettings,
+        metadata_files: list[Path],
+        headers: list[tuple[str, str]] | None = None,
+    ):
+        self.path = manifest_path(dst)
+        self.headers = headers
+        self.settings = settings
+        self.config = settings_hash(settings, metadata_files)
+        self.previous: dict[str, dict[str, Any]] = self._load()
+        self.files: dict[str, dict[str, Any]] = {}
+        self.replayed = 0
+        self.processed = 0
+        self._types_hashes: dict[tuple[str, ...], str] = {}
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        """Return the file entries of a valid manifest from a previous run."""
+        try:
+            manifest = orjson.loads(self.path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get("config") != self.config:
+            return {}
+        return manifest.get("files", {})
+
+    def _types_hash(self, types: list[str]) -> str:
+        key = tuple(types)
+        if key not in self._types_hashes:
+            self._types_hashes[key] = types_hash(self.settings, key)
+        return self._types_hashes[key]
+
+    def _unchanged(self, filepath: Path, key: str) -> bool:
+        """Check if a file can be replayed from the manifest."""
+        entry = self.previous.get(key)
+        if not entry:
+            return False
+        record = entry["record"]
+        if record["post_processing"] or record["error"]:
+            return False
+        if entry["types_hash"] != self._types_hash(record["types"]):
+            return False
+        stat = filepath.stat()
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        return file_digest(filepath) == entry["digest"]
+
+    def _identities(
+        self, content_files: list[Path], keys: list[str], rerun: list[bool]
+    ) -> tuple[list[set[str]], list[set[str]]]:
+        """Return the source paths and UIDs of each file."""
+        # Imported here to avoid a circular import with the pipeline package
+        from collective.transmute.pipeline import shards
+
+        paths: list[set[str]] = []
+        uids: list[set[str]] = []
+        headers = self.headers
+        for pos, (filepath, key, is_rerun) in enumerate(
+            zip(content_files, keys, rerun, strict=True)
+        ):
+            file_paths: set[str] = set()
+            file_uids: set[str] = set()
+            if entry := self.previous.get(key):
+                record = entry["record"]
+                if record["src_path"]:
+                    file_paths.add(record["src_path"])
+                file_uids.update(record["src_uids"])
+            if is_rerun:
+                if headers is not None:
+                    uid, item_id = headers[pos]
+                else:
+                    uid, item_id = shards._scan_files([filepath])[0]
+                file_paths.add(_source_path(item_id, self.settings))
+                file_uids.add(uid)
+            paths.append(file_paths - {""})
+            uids.append(file_uids - {""})
+        return paths, uids
+
+    def plan(
+        self,
+        content_files: list[Path],
+        keys: list[str],
+        default_page: dict[str, str],
+    ) -> list[bool]:
+        """
+        Decide which files must be processed again.
+
+        Args:
+            content_files (list[Path]): Content files, in order.
+            keys (list[str]): Manifest keys of the content files.
+            default_page (dict[str, str]): Mapping of parent UID to default page UID.
+
+        Returns:
+            list[bool]: For each file, ``True`` if it must be processed again.
+        """
+        rerun = [
+            not self._unchanged(filepath, key)
+            for filepath, key in zip(content_files, keys, strict=True)
+        ]
+        paths, uids = self._identities(content_files, keys, rerun)
+        positions = {
+            uid: pos for pos, file_uids in enumerate(uids) for uid in file_uids
+        }
+        pairs = [
+            (positions[parent_uid], positions[page_uid])
+            for parent_uid, page_uid in default_page.items()
+            if parent_uid in positions and page_uid in positions
+        ]
+        current = set(keys)
+        removed = {
+            entry["record"]["src_path"]
+            for key, entry in self.previous.items()
+            if key not in current and entry["record"]["src_path"]
+        }
+        changed = True
+        while changed:
+            changed = False
+            for first, second in pairs:
+                if rerun[first] != rerun[second]:
+                    rerun[first] = rerun[second] = changed = True
+            # Matched like the drop filter, see steps.paths._is_valid_path
+            rerun_paths = t.PrefixSet(
+                removed
+                | {
+                    path
+                    for pos, file_paths in enumerate(paths)
+                    if rerun[pos]
+                    for path in file_paths
+                }
+            )
+            for pos, file_paths in enumerate(paths):
+                if rerun[pos] or not file_paths:
+                    continue
+                if any(rerun_paths.match(path) for path in file_paths):
+                    rerun[pos] = changed = True
+        return rerun
+
+    def _remove_stale(
+        self,
+        keys: list[str],
+        rerun: list[bool],
+        content_folder: Path,
+        consoles: t.ConsoleArea,
+    ) -> None:
+        """Remove the items exported by files processed again or removed."""
+        current = dict(zip(keys, rerun, strict=True))
+        for key, entry in self.previous.items():
+            if not current.get(key, True):
+                continue
+            for _, _, data_file in entry["record"]["paths"]:
+                item_folder = content_folder / Path(data_file).parent
+                if item_folder != content_folder and item_folder.exists():
+                    shutil.rmtree(item_folder, True)
+                    consoles.debug(f" - Removed directory {item_folder}")
+
+    def _entry(self, filepath: Path, record: dict[str, Any]) -> dict[str, Any]:
+        """Return the manifest entry of a processed file."""
+        stat = filepath.stat()
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "digest": file_digest(filepath),
+            "types_hash": self._types_hash(record["types"]),
+            "record": record,
+        }
+
+    async def process(
+        self,
+        steps: tuple[t.PipelineStep, ...],
+        content_files: list[Path],
+        state: t.PipelineState,
+        consoles: t.ConsoleArea,
+        content_folder: Path,
+        debugger: Callable,
+    ) -> None:
+        """
+        Process the content files, replaying the unchanged ones.
+
+        Args:
+            steps (tuple[PipelineStep, ...]): Pipeline steps to run.
+            content_files (list[Path]): Content files to process, in order.
+            state (PipelineState): The pipeline state object.
+            consoles (ConsoleArea): Console logging utility.
+            content_folder (Path): Folder where the items are exported.
+            debugger (Callable): Debug logging function.
+        """
+        # Imported here to avoid a circular import with the pipeline package
+        from collective.transmute.pipeline import process_items
+
+        settings = self.settings
+        metadata = cast(t.MetadataInfo, state.metadata)
+        site_root = settings.site_root["dest"]
+        keys = [str(filepath.resolve()) for filepath in content_files]
+        rerun = self.plan(content_files, keys, metadata.default_page)
+        self._remove_stale(keys, rerun, content_folder, consoles)
+        recorder = FileRecorder(state, settings)
+        for is_rerun, start, end in _segments(rerun):
+            if not is_rerun:
+                for position in range(start, end):
+                    entry = self.previous[keys[position]]
+                    recorder.replay(entry["record"], site_root)
+                    self.files[keys[position]] = entry
+                self.replayed += end - start
+                recorder.mark()
+                continue
+
+            def file_done(idx: int, start: int = start) -> None:
+                position = start + idx
+                record = recorder.record()
+                self.files[keys[position]] = self._entry(
+                    content_files[position], record
+                )
+                recorder.mark()
+
+            await process_items(
+                steps,
+                content_files[start:end],
+                state,
+                consoles,
+                settings,
+                content_folder,
+                debugger,
+                file_done,
+            )
+            self.processed += end - start
+        consoles.print_log(
+            f"Incremental run: {self.processed} files processed, "
+            f"{self.replayed} files replayed"
+        )
+
+    async def save(self) -> Path:
+        """
+        Write the manifest to the destination folder.
+
+        Returns:
+            Path: The path of the manifest file.
+        """
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "config": self.config,
+            "files": self.files,
+        }
+        return await file_utils.json_dump(manifest, self.path)
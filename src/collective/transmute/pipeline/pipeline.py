@@ -5,6 +5,14 @@ This module provides functions and context managers to run, debug, and manage
 pipeline steps for Plone item transformation. Used in the ``collective.transmute``
 pipeline.
 
+Steps declared with :func:`collective.transmute.utils.pipeline.sync_step` are
+called directly, and consecutive ones are fused into a single call per item,
+avoiding the creation of an async generator for each of them.
+
+Steps declared with :func:`collective.transmute.utils.pipeline.header_step`, at the
+start of the pipeline, form its pre-filter: the payloads of the blobs of an item
+are only loaded once it passed them.
+
 Example:
     .. code-block:: pycon
 
@@ -14,9 +22,216 @@ Example:
 """
 
 from collections.abc import AsyncGenerator
+from collections.abc import Iterable
 from collective.transmute import _types as t
+from collective.transmute.utils import blobs as blob_utils
 from collective.transmute.utils import item as item_utils
+from collective.transmute.utils.pipeline import is_header_step
+from collective.transmute.utils.pipeline import step_filter as get_step_filter
+from collective.transmute.utils.pipeline import sync_function
 from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+
+
+@dataclass(frozen=True)
+class FusedSteps:
+    """
+    Consecutive synchronous steps, run as a single call per item.
+    """
+
+    names: tuple[str, ...]
+    """Names of the steps."""
+    funcs: tuple[t.SyncPipelineStep, ...]
+    """Functions of the steps, in order."""
+    indexes: tuple[int, ...] = ()
+    """Positions of the steps in the pipeline, set in step plans."""
+    guards: tuple[frozenset[str], ...] = ()
+    """Fields of which an item needs one to run each step, set in step plans."""
+
+
+@dataclass(frozen=True)
+class GuardedStep:
+    """
+    Async generator step of a step plan, run only for items having some fields.
+    """
+
+    step: t.PipelineStep
+    """The step."""
+    index: int
+    """Position of the step in the pipeline."""
+    guard: frozenset[str] = frozenset()
+    """Fields of which an item needs one to run the step, empty to always run it."""
+
+
+@dataclass(frozen=True)
+class StepPlan:
+    """
+    Steps of a pipeline that may apply to items of a type.
+    """
+
+    entries: tuple[GuardedStep | FusedSteps, ...]
+    """Async generator steps, and fused synchronous steps, in order."""
+    type_: str | None
+    """Item type the plan was built for, ``None`` if it applies to all types."""
+
+
+def _applies(guard: frozenset[str], item: t.PloneItem) -> bool:
+    """Check if an item has one of the fields guarding a step, if any."""
+    return not guard or any(field in item for field in guard)
+
+
+def _fused(
+    group: list[tuple[int, t.PipelineStep, t.SyncPipelineStep, frozenset[str]]],
+) -> FusedSteps:
+    return FusedSteps(
+        tuple(step.__name__ for _, step, _, _ in group),
+        tuple(func for _, _, func, _ in group),
+        tuple(index for index, _, _, _ in group),
+        tuple(guard for _, _, _, guard in group),
+    )
+
+
+def _fuse(
+    steps: list[tuple[int, t.PipelineStep, frozenset[str]]],
+    boundary: int = 0,
+) -> tuple[GuardedStep | FusedSteps, ...]:
+    """
+    Group consecutive synchronous steps, keeping their positions and guards.
+
+    Groups are split at the ``boundary`` position, the end of the pre-filter.
+    """
+    entries: list[GuardedStep | FusedSteps] = []
+    group: list[tuple[int, t.PipelineStep, t.SyncPipelineStep, frozenset[str]]] = []
+    for index, step, guard in steps:
+        if group and group[-1][0] < boundary <= index:
+            entries.append(_fused(group))
+            group = []
+        if func := sync_function(step):
+            group.append((index, step, func, guard))
+            continue
+        if group:
+            entries.append(_fused(group))
+            group = []
+        entries.append(GuardedStep(step, index, guard))
+    if group:
+        entries.append(_fused(group))
+    return tuple(entries)
+
+
+class StepPlanner:
+    """
+    Build, and cache, the step plans of a pipeline.
+
+    Steps declared with :func:`collective.transmute.utils.pipeline.applies_to`
+    are left out of the plans of the types they do not apply to. When they also
+    apply to items with some fields, they are kept, guarded by these fields.
+
+    Args:
+        steps (tuple[PipelineStep, ...]): Pipeline steps.
+        settings (TransmuteSettings): The transmute settings object, used to get
+            the types of the steps filters.
+        enabled (bool): Use the step filters, otherwise plans hold all steps.
+        prefilter (bool): Run the header steps at the start of the pipeline as a
+            pre-filter.
+        payload_fields (Iterable[str]): Blob fields whose payloads are loaded
+            after the pre-filter.
+    """
+
+    def __init__(
+        self,
+        steps: tuple[t.PipelineStep, ...],
+        settings: t.TransmuteSettings,
+        enabled: bool = True,
+        prefilter: bool = False,
+        payload_fields: Iterable[str] = (),
+    ):
+        self.steps = steps
+        # Number of steps of the pre-filter
+        self.header = 0
+        if prefilter:
+            while self.header < len(steps) and is_header_step(steps[self.header]):
+                self.header += 1
+        self.payload_fields = tuple(payload_fields) if self.header else ()
+        self._filters: list[tuple[frozenset[str] | None, frozenset[str]] | None] = []
+        for step in steps:
+            step_filter = get_step_filter(step) if enabled else None
+            if step_filter is None:
+                self._filters.append(None)
+                continue
+            types = step_filter.types
+            if callable(types):
+                types = types(settings)
+            resolved = frozenset(types) if types is not None else None
+            self._filters.append((resolved, step_filter.fields))
+        self.filtered = any(self._filters)
+        self._plans: dict[tuple[str | None, int], StepPlan] = {}
+
+    def plan(self, type_: str | None, start: int = 0) -> StepPlan:
+        """
+        Return the plan of the steps, from ``start``, for items of a type.
+
+        Args:
+            type_ (str | None): The item ``@type``.
+            start (int): Position of the first step.
+
+        Returns:
+            StepPlan: The steps that may apply to the items.
+        """
+        if not self.filtered:
+            type_ = None
+        key = (type_, start)
+        if (plan := self._plans.get(key)) is None:
+            selected: list[tuple[int, t.PipelineStep, frozenset[str]]] = []
+            for index in range(start, len(self.steps)):
+                guard: frozenset[str] = frozenset()
+                if (step_filter := self._filters[index]) is not None:
+                    types, fields = step_filter
+                    if types is None or type_ not in types:
+                        if not fields:
+                            continue
+                        guard = fields
+                selected.append((index, self.steps[index], guard))
+            plan = StepPlan(_fuse(selected, self.header), type_)
+            self._plans[key] = plan
+        return plan
+
+
+_PLANNERS: tuple[t.TransmuteSettings, dict] | None = None
+
+
+def step_planner(
+    steps: tuple[t.PipelineStep, ...], settings: t.TransmuteSettings
+) -> StepPlanner:
+    """
+    Return the step planner of a pipeline, built once per settings object.
+
+    Args:
+        steps (tuple[PipelineStep, ...]): Pipeline steps.
+        settings (TransmuteSettings): The transmute settings object.
+
+    Returns:
+        StepPlanner: The step planner.
+    """
+    global _PLANNERS
+    if _PLANNERS is None or _PLANNERS[0] is not settings:
+        _PLANNERS = (settings, {})
+    planners: dict[tuple[t.PipelineStep, ...], StepPlanner] = _PLANNERS[1]
+    if (planner := planners.get(steps)) is None:
+        config = settings.config
+        blobs_settings: dict = settings.steps.get("blobs", {})
+        payload_fields: tuple[str, ...] = ()
+        if not blobs_settings.get("lazy", False):
+            payload_fields = tuple(blobs_settings.get("field_names", ()))
+        planner = StepPlanner(
+            steps,
+            settings,
+            config.get("step_plans", True),
+            config.get("prefilter", True),
+            payload_fields,
+        )
+        planners[steps] = planner
+    return planner
 
 
 @contextmanager
@@ -43,6 +258,12 @@ def step_debugger(
     consoles.debug(f"({src_uid}) - Step {step_name} - finished")
 
 
+def _load_payloads(planner: StepPlanner, item: t.PloneItem | None) -> None:
+    """Load the blob payloads of an item that passed the pre-filter."""
+    if item:
+        blob_utils.load_payloads(item, planner.payload_fields)
+
+
 def _add_to_drop(path: str, settings: t.TransmuteSettings) -> None:
     """
     Add a path to the drop filter if it meets criteria.
@@ -75,6 +296,7 @@ async def _sub_item_pipeline(
     state: t.PipelineState,
     consoles: t.ConsoleArea,
     settings: t.TransmuteSettings,
+    stage: str = "step",
 ) -> AsyncGenerator[tuple[t.PloneItem | None, str, bool]]:
     """
     Run a sub-pipeline for a newly produced item.
@@ -87,6 +309,7 @@ async def _sub_item_pipeline(
         state (PipelineState): The pipeline state object.
         consoles (ConsoleArea): Console logging utility.
         settings (TransmuteSettings): The transmute settings object.
+        stage (str): Stage used to record the step timings.
 
     Yields:
         tuple[PloneItem | None, str, bool]: The sub-item, last step name, and is_new
@@ -102,7 +325,7 @@ async def _sub_item_pipeline(
     consoles.print(msg)
     consoles.debug(f"({src_uid}) - Step {step_name} - Produced {item.get('UID')}")
     async for sub_item, last_step, _ in run_pipeline(
-        steps, item, state, consoles, settings
+        steps, item, state, consoles, settings, stage
     ):
         yield sub_item, last_step, True
 
@@ -115,10 +338,14 @@ async def run_step(
     state: t.PipelineState,
     consoles: t.ConsoleArea,
     settings: t.TransmuteSettings,
+    stage: str = "step",
 ) -> AsyncGenerator[tuple[t.PloneItem | None, str, bool]]:
     """
     Run a single step in the pipeline.
 
+    The time spent in the step, excluding the sub-pipelines of the new items it
+    produces, is recorded in ``state.timings``.
+
     Args:
         steps (tuple[PipelineStep, ...]): All pipeline steps.
         step (PipelineStep): The step to run.
@@ -127,6 +354,7 @@ async def run_step(
         state (PipelineState): The pipeline state object.
         consoles (ConsoleArea): Console logging utility.
         settings (TransmuteSettings): The transmute settings object.
+        stage (str): Stage used to record the step timings.
 
     Yields:
         tuple[PloneItem | None, str, bool]: The processed item, step name, and
@@ -142,35 +370,109 @@ async def run_step(
     step_name = step.__name__
     item_id, is_folderish = item["@id"], item.get("is_folderish", False)
     add_to_drop = step_name not in settings.do_not_add_drop
+    elapsed = 0.0
+    produced = 0
+    start = perf_counter()
     async for result_item in step(item, state, settings):
         if not result_item:
             if is_folderish and add_to_drop:
                 # Add this path to drop, to drop all children objects as well
                 _add_to_drop(item_id, settings)
         elif result_item.pop("_is_new_item", False):
+            elapsed += perf_counter() - start
+            produced += 1
             async for sub_item, last_step, _ in _sub_item_pipeline(
-                steps, result_item, src_uid, step_name, state, consoles, settings
+                steps, result_item, src_uid, step_name, state, consoles, settings, stage
             ):
                 yield sub_item, last_step, True
+            start = perf_counter()
+    elapsed += perf_counter() - start
+    state.timings.record(
+        stage, step_name, elapsed, dropped=not result_item, produced=produced
+    )
     yield result_item, step_name, False
 
 
+def run_fused(
+    fused: FusedSteps,
+    item: t.PloneItem,
+    src_uid: str,
+    state: t.PipelineState,
+    consoles: t.ConsoleArea,
+    settings: t.TransmuteSettings,
+    stage: str = "step",
+    type_: str | None = None,
+    check_type: bool = False,
+) -> tuple[t.PloneItem | None, str, int]:
+    """
+    Run fused synchronous steps for an item.
+
+    The time spent in each step is recorded in ``state.timings``. Steps guarded by
+    fields the item does not have are skipped.
+
+    Args:
+        fused (FusedSteps): The steps to run.
+        item (PloneItem): The item to process.
+        src_uid (str): Source UID of the item.
+        state (PipelineState): The pipeline state object.
+        consoles (ConsoleArea): Console logging utility.
+        settings (TransmuteSettings): The transmute settings object.
+        stage (str): Stage used to record the step timings.
+        type_ (str | None): Item type the steps were planned for.
+        check_type (bool): Stop after a step changing the item type, so the
+            next steps are planned again.
+
+    Returns:
+        tuple[PloneItem | None, str, int]: The processed item, or ``None`` if a
+        step dropped it, the name of the last step run, and the number of steps
+        done.
+    """
+    consoles.debug(f"({src_uid}) - Steps {', '.join(fused.names)} - fused")
+    record = state.timings.record
+    guards = fused.guards
+    result: t.PloneItem | None = item
+    step_name = ""
+    done = 0
+    for done, (name, func) in enumerate(zip(fused.names, fused.funcs, strict=True), 1):
+        if guards and not _applies(guards[done - 1], item):
+            continue
+        step_name = name
+        item_id, is_folderish = item["@id"], item.get("is_folderish", False)
+        start = perf_counter()
+        result = func(item, state, settings)
+        record(stage, step_name, perf_counter() - start, dropped=not result)
+        if not result:
+            if is_folderish and step_name not in settings.do_not_add_drop:
+                # Add this path to drop, to drop all children objects as well
+                _add_to_drop(item_id, settings)
+            break
+        item = result
+        if check_type and item.get("@type") != type_:
+            break
+    return result, step_name, done
+
+
 async def run_pipeline(
     steps: tuple[t.PipelineStep, ...],
     item: t.PloneItem | None,
     state: t.PipelineState,
     consoles: t.ConsoleArea,
     settings: t.TransmuteSettings,
+    stage: str = "step",
 ) -> AsyncGenerator[tuple[t.PloneItem | None, str, bool]]:
     """
     Run the pipeline for a Plone item through all steps.
 
+    The blob payloads of the item, if it was loaded without them, are loaded
+    once it passed the pre-filter.
+
     Args:
         steps (tuple[PipelineStep, ...]): Pipeline steps to run.
         item (PloneItem | None): The item to process.
         state (PipelineState): The pipeline state object.
         consoles (ConsoleArea): Console logging utility.
         settings (TransmuteSettings): The transmute settings object.
+        stage (str): Stage used to record the step timings.
 
     Yields:
         tuple[PloneItem | None, str, bool]: The processed item, last step name,
@@ -186,17 +488,59 @@ async def run_pipeline(
     src_uid = item["UID"] if item else ""
     last_step_name = ""
     result_item: t.PloneItem | None = item
-    for step in steps:
-        step_name = step.__name__
-        if not result_item:
-            consoles.debug(f"({src_uid}) - Step {step_name} - skipped")
-            continue
-        with step_debugger(consoles, src_uid, result_item, step_name):
-            async for sub_item, last_step, is_new in run_step(
-                steps, step, result_item, src_uid, state, consoles, settings
-            ):
-                if is_new:
-                    yield sub_item, last_step, True
-                else:
-                    result_item, last_step_name = sub_item, last_step
+    planner = step_planner(steps, settings)
+    type_ = item.get("@type") if item else None
+    entries = planner.plan(type_).entries
+    loaded = not planner.payload_fields
+    position = 0
+    while position < len(entries):
+        entry = entries[position]
+        position += 1
+        index = entry.indexes[0] if isinstance(entry, FusedSteps) else entry.index
+        if not loaded and index >= planner.header:
+            # The item passed the pre-filter
+            _load_payloads(planner, result_item)
+            loaded = True
+        if isinstance(entry, FusedSteps):
+            if not result_item:
+                names = ", ".join(entry.names)
+                consoles.debug(f"({src_uid}) - Steps {names} - skipped")
+                continue
+            result_item, step_name, done = run_fused(
+                entry,
+                result_item,
+                src_uid,
+                state,
+                consoles,
+                settings,
+                stage,
+                type_,
+                planner.filtered,
+            )
+            last_step_name = step_name or last_step_name
+            next_step = entry.indexes[done - 1] + 1
+        else:
+            step = entry.step
+            step_name = step.__name__
+            if not result_item:
+                consoles.debug(f"({src_uid}) - Step {step_name} - skipped")
+                continue
+            if not _applies(entry.guard, result_item):
+                continue
+            with step_debugger(consoles, src_uid, result_item, step_name):
+                async for sub_item, last_step, is_new in run_step(
+                    steps, step, result_item, src_uid, state, consoles, settings, stage
+                ):
+                    if is_new:
+                        yield sub_item, last_step, True
+                    else:
+                        result_item, last_step_name = sub_item, last_step
+            next_step = entry.index + 1
+        if planner.filtered and result_item and result_item.get("@type") != type_:
+            # Plan the next steps for the new type of the item
+            type_ = result_item.get("@type")
+            entries = planner.plan(type_, next_step).entries
+            position = 0
+    # Payloads already loaded are left as they are
+    _load_payloads(planner, result_item)
     yield result_item, last_step_name, False
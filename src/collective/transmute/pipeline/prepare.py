@@ -22,8 +22,9 @@ async def prepare_pipeline(
     for step in loader_steps:
         step_name = step.__name__
         consoles.debug(f"Running report step: {step_name}")
-        async for status in step(state, settings):
-            msg = "completed" if status else "failed"
+        with state.timings.measure("prepare", step_name):
+            async for status in step(state, settings):
+                msg = "completed" if status else "failed"
         consoles.print(f"Loader step {step_name} run: {msg}")
 
     return None
@@ -28,8 +28,9 @@ async def final_reports(
     for step in report_steps:
         step_name = step.__name__
         consoles.debug(f"Running report step: {step_name}")
-        async for path in step(state, settings, consoles):
-            if path:
-                files.append(path)
-                consoles.print(f"Report step {step_name} wrote file: {path}")
+        with state.timings.measure("report", step_name):
+            async for path in step(state, settings, consoles):
+                if path:
+                    files.append(path)
+                    consoles.print(f"Report step {step_name} wrote file: {path}")
     return files
@@ -0,0 +1,446 @@
+"""
+Multi-process execution of the pipeline for ``collective.transmute``.
+
+This module splits the content files into shards, runs the pipeline steps for each
+shard in a process pool, and merges the partial states back into the main
+``PipelineState`` before post-processing and final reports.
+
+Ownership rule
+    Items are routed by the first segment of their path (after removing the export
+    prefix). A folder, its default page and all its descendants are processed by the
+    same worker, in the same relative order a single process run would use. This
+    keeps cross-item steps, like ``process_default_page`` or the drop filter updated
+    when a folderish item is dropped, working as in a single process run. Default
+    page files whose parent lives in another shard are moved to the parent shard.
+
+Example:
+    .. code-block:: pycon
+
+        >>> await run_sharded(
+        ...     content_files, state, consoles, settings, content_folder, workers=4
+        ... )
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from collective.transmute import _types as t
+from collective.transmute import layout
+from collective.transmute.utils import blocks as blocks_utils
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from pathlib import Path
+from typing import Any
+from typing import cast
+from urllib.parse import urlparse
+
+import asyncio
+import heapq
+import multiprocessing
+import orjson
+
+
+SHARDS_PER_WORKER = 4
+"""Number of shards created per worker, to keep workers busy and progress moving."""
+
+SCAN_CHUNK_SIZE = 500
+"""Number of files scanned by a worker in a single task."""
+
+
+def _scan_files(files: list[Path]) -> list[tuple[str, str]]:
+    """
+    Read the ``UID`` and ``@id`` of a list of content files.
+
+    Args:
+        files (list[Path]): Content files to scan.
+
+    Returns:
+        list[tuple[str, str]]: ``(UID, @id)`` for each file, in the same order.
+    """
+    headers = []
+    for filepath in files:
+        data = orjson.loads(filepath.read_bytes())
+        headers.append((data.get("UID", ""), data.get("@id", "")))
+    return headers
+
+
+def shard_key(item_id: str, settings: t.TransmuteSettings) -> str:
+    """
+    Return the routing key of an item: the first segment of its path.
+
+    Args:
+        item_id (str): The ``@id`` of the source item.
+        settings (TransmuteSettings): The transmute settings object.
+
+    Returns:
+        str: The routing key.
+
+    Example:
+        .. code-block:: pycon
+
+            >>> shard_key("http://localhost:8080/Plone/news/item", settings)
+            'news'
+    """
+    path = item_id or ""
+    for prefix in settings.paths["export_prefixes"]:
+        if path.startswith(prefix):
+            path = path[len(prefix) :]
+            break
+    if "://" in path:
+        path = urlparse(path).path
+    src_root = settings.site_root["src"]
+    if src_root and path.startswith(src_root):
+        path = path[len(src_root) :]
+    return path.strip("/").split("/", 1)[0]
+
+
+def plan_shards(keys: list[str], total: int) -> list[list[int]]:
+    """
+    Split file positions into shards, keeping files sharing a key together.
+
+    Groups are assigned, largest first, to the least loaded shard.
+
+    Args:
+        keys (list[str]): Routing key for each file, in processing order.
+        total (int): Maximum number of shards.
+
+    Returns:
+        list[list[int]]: Sorted file positions for each non-empty shard.
+
+    Example:
+        .. code-block:: pycon
+
+            >>> plan_shards(["a", "b", "a", "c"], 2)
+            [[0, 2], [1, 3]]
+    """
+    groups: dict[str, list[int]] = {}
+    for position, key in enumerate(keys):
+        groups.setdefault(key, []).append(position)
+    total = max(min(total, len(groups)), 1)
+    buckets: list[list[int]] = [[] for _ in range(total)]
+    loads = [(0, idx) for idx in range(total)]
+    for positions in sorted(groups.values(), key=len, reverse=True):
+        load, idx = heapq.heappop(loads)
+        buckets[idx].extend(positions)
+        heapq.heappush(loads, (load + len(positions), idx))
+    return [sorted(bucket) for bucket in buckets if bucket]
+
+
+def colocate_default_pages(
+    plan: list[list[int]], uids: list[str], default_page: dict[str, str]
+) -> list[list[int]]:
+    """
+    Move default page files to the shard owning their parent.
+
+    Args:
+        plan (list[list[int]]): File positions for each shard.
+        uids (list[str]): UID of each file, by position.
+        default_page (dict[str, str]): Mapping of parent UID to default page UID.
+
+    Returns:
+        list[list[int]]: The updated plan.
+    """
+    owner: dict[int, int] = {}
+    for idx, positions in enumerate(plan):
+        for position in positions:
+            owner[position] = idx
+    position_by_uid = {uid: position for position, uid in enumerate(uids) if uid}
+    moved = False
+    for parent_uid, page_uid in default_page.items():
+        parent_pos = position_by_uid.get(parent_uid)
+        page_pos = position_by_uid.get(page_uid)
+        if parent_pos is None or page_pos is None:
+            continue
+        if owner[parent_pos] != owner[page_pos]:
+            owner[page_pos] = owner[parent_pos]
+            moved = True
+    if not moved:
+        return plan
+    new_plan: list[list[int]] = [[] for _ in plan]
+    for position in sorted(owner):
+        new_plan[owner[position]].append(position)
+    return [positions for positions in new_plan if positions]
+
+
+def _shard_state(
+    task: t.ShardTask,
+) -> tuple[t.PipelineState, t.ConsoleArea]:
+    """Create the pipeline state and consoles used by a worker."""
+    app_layout = layout.TransmuteLayout(title=f"Shard {task.index}")
+    consoles = app_layout.consoles
+    # Workers have no UI, messages go to the log file
+    consoles.ui = False
+    total = len(task.files)
+    app_layout.initialize_progress(total)
+    metadata = t.MetadataInfo(
+        path=task.metadata_path, default_page=dict(task.default_page)
+    )
+    state = t.PipelineState(
+        total,
+        processed=0,
+        exported=defaultdict(int),
+        dropped=defaultdict(int),
+        progress=cast(t.PipelineProgress, app_layout.progress),
+        annotations=task.annotations,
+        metadata=metadata,
+        write_report=task.write_report,
+    )
+    return state, consoles
+
+
+async def _run_shard(task: t.ShardTask) -> t.ShardResult:
+    """Run the pipeline steps for all files in a shard."""
+    # Imported here to avoid a circular import with the pipeline package
+    from collective.transmute import pipeline
+
+    settings = task.settings
+    state, consoles = _shard_state(task)
+    metadata = cast(t.MetadataInfo, state.metadata)
+    positions = [position for position, _ in task.files]
+    files = [filepath for _, filepath in task.files]
+    result = t.ShardResult(index=task.index, total=0, processed=0)
+    collected: dict[str, list] = {
+        "path_transforms": cast(list, state.path_transforms),
+        "relations": metadata.relations,
+        "blob_files": metadata._blob_files_,
+    }
+
+    def file_done(idx: int) -> None:
+        position = positions[idx]
+        for name, values in collected.items():
+            if not values:
+                continue
+            if name != "path_transforms" or task.write_report:
+                getattr(result, name).append((position, list(values)))
+            values.clear()
+
+    steps = pipeline.all_steps(settings)
+    with blocks_utils.blocks_cache(settings, state.blocks_cache):
+        await pipeline.process_items(
+            steps,
+            files,
+            state,
+            consoles,
+            settings,
+            task.content_folder,
+            consoles.debug,
+            file_done,
+        )
+    result.total = state.total
+    result.processed = state.processed
+    result.exported = dict(state.exported)
+    result.dropped = dict(state.dropped)
+    result.seen = state.seen
+    result.uids = state.uids
+    result.uid_path = state.uid_path
+    result.paths = state.paths
+    result.post_processing = state.post_processing
+    result.deferred = state.deferred
+    result.annotations = state.annotations
+    result.redirects = metadata.redirects
+    result.fix_relations = metadata.__fix_relations__
+    result.processing_default_page = metadata.__processing_default_page__
+    result.default_page = metadata.default_page
+    result.reader = state.reader
+    result.blocks_cache = state.blocks_cache
+    result.timings = state.timings
+    return result
+
+
+def run_shard(task: t.ShardTask) -> t.ShardResult:
+    """
+    Entry point of a worker process: run the pipeline for a shard.
+
+    Args:
+        task (ShardTask): The shard to process.
+
+    Returns:
+        ShardResult: The partial pipeline state for the shard.
+    """
+    return asyncio.run(_run_shard(task))
+
+
+def _merge_ordered(chunks: Iterable[tuple[int, list]]) -> list:
+    """Flatten ``(position, entries)`` chunks ordered by source file position."""
+    result: list = []
+    for _, entries in sorted(chunks, key=lambda chunk: chunk[0]):
+        result.extend(entries)
+    return result
+
+
+def _merge_annotations(
+    annotations: dict[str, Any], base: dict[str, Any], shard: dict[str, Any]
+) -> None:
+    """
+    Merge the annotations of a shard into the pipeline annotations.
+
+    Each shard starts from the same ``base`` annotations. Integer counters are
+    merged by adding the difference to the base value, entries removed by the
+    shard are removed, and new or changed entries are updated.
+    """
+    for key, value in shard.items():
+        initial = base.get(key)
+        if not isinstance(value, dict):
+            annotations[key] = value
+            continue
+        initial = initial if isinstance(initial, dict) else {}
+        target = annotations.get(key)
+        if not isinstance(target, dict):
+            target = value.copy()
+            target.clear()
+            target.update(initial)
+            annotations[key] = target
+        for sub_key, sub_value in value.items():
+            base_value = initial.get(sub_key)
+            is_counter = isinstance(sub_value, int) and not isinstance(sub_value, bool)
+            if is_counter and isinstance(base_value, int | None):
+                delta = sub_value - (base_value or 0)
+                target[sub_key] = target.get(sub_key, 0) + delta
+            elif sub_key not in initial or base_value != sub_value:
+                target[sub_key] = sub_value
+        for sub_key in initial:
+            if sub_key not in value:
+                target.pop(sub_key, None)
+
+
+def merge_shards(
+    state: t.PipelineState,
+    tasks: list[t.ShardTask],
+    results: list[t.ShardResult],
+) -> None:
+    """
+    Merge the partial states of all shards into the pipeline state.
+
+    Args:
+        state (PipelineState): The pipeline state object.
+        tasks (list[ShardTask]): The shards sent to the workers.
+        results (list[ShardResult]): The partial states returned by the workers.
+    """
+    metadata = cast(t.MetadataInfo, state.metadata)
+    results = sorted(results, key=lambda result: result.index)
+    tasks_by_index = {task.index: task for task in tasks}
+    base_annotations = deepcopy(state.annotations)
+    total = 0
+    for result in results:
+        total += result.total
+        state.processed += result.processed
+        for name, value in result.exported.items():
+            state.exported[name] += value
+        for name, value in result.dropped.items():
+            state.dropped[name] += value
+        state.seen |= result.seen
+        state.uids.update(result.uids)
+        state.uid_path.update(result.uid_path)
+        state.paths.extend(result.paths)
+        state.post_processing.update(result.post_processing)
+        state.deferred.update(result.deferred)
+        _merge_annotations(state.annotations, base_annotations, result.annotations)
+        metadata.redirects.update(result.redirects)
+        metadata.__fix_relations__.update(result.fix_relations)
+        metadata.__processing_default_page__.update(result.processing_default_page)
+        # Remove default page entries consumed by the shard
+        for parent_uid in tasks_by_index[result.index].default_page:
+            if parent_uid not in result.default_page:
+                metadata.default_page.pop(parent_uid, None)
+    state.total = total
+    state.path_transforms.extend(
+        _merge_ordered(chunk for result in results for chunk in result.path_transforms)
+    )
+    metadata.relations.extend(
+        _merge_ordered(chunk for result in results for chunk in result.relations)
+    )
+    metadata._blob_files_.extend(
+        _merge_ordered(chunk for result in results for chunk in result.blob_files)
+    )
+
+
+async def _scan(
+    pool: ProcessPoolExecutor, content_files: list[Path]
+) -> list[tuple[str, str]]:
+    """Read ``UID`` and ``@id`` of all content files using the process pool."""
+    loop = asyncio.get_running_loop()
+    chunks = [
+        content_files[idx : idx + SCAN_CHUNK_SIZE]
+        for idx in range(0, len(content_files), SCAN_CHUNK_SIZE)
+    ]
+    futures = [loop.run_in_executor(pool, _scan_files, chunk) for chunk in chunks]
+    headers: list[tuple[str, str]] = []
+    for chunk_headers in await asyncio.gather(*futures):
+        headers.extend(chunk_headers)
+    return headers
+
+
+async def run_sharded(
+    content_files: list[Path],
+    state: t.PipelineState,
+    consoles: t.ConsoleArea,
+    settings: t.TransmuteSettings,
+    content_folder: Path,
+    workers: int,
+    headers: list[tuple[str, str]] | None = None,
+) -> None:
+    """
+    Process the content files in a pool of worker processes.
+
+    Args:
+        content_files (list[Path]): Sorted content files to process.
+        state (PipelineState): The pipeline state object.
+        consoles (ConsoleArea): Console logging utility.
+        settings (TransmuteSettings): The transmute settings object.
+        content_folder (Path): Folder where the items are exported.
+        workers (int): Number of worker processes.
+        headers (list[tuple[str, str]] | None): ``UID`` and ``@id`` of each content
+            file, read from the files when not given.
+    """
+    metadata = cast(t.MetadataInfo, state.metadata)
+    progress = state.progress
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        consoles.print_log(f"Planning shards for {len(content_files)} files")
+        if headers is None:
+            headers = await _scan(pool, content_files)
+        keys = [shard_key(item_id, settings) for _, item_id in headers]
+        uids = [uid for uid, _ in headers]
+        plan = plan_shards(keys, workers * SHARDS_PER_WORKER)
+        plan = colocate_default_pages(plan, uids, metadata.default_page)
+        tasks: list[t.ShardTask] = []
+        for idx, positions in enumerate(plan):
+            shard_uids = {uids[position] for position in positions}
+            tasks.append(
+                t.ShardTask(
+                    index=idx,
+                    files=[
+                        (position, content_files[position]) for position in positions
+                    ],
+                    settings=settings,
+                    content_folder=content_folder,
+                    metadata_path=metadata.path,
+                    default_page={
+                        uid: page_uid
+                        for uid, page_uid in metadata.default_page.items()
+                        if uid in shard_uids
+                    },
+                    annotations=state.annotations,
+                    write_report=state.write_report,
+                )
+            )
+        consoles.print_log(f"Processing {len(tasks)} shards with {workers} workers")
+        loop = asyncio.get_running_loop()
+        futures = [loop.run_in_executor(pool, run_shard, task) for task in tasks]
+        results: list[t.ShardResult] = []
+        total = state.total
+        for future in asyncio.as_completed(futures):
+            result = await future
+            results.append(result)
+            total += result.total - len(tasks[result.index].files)
+            progress.total("processed", total)
+            progress.advance("processed", result.processed)
+            progress.advance("dropped", sum(result.dropped.values()))
+            state.reader.hits += result.reader.hits
+            state.reader.misses += result.reader.misses
+            state.blocks_cache.hits += result.blocks_cache.hits
+            state.blocks_cache.misses += result.blocks_cache.misses
+            state.timings.merge(result.timings)
+            consoles.debug(
+                f"Shard {result.index} finished: {result.processed} items processed"
+            )
+    merge_shards(state, tasks, results)
@@ -0,0 +1,356 @@
+"""
+Disk-backed lookup tables of the pipeline state for ``collective.transmute``.
+
+On very large sites, ``PipelineState.seen``, ``uids``, ``uid_path`` and ``paths``
+grow with every exported item. With ``state_store = "sqlite"`` in the ``[config]``
+section of ``transmute.toml``, they are replaced by objects with the same set,
+mapping and list interfaces, stored in an SQLite database in the destination
+folder.
+
+Writes are buffered and flushed in batches, and the most recently used keys are
+kept in an LRU cache, so lookups by the steps, like the UID resolution of
+``post_process_querystring`` and ``prepare_relations_data``, rarely hit the disk
+and memory usage stays flat. The database is a scratch file, removed at the end
+of the run.
+
+Example:
+    .. code-block:: pycon
+
+        >>> store = open_store(dst, settings)
+        >>> if store:
+        ...     store.attach(state)
+"""
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import MutableMapping
+from collections.abc import MutableSequence
+from collections.abc import MutableSet
+from collective.transmute import _types as t
+from pathlib import Path
+from typing import overload
+
+import sqlite3
+
+
+STORE_FILE = ".transmute-state.sqlite"
+"""Name of the database file, stored in the destination folder."""
+
+STORE_BACKENDS = ("memory", "sqlite")
+"""Supported values of the ``state_store`` setting."""
+
+BATCH_SIZE = 10_000
+"""Number of buffered writes flushed to the database at once."""
+
+_MISSING = object()
+
+PathRecord = tuple[str, str, str]
+
+
+class StateStore:
+    """
+    SQLite database holding the lookup tables of a pipeline run.
+
+    Args:
+        path (Path): Path of the database file. An existing file is replaced.
+        cache_size (int): Number of recently used keys cached in memory by each
+            table.
+    """
+
+    def __init__(self, path: Path, cache_size: int = 100_000):
+        path.unlink(missing_ok=True)
+        self.path = path
+        self.cache_size = cache_size
+        self.connection = sqlite3.connect(path)
+        # A scratch database: durability is not needed
+        self.connection.execute("PRAGMA journal_mode = OFF")
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.tables: list[_Table | StoredPaths] = []
+
+    def attach(self, state: t.PipelineState) -> None:
+        """
+        Replace the lookup tables of the pipeline state by stored ones.
+
+        Existing entries are copied to the store.
+
+        Args:
+            state (PipelineState): The pipeline state object.
+        """
+        seen = StoredSet(self, "seen")
+        seen |= state.seen
+        uids = StoredDict(self, "uids")
+        uids.update(state.uids)
+        uid_path = StoredDict(self, "uid_path")
+        uid_path.update(state.uid_path)
+        paths = StoredPaths(self)
+        paths.extend(state.paths)
+        state.seen = seen
+        state.uids = uids
+        state.uid_path = uid_path
+        state.paths = paths
+
+    def flush(self) -> None:
+        """Write the buffered entries of all tables."""
+        for table in self.tables:
+            table.flush()
+
+    def close(self) -> None:
+        """Close and remove the database."""
+        self.connection.close()
+        self.path.unlink(missing_ok=True)
+
+
+class _Table:
+    """
+    Key-value table, with a write buffer and an LRU cache of recent lookups.
+
+    Args:
+        store (StateStore): The store holding the table.
+        name (str): Name of the table.
+    """
+
+    def __init__(self, store: StateStore, name: str):
+        self._db = store.connection
+        self._cache_size = store.cache_size
+        self._cache: OrderedDict[str, object] = OrderedDict()
+        self._pending: dict[str, str | None] = {}
+        """Buffered writes, ``None`` for deleted keys."""
+        self._sql = {
+            "get": f"SELECT value FROM {name} WHERE key = ?",  # noqa: S608
+            "put": f"INSERT OR REPLACE INTO {name} VALUES (?, ?)",  # noqa: S608
+            "delete": f"DELETE FROM {name} WHERE key = ?",  # noqa: S608
+            "len": f"SELECT COUNT(*) FROM {name}",  # noqa: S608
+            "keys": f"SELECT key FROM {name}",  # noqa: S608
+        }
+        self._db.execute(
+            f"CREATE TABLE {name} (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID"
+        )
+        store.tables.append(self)
+
+    def _remember(self, key: str, value: object) -> None:
+        cache = self._cache
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+
+    def get(self, key: str) -> object:
+        """Return the value of a key, or ``_MISSING``."""
+        if key in self._pending:
+            pending = self._pending[key]
+            return _MISSING if pending is None else pending
+        if (cached := self._cache.get(key, _MISSING)) is not _MISSING:
+            self._cache.move_to_end(key)
+            return cached
+        row = self._db.execute(self._sql["get"], (key,)).fetchone()
+        value = row[0] if row else _MISSING
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: str | None) -> None:
+        """Set the value of a key, ``None`` to delete it."""
+        self._cache.pop(key, None)
+        self._pending[key] = value
+        if len(self._pending) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered entries."""
+        if not self._pending:
+            return
+        pending = self._pending.items()
+        self._db.executemany(
+            self._sql["delete"], ((key,) for key, value in pending if value is None)
+        )
+        self._db.executemany(
+            self._sql["put"],
+            ((key, value) for key, value in pending if value is not None),
+        )
+        self._db.commit()
+        self._pending = {}
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._db.execute(self._sql["len"]).fetchone()[0]
+
+    def keys(self) -> Iterator[str]:
+        self.flush()
+        for (key,) in self._db.execute(self._sql["keys"]):
+            yield key
+
+
+class StoredDict(MutableMapping[str, str]):
+    """
+    Mapping of strings, stored in a table of the state store.
+
+    Args:
+        store (StateStore): The state store.
+        name (str): Name of the table.
+    """
+
+    def __init__(self, store: StateStore, name: str):
+        self._table = _Table(store, name)
+
+    def __getitem__(self, key: str) -> str:
+        value = self._table.get(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return str(value)
+
+    def __setitem__(self, key: str, value: str) -> None:
+        self._table.put(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if self._table.get(key) is _MISSING:
+            raise KeyError(key)
+        self._table.put(key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return self._table.keys()
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+class StoredSet(MutableSet[str]):
+    """
+    Set of strings, stored in a table of the state store.
+
+    Args:
+        store (StateStore): The state store.
+        name (str): Name of the table.
+    """
+
+    def __init__(self, store: StateStore, name: str):
+        self._table = _Table(store, name)
+
+    def __contains__(self, value: object) -> bool:
+        return isinstance(value, str) and self._table.get(value) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return self._table.keys()
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def add(self, value: str) -> None:
+        self._table.put(value, "")
+
+    def discard(self, value: str) -> None:
+        if value in self:
+            self._table.put(value, None)
+
+    def update(self, *others: Iterable[str]) -> None:
+        """Add the values of other iterables, like ``set.update``."""
+        for other in others:
+            for value in other:
+                self.add(value)
+
+
+class StoredPaths(MutableSequence[PathRecord]):
+    """
+    List of ``(path, uid, data_file)`` records, stored in the state store.
+
+    Records can only be appended: replacing, inserting or removing records in
+    the middle of the list is not supported.
+
+    Args:
+        store (StateStore): The state store.
+    """
+
+    def __init__(self, store: StateStore):
+        self._db = store.connection
+        self._pending: list[PathRecord] = []
+        self._db.execute("CREATE TABLE paths (path TEXT, uid TEXT, data_file TEXT)")
+        store.tables.append(self)
+
+    def flush(self) -> None:
+        """Write the buffered records."""
+        if not self._pending:
+            return
+        self._db.executemany("INSERT INTO paths VALUES (?, ?, ?)", self._pending)
+        self._db.commit()
+        self._pending = []
+
+    @overload
+    def __getitem__(self, index: int) -> PathRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[PathRecord]: ...
+
+    def __getitem__(self, index: int | slice) -> PathRecord | list[PathRecord]:
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(len(self)))]
+        size = len(self)
+        position = index + size if index < 0 else index
+        if not 0 <= position < size:
+            raise IndexError("list index out of range")
+        sql = "SELECT path, uid, data_file FROM paths ORDER BY rowid LIMIT 1 OFFSET ?"
+        return tuple(self._db.execute(sql, (position,)).fetchone())
+
+    def __setitem__(self, index, value) -> None:
+        raise NotImplementedError("Stored paths can only be appended")
+
+    def __delitem__(self, index) -> None:
+        raise NotImplementedError("Stored paths can only be appended")
+
+    def insert(self, index: int, value: PathRecord) -> None:
+        if index < len(self):
+            raise NotImplementedError("Stored paths can only be appended")
+        self.append(value)
+
+    def append(self, value: PathRecord) -> None:
+        self._pending.append(value)
+        if len(self._pending) >= BATCH_SIZE:
+            self.flush()
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._db.execute("SELECT COUNT(*) FROM paths").fetchone()[0]
+
+    def __iter__(self) -> Iterator[PathRecord]:
+        self.flush()
+        for row in self._db.execute("SELECT path, uid, data_file FROM paths"):
+            yield tuple(row)
+
+    def sorted(self) -> Iterator[PathRecord]:
+        """Iterate over the records, sorted like ``sorted(paths)``."""
+        self.flush()
+        sql = "SELECT path, uid, data_file FROM paths ORDER BY path, uid, data_file"
+        for row in self._db.execute(sql):
+            yield tuple(row)
+
+
+def sorted_paths(paths: Iterable[PathRecord]) -> Iterable[PathRecord]:
+    """
+    Return the path records of the pipeline state, sorted.
+
+    Args:
+        paths (Iterable[tuple[str, str, str]]): The path records, in memory or
+            stored.
+
+    Returns:
+        Iterable[tuple[str, str, str]]: The sorted records.
+    """
+    if isinstance(paths, StoredPaths):
+        return paths.sorted()
+    return sorted(paths)
+
+
+def open_store(dst: Path, settings: t.TransmuteSettings) -> StateStore | None:
+    """
+    Open the state store configured in the settings.
+
+    Args:
+        dst (Path): Destination folder, holding the database.
+        settings (TransmuteSettings): The transmute settings object.
+
+    Returns:
+        StateStore | None: The store, or ``None`` to keep the lookup tables in
+        memory.
+    """
+    config = settings.config
+    if config.get("state_store", "memory") != "sqlite":
+        return None
+    return StateStore(dst / STORE_FILE, config.get("state_cache_size", 100_000))
@@ -0,0 +1,226 @@
+"""
+Write-behind export of items for ``collective.transmute``.
+
+This module provides ``ItemWriter``, a bounded queue consumed by a pool of writer
+tasks. Items are prepared for export (paths of data and blob files are computed)
+when submitted, and the disk writes overlap with the transformation of the next
+items. The outcome of each write is reported back to the caller through
+callbacks, called in submission order, so the pipeline bookkeeping only records
+items that were written.
+
+Example:
+    .. code-block:: pycon
+
+        >>> async with ItemWriter(content_folder, consoles, workers=4) as writer:
+        ...     item_files = await writer.submit(item, on_written=record)
+"""
+
+from collections import deque
+from collections.abc import Callable
+from collective.transmute import _types as t
+from collective.transmute import get_logger
+from collective.transmute.utils import files as file_utils
+from pathlib import Path
+from time import perf_counter
+
+import asyncio
+
+
+WrittenCallback = Callable[[t.ItemFiles], None]
+FailedCallback = Callable[[Exception], None]
+
+
+class _Submission:
+    """An item export waiting to be written, and the callbacks for its outcome."""
+
+    __slots__ = ("done", "error", "export", "on_failed", "on_written", "submitted")
+
+    def __init__(
+        self,
+        export: t.ItemExport,
+        on_written: WrittenCallback | None,
+        on_failed: FailedCallback | None,
+    ):
+        self.export = export
+        self.on_written = on_written
+        self.on_failed = on_failed
+        self.submitted = perf_counter()
+        self.done = False
+        self.error: Exception | None = None
+
+
+class ItemWriter:
+    """
+    Write items to disk using a bounded queue and a pool of writer tasks.
+
+    When the queue is full, ``submit`` waits for a free slot, applying
+    backpressure to the pipeline. With ``workers`` set to ``0``, items are
+    written directly by ``submit``.
+
+    Writes may complete out of order, but the ``on_written`` and ``on_failed``
+    callbacks given to ``submit`` are called in submission order, once all
+    previous items are settled. After ``flush`` or ``close`` returns, the
+    callbacks of all submitted items were called.
+
+    Args:
+        content_folder (Path): Folder where the items are exported.
+        consoles (ConsoleArea): Console logging utility.
+        workers (int): Number of writer tasks.
+        queue_size (int): Maximum number of items waiting to be written.
+        timings (StepTimings | None): Optional step timings, where the time spent
+            preparing, waiting for a queue slot and writing each item is recorded.
+    """
+
+    def __init__(
+        self,
+        content_folder: Path,
+        consoles: t.ConsoleArea,
+        workers: int = 4,
+        queue_size: int = 64,
+        timings: t.StepTimings | None = None,
+    ):
+        self.content_folder = content_folder
+        self.timings = timings if timings is not None else t.StepTimings()
+        self.consoles = consoles
+        self.workers = max(workers, 0)
+        self.queue: asyncio.Queue[_Submission | None] = asyncio.Queue(
+            maxsize=max(queue_size, 1)
+        )
+        self._tasks: list[asyncio.Task] = []
+        self._pending: deque[_Submission] = deque()
+        self.written = 0
+        """Number of items written."""
+        self.errors = 0
+        """Number of items that could not be written."""
+        self.max_depth = 0
+        """Maximum number of items waiting in the queue."""
+        self.total_latency = 0.0
+        """Sum of the time, in seconds, between submitting and writing items."""
+        self.max_latency = 0.0
+        """Maximum time, in seconds, between submitting and writing an item."""
+
+    async def __aenter__(self) -> "ItemWriter":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    def start(self) -> None:
+        """Start the writer tasks."""
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def _write(self, submission: _Submission) -> None:
+        """Write an item export, update the statistics and settle the callbacks."""
+        export = submission.export
+        try:
+            with self.timings.measure("export", "write_item_export"):
+                await file_utils.write_item_export(export)
+        except Exception as exc:
+            self.errors += 1
+            get_logger().exception(
+                f"Error writing item {export.data.get('@id', 'unknown')} "
+                f"to {export.data_path}",
+                exc_info=exc,
+            )
+            submission.error = exc
+        else:
+            latency = perf_counter() - submission.submitted
+            self.written += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+        submission.done = True
+        self._settle()
+
+    def _settle(self) -> None:
+        """Call the callbacks of the written items, in submission order."""
+        pending = self._pending
+        while pending and pending[0].done:
+            submission = pending.popleft()
+            try:
+                if submission.error is None:
+                    if submission.on_written:
+                        submission.on_written(submission.export.files)
+                elif submission.on_failed:
+                    submission.on_failed(submission.error)
+            except Exception as exc:
+                data = submission.export.data
+                get_logger().exception(
+                    f"Error recording item {data.get('@id', 'unknown')}",
+                    exc_info=exc,
+                )
+
+    async def _worker(self) -> None:
+        """Consume the queue until a sentinel is received."""
+        queue = self.queue
+        while True:
+            entry = await queue.get()
+            try:
+                if entry is None:
+                    return
+                await self._write(entry)
+            finally:
+                queue.task_done()
+
+    async def submit(
+        self,
+        item: t.PloneItem,
+        deferred: dict[str, bytes] | None = None,
+        on_written: WrittenCallback | None = None,
+        on_failed: FailedCallback | None = None,
+    ) -> t.ItemFiles:
+        """
+        Schedule the export of an item.
+
+        Args:
+            item (PloneItem): The item to export.
+            deferred (dict[str, bytes] | None): When given, only the blobs of the
+                item are written. Its data is serialized to this mapping, by UID,
+                to be written after post-processing.
+            on_written (Callable[[ItemFiles], None] | None): Called with the data
+                file and blob files of the item once they are written.
+            on_failed (Callable[[Exception], None] | None): Called with the
+                exception raised when the item could not be written.
+
+        Returns:
+            ItemFiles: The data file and blob files that will be written.
+        """
+        timings = self.timings
+        with timings.measure("export", "prepare_item_export"):
+            export = file_utils.prepare_item_export(item, self.content_folder)
+            if deferred is not None:
+                deferred[item["UID"]] = file_utils.json_dumps(export.data, False)
+                export.write_data = False
+        submission = _Submission(export, on_written, on_failed)
+        self._pending.append(submission)
+        if not self._tasks:
+            await self._write(submission)
+            return export.files
+        with timings.measure("export", "queue_wait"):
+            await self.queue.put(submission)
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return export.files
+
+    async def flush(self) -> None:
+        """Wait until all submitted items are written and their callbacks called."""
+        if self._tasks:
+            await self.queue.join()
+
+    async def close(self) -> None:
+        """Write all pending items, stop the writer tasks and report statistics."""
+        for _ in self._tasks:
+            await self.queue.put(None)
+        await asyncio.gather(*self._tasks)
+        self._tasks = []
+        self.report()
+
+    def report(self) -> None:
+        """Log the writer statistics."""
+        if not self.written:
+            return
+        average = self.total_latency / self.written * 1000
+        self.consoles.print_log(
+            f"Writer: {self.written} items written by {self.workers} tasks, "
+            f"{self.errors} errors, max queue depth {self.max_depth}, "
+            f"flush latency avg {average:.1f} ms / max {self.max_latency * 1000:.1f} ms"
+        )
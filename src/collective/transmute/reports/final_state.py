@@ -23,6 +23,12 @@ async def report_final_state(
     for name, total in sort_data_by_value(state.exported):
         percent = (total / transmuted * 100) if transmuted else 0
         consoles.print_log(f"   - {name}: {total} ({percent:.2f}%)")
+    blocks_cache = state.blocks_cache
+    if lookups := blocks_cache.hits + blocks_cache.misses:
+        percent = blocks_cache.hits / lookups * 100
+        consoles.print_log("Blocks cache")
+        consoles.print_log(f"  - Hits: {blocks_cache.hits} ({percent:.2f}%)")
+        consoles.print_log(f"  - Misses: {blocks_cache.misses}")
     if settings.is_debug:
         consoles.print_log("Dropped by step")
         total_dropped = len(state.dropped)
@@ -1,6 +1,203 @@
 from collective.transmute import _types as t
 from collective.transmute.reports import get_reports_location
-from collective.transmute.utils import files as file_utils
+from pathlib import Path
+
+import asyncio
+import csv
+import gzip
+import io
+import shutil
+
+
+REPORT_FILE = "report_transmute.csv"
+"""Name of the paths report, ``.gz`` is appended when it is compressed."""
+
+SPOOL_SUFFIX = ".part"
+"""Suffix of the paths report while the pipeline is running."""
+
+
+def report_path(settings: t.TransmuteSettings) -> Path:
+    """
+    Return the path of the paths report.
+
+    Args:
+        settings (TransmuteSettings): The transmute settings object.
+
+    Returns:
+        Path: The path of the report, in the reports location.
+    """
+    name = REPORT_FILE
+    if settings.config.get("paths_report_compress", False):
+        name = f"{name}.gz"
+    return get_reports_location(settings) / name
+
+
+def spool_path(dst: Path, settings: t.TransmuteSettings) -> Path:
+    """
+    Return the path of the spool of the paths report of a run.
+
+    The spool is kept in the destination folder, next to the checkpoints of the
+    pipeline state, as a resumed run appends to it.
+
+    Args:
+        dst (Path): Destination folder.
+        settings (TransmuteSettings): The transmute settings object.
+
+    Returns:
+        Path: The path of the spool file.
+    """
+    return dst / f"{report_path(settings).name}{SPOOL_SUFFIX}"
+
+
+def spool_complete(path: Path, size: int) -> bool:
+    """
+    Check that a spool file holds the data written up to a checkpoint.
+
+    Args:
+        path (Path): Path of the spool file.
+        size (int): Size, in bytes, of the data written up to the checkpoint.
+
+    Returns:
+        bool: ``True`` if there is nothing to resume or the data is complete.
+    """
+    if not size:
+        return True
+    try:
+        return path.stat().st_size >= size
+    except OSError:
+        return False
+
+
+class PathsReportSpool:
+    """
+    Write the rows of the paths report while the pipeline runs.
+
+    Rows are appended, in chunks, to a spool file, next to the report unless
+    ``spool_path`` is given, which is moved to the report by :meth:`finish`.
+    When compressed, each chunk is written as a gzip member, so the spool can be
+    truncated after any chunk and still be a valid gzip file.
+
+    The size of the data written is kept by the ``PathTransforms`` object, so a
+    run resumed from a checkpoint discards the rows written after it.
+
+    Args:
+        path (Path): Path of the report.
+        transforms (PathTransforms): Path transformations of the pipeline state.
+        chunk_size (int): Number of rows kept in memory before they are written.
+        compress (bool): Compress the report with gzip.
+        spool_path (Path | None): Path of the spool file.
+
+    Raises:
+        RuntimeError: If the path transformations were restored from a
+            checkpoint, but the spool file is missing or incomplete.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        transforms: t.PathTransforms,
+        chunk_size: int = 10_000,
+        compress: bool = False,
+        spool_path: Path | None = None,
+    ):
+        self.path = path
+        if spool_path is None:
+            spool_path = path.with_name(f"{path.name}{SPOOL_SUFFIX}")
+        self.spool_path = spool_path
+        self.transforms = transforms
+        self.chunk_size = max(chunk_size, 1)
+        self.compress = compress
+        size = transforms.spilled_bytes
+        if not spool_complete(spool_path, size):
+            raise RuntimeError(
+                f"The paths report spool {spool_path} is missing or shorter than "
+                f"the {size} bytes written before the checkpoint"
+            )
+        self._fh = open(self.spool_path, "r+b" if size else "wb")  # noqa: SIM115
+        self._fh.truncate(size)
+        self._fh.seek(size)
+        if not size:
+            transforms.spilled_bytes = self.write([t.PATH_REPORT_HEADERS])
+        transforms.sink = self
+
+    def write(self, rows: list[tuple]) -> int:
+        """
+        Append rows to the spool file.
+
+        Args:
+            rows (list[tuple]): Rows, in the order of the report columns.
+
+        Returns:
+            int: Size, in bytes, of the spool file.
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        data = buffer.getvalue().encode("utf-8")
+        if self.compress:
+            data = gzip.compress(data, mtime=0)
+        self._fh.write(data)
+        self._fh.flush()
+        return self._fh.tell()
+
+    def _finish(self) -> Path:
+        self.transforms.spill(force=True)
+        self.close()
+        shutil.move(self.spool_path, self.path)
+        return self.path
+
+    async def finish(self) -> Path:
+        """
+        Write the remaining rows, and rename the spool file to the report.
+
+        Runs in a thread, so the event loop is not blocked.
+
+        Returns:
+            Path: The path of the report.
+        """
+        return await asyncio.to_thread(self._finish)
+
+    def close(self) -> None:
+        """Close the spool file, and detach it from the path transformations."""
+        self._fh.close()
+        if self.transforms.sink is self:
+            self.transforms.sink = None
+
+    def discard(self) -> None:
+        """Close and remove the spool file."""
+        self.close()
+        self.spool_path.unlink(missing_ok=True)
+
+
+def _spool(
+    state: t.PipelineState, settings: t.TransmuteSettings, dst: Path | None = None
+) -> PathsReportSpool:
+    config = settings.config
+    return PathsReportSpool(
+        report_path(settings),
+        state.path_transforms,
+        chunk_size=config.get("paths_report_chunk_size", 10_000),
+        compress=config.get("paths_report_compress", False),
+        spool_path=spool_path(dst, settings) if dst else None,
+    )
+
+
+def open_paths_report(
+    state: t.PipelineState, settings: t.TransmuteSettings, dst: Path | None = None
+) -> PathsReportSpool | None:
+    """
+    Start writing the paths report of a pipeline run.
+
+    Args:
+        state (PipelineState): The pipeline state object.
+        settings (TransmuteSettings): The transmute settings object.
+        dst (Path | None): Destination folder, where the spool is kept. By
+            default, the spool is kept next to the report.
+
+    Returns:
+        PathsReportSpool | None: The spool of the report, or ``None`` if the
+        report is not written.
+    """
+    return _spool(state, settings, dst) if state.write_report else None
 
 
 async def write_paths_report(
@@ -9,6 +206,9 @@ async def write_paths_report(
     """
     Write a CSV report of path transformations performed by the pipeline.
 
+    Rows already written while the pipeline ran are kept, only the remaining
+    ones are written.
+
     Args:
         consoles (ConsoleArea): Console logging utility.
         state (PipelineState): The pipeline state object.
@@ -16,29 +216,12 @@ async def write_paths_report(
     Returns:
         Path to the report file.
     """
-    headers = [
-        "filename",
-        "src_path",
-        "src_uid",
-        "src_type",
-        "src_state",
-        "dst_path",
-        "dst_uid",
-        "dst_type",
-        "dst_state",
-        "last_step",
-        "status",
-        "src_level",
-        "dst_level",
-        "src_workflow",
-        "dst_workflow",
-    ]
     if state.write_report:
-        base_path = get_reports_location(settings)
-        report_path = base_path / "report_transmute.csv"
-        paths_data = state.path_transforms
-        csv_path = await file_utils.csv_dump(paths_data, headers, report_path)
-        consoles.print_log(f" - Wrote paths report to {csv_path}")
-        yield report_path
+        spool = state.path_transforms.sink
+        if not isinstance(spool, PathsReportSpool):
+            spool = _spool(state, settings)
+        path = await spool.finish()
+        consoles.print_log(f" - Wrote paths report to {path}")
+        yield path
     else:
         yield None
@@ -0,0 +1,74 @@
+from collective.transmute import _types as t
+from collective.transmute.reports import get_reports_location
+from collective.transmute.utils import files as file_utils
+
+
+STAGES = ("run", "prepare", "step", "export", "post_process", "report")
+"""Order of the stages in the step timings report."""
+
+HEADERS = [
+    "stage",
+    "step",
+    "calls",
+    "total_s",
+    "mean_ms",
+    "p95_ms",
+    "max_ms",
+    "dropped",
+    "produced",
+]
+
+
+def timings_rows(timings: t.StepTimings) -> list[dict]:
+    """
+    Return the rows of the step timings report.
+
+    Rows are grouped by stage and sorted by cumulative time.
+
+    Parameters
+    ----------
+    timings : StepTimings
+        The timings of the pipeline run.
+
+    Returns
+    -------
+    list[dict]
+        One row per step, with the keys listed in ``HEADERS``.
+    """
+
+    def sort_key(key: tuple[str, str]) -> tuple[int, float]:
+        stage = key[0]
+        order = STAGES.index(stage) if stage in STAGES else len(STAGES)
+        return order, -timings.steps[key].total
+
+    rows = []
+    for key in sorted(timings.steps, key=sort_key):
+        stats = timings.steps[key]
+        rows.append({
+            "stage": key[0],
+            "step": key[1],
+            "calls": stats.calls,
+            "total_s": round(stats.total, 3),
+            "mean_ms": round(stats.mean * 1000, 3),
+            "p95_ms": round(stats.percentile(95) * 1000, 3),
+            "max_ms": round(stats.max * 1000, 3),
+            "dropped": stats.dropped,
+            "produced": stats.produced,
+        })
+    return rows
+
+
+async def write_step_timings_report(
+    state: t.PipelineState, settings: t.TransmuteSettings, consoles: t.ConsoleArea
+) -> t.ReportItemGenerator:
+    """Write the call counts and latencies of each step, as CSV and JSON."""
+    consoles.print_log("Preparing step timings report...")
+    rows = timings_rows(state.timings)
+    base_path = get_reports_location(settings)
+    csv_path = await file_utils.csv_dump(
+        rows, HEADERS, base_path / "report_step_timings.csv"
+    )
+    consoles.print_log(f" - Wrote step timings report to {csv_path}")
+    yield csv_path
+    json_path = await file_utils.json_dump(rows, base_path / "report_step_timings.json")
+    yield json_path
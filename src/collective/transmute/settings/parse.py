@@ -9,29 +9,29 @@ from pathlib import Path
 SETTINGS_FILE = "transmute.toml"
 
 
-def _as_set(value: list) -> set:
+def _as_prefix_set(value: list) -> t.PrefixSet:
     """
-    Cast a list value to a set.
+    Cast a list of path prefixes to a set indexed for prefix matching.
 
     Parameters
     ----------
     value : list
-        The list to cast.
+        The list of path prefixes.
 
     Returns
     -------
-    set
-        The set containing the elements of the list.
+    PrefixSet
+        The set containing the path prefixes.
 
     Example
     -------
     .. code-block:: pycon
 
-        >>> _as_set([1, 2, 2])
-        {1, 2}
+        >>> _as_prefix_set(["/foo", "/bar"]).match("/foo/baz")
+        '/foo'
     """
     value = value if value else []
-    return set(value)
+    return t.PrefixSet(value)
 
 
 def _as_tuple(value: list) -> tuple:
@@ -59,11 +59,12 @@ def _as_tuple(value: list) -> tuple:
     return tuple(value)
 
 
-_SET_SETTINGS = {"cast": _as_set, "default": set()}
+_PREFIX_SETTINGS = {"cast": _as_prefix_set, "default": t.PrefixSet()}
 _TUPLE_SETTINGS = {"cast": _as_tuple, "default": ()}
 
 
 _VALIDATORS: dict[str, list[dict]] = {
+    "config.state_store": [{"is_in": ("memory", "sqlite")}],
     "pipeline.steps": [{"len_min": 1}, _TUPLE_SETTINGS],
     "pipeline.prepare_steps": [{"len_min": 0}, _TUPLE_SETTINGS],
     "pipeline.report_steps": [{"len_min": 1}, _TUPLE_SETTINGS],
@@ -80,10 +81,10 @@ _VALIDATORS: dict[str, list[dict]] = {
         _TUPLE_SETTINGS,
     ],
     "paths.filter.allowed": [
-        _SET_SETTINGS,
+        _PREFIX_SETTINGS,
     ],
     "paths.filter.drop": [
-        _SET_SETTINGS,
+        _PREFIX_SETTINGS,
     ],
     "paths.export_prefixes": [
         _TUPLE_SETTINGS,
@@ -7,13 +7,17 @@ are documented for Sphinx autodoc.
 """
 
 from collective.transmute import _types as t
+from collective.transmute.utils.pipeline import header_step
+from collective.transmute.utils.pipeline import sync_step
 
 
-async def process_title_description(
+@header_step
+@sync_step
+def process_title_description(
     item: t.PloneItem,
     state: t.PipelineState,
     settings: t.TransmuteSettings,
-) -> t.PloneItemGenerator:
+) -> t.PloneItem:
     """
     Strip whitespace from the ``title`` and ``description`` fields of an item.
 
@@ -26,8 +30,8 @@ async def process_title_description(
     settings : TransmuteSettings
         The transmute settings object.
 
-    Yields
-    ------
+    Returns
+    -------
     PloneItem
         The updated item with stripped ``title`` and ``description``.
 
@@ -42,14 +46,16 @@ async def process_title_description(
         cur_value = item.get(field)
         if cur_value is not None:
             item[field] = cur_value.strip()
-    yield item
+    return item
 
 
-async def process_title(
+@header_step
+@sync_step
+def process_title(
     item: t.PloneItem,
     state: t.PipelineState,
     settings: t.TransmuteSettings,
-) -> t.PloneItemGenerator:
+) -> t.PloneItem:
     """
     Ensure the ``title`` field is set for an item, using its ``filename`` or ``id`` if
     it's missing.
@@ -63,8 +69,8 @@ async def process_title(
     settings : TransmuteSettings
         The transmute settings object.
 
-    Yields
-    ------
+    Returns
+    -------
     PloneItem
         The updated item with a guaranteed title field.
 
@@ -81,4 +87,4 @@ async def process_title(
             item["title"] = blob["filename"]
         else:
             item["title"] = item["id"]
-    yield item
+    return item
@@ -23,6 +23,7 @@ The field names can be configured in the Transmute settings under the
 
 from collective.transmute import _types as t
 from collective.transmute.settings import get_settings
+from collective.transmute.utils.pipeline import sync_step
 from functools import cache
 
 
@@ -42,11 +43,12 @@ def _blobs_field_names() -> list[str]:
     return field_names
 
 
-async def process_blobs(
+@sync_step
+def process_blobs(
     item: t.PloneItem,
     state: t.PipelineState,
     settings: t.TransmuteSettings,
-) -> t.PloneItemGenerator:
+) -> t.PloneItem:
     """
     Extract and process blob fields (file, image, preview_image) from an item.
 
@@ -63,8 +65,8 @@ async def process_blobs(
     settings : TransmuteSettings
         The transmute settings object.
 
-    Yields
-    ------
+    Returns
+    -------
     PloneItem
         The updated item with extracted blob files in '_blob_files_'.
 
@@ -82,4 +84,4 @@ async def process_blobs(
         if not isinstance(data, dict):
             continue
         item["_blob_files_"][key] = data
-    yield item
+    return item
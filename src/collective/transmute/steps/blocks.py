@@ -7,9 +7,10 @@ handle block layouts for collections, folders, and other types, and support bloc
 variation and customization.
 """
 
-from collective.html2blocks.converter import volto_blocks
 from collective.transmute import _types as t
 from collective.transmute.settings import get_settings
+from collective.transmute.utils import blocks as blocks_utils
+from collective.transmute.utils.pipeline import applies_to
 from functools import cache
 
 
@@ -159,6 +160,29 @@ def _get_default_blocks(
     return blocks
 
 
+def types_with_blocks(settings: t.TransmuteSettings) -> set[str]:
+    """
+    Return the content types with default blocks in the settings.
+
+    Parameters
+    ----------
+    settings : TransmuteSettings
+        The transmute settings object.
+
+    Returns
+    -------
+    set[str]
+        Names of the types with ``blocks``, or ``override_blocks``.
+    """
+    return {
+        name
+        for name, type_info in settings.types.items()
+        if isinstance(type_info, dict)
+        and type_info.get("override_blocks", type_info.get("blocks"))
+    }
+
+
+@applies_to(types=types_with_blocks, fields=("_blocks_",))
 async def process_blocks(
     item: t.PloneItem,
     state: t.PipelineState,
@@ -205,9 +229,7 @@ async def process_blocks(
             additional_blocks = processor(item, additional_blocks)
         text = item.get("text", {})
         src = text.get("data", "") if text else ""
-        blocks_info = volto_blocks(
-            source=src, default_blocks=blocks, additional_blocks=additional_blocks
-        )
+        blocks_info = await blocks_utils.convert_blocks(src, blocks, additional_blocks)
         item["blocks"], item["blocks_layout"] = (
             blocks_info.get("blocks", {}),
             blocks_info.get("blocks_layout", {}),
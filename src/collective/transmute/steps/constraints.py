@@ -7,14 +7,18 @@ update ``exportimport`` constraints using portal type mappings.
 """
 
 from collective.transmute import _types as t
+from collective.transmute.utils.pipeline import applies_to
+from collective.transmute.utils.pipeline import sync_step
 from collective.transmute.utils.portal_types import fix_portal_type
 
 
-async def process_constraints(
+@applies_to(fields=("exportimport.constrains",))
+@sync_step
+def process_constraints(
     item: t.PloneItem,
     state: t.PipelineState,
     settings: t.TransmuteSettings,
-) -> t.PloneItemGenerator:
+) -> t.PloneItem:
     """
     Fix and normalize ``exportimport`` constraints for a Plone item.
 
@@ -27,8 +31,8 @@ async def process_constraints(
     settings : TransmuteSettings
         The transmute settings object.
 
-    Yields
-    ------
+    Returns
+    -------
     PloneItem
         The updated item with normalized constraints.
 
@@ -49,4 +53,4 @@ async def process_constraints(
                 value.remove("")
             constrains[c_type] = list(value)
         item[key] = constrains
-    yield item
+    return item
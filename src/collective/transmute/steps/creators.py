@@ -7,13 +7,15 @@ and filter creators based on configuration settings.
 """
 
 from collective.transmute import _types as t
+from collective.transmute.utils.pipeline import sync_step
 
 
-async def process_creators(
+@sync_step
+def process_creators(
     item: t.PloneItem,
     state: t.PipelineState,
     settings: t.TransmuteSettings,
-) -> t.PloneItemGenerator:
+) -> t.PloneItem:
     """
     Process and filter the list of creators for an item.
 
@@ -34,8 +36,8 @@ async def process_creators(
     settings : TransmuteSettings
         The transmute settings object.
 
-    Yields
-    ------
+    Returns
+    -------
     PloneItem
         The updated item with filtered creators.
 
@@ -53,4 +55,4 @@ async def process_creators(
     if not creators:
         creators = default
     item["creators"] = creators
-    yield item
+    return item
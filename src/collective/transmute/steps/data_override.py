@@ -7,13 +7,15 @@ customization of item fields using the ``data_override`` section in ``transmute.
 """
 
 from collective.transmute import _types as t
+from collective.transmute.utils.pipeline import sync_step
 
 
-async def process_data_override(
+@sync_step
+def process_data_override(
     item: t.PloneItem,
     state: t.PipelineState,
     settings: t.TransmuteSettings,
-) -> t.PloneItemGenerator:
+) -> t.PloneItem:
     """
     Overwrite item data (by ``@id``) with information from settings.
 
@@ -34,8 +36,8 @@ async def process_data_override(
     settings : TransmuteSettings
         The transmute settings object.
 
-    Yields
-    ------
+    Returns
+    -------
     PloneItem
         The updated item with overridden data fields.
 
@@ -50,4 +52,4 @@ async def process_data_override(
     override = settings.data_override.get(id_, {})
     for key, value in override.items():
         item[key] = value
-    yield item
+    return item
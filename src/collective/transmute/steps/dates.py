@@ -8,6 +8,7 @@ dropped from the pipeline.
 
 from collective.transmute import _types as t
 from collective.transmute.settings import get_settings
+from collective.transmute.utils.pipeline import header_step
 from functools import cache
 
 
@@ -29,6 +30,7 @@ def _date_filters_from_settings() -> tuple[tuple[str, str], ...]:
     return tuple(filters.items())
 
 
+@header_step
 async def filter_by_date(
     item: t.PloneItem, state: t.PipelineState, settings: t.TransmuteSettings
 ) -> t.PloneItemGenerator:
@@ -8,6 +8,7 @@ merge parent item data into default pages and update relations.
 
 from collective.transmute import _types as t
 from collective.transmute.utils.default_page import handle_default_page
+from collective.transmute.utils.default_page import parent_keys
 
 
 async def process_default_page(
@@ -43,14 +44,16 @@ async def process_default_page(
     metadata = state.metadata
     item_uid = item["UID"]
     if metadata:
+        keys_from_parent = settings.default_pages["keys_from_parent"]
         if parent_item := metadata.__processing_default_page__.pop(item_uid, None):
             parent_uid = parent_item["UID"]
-            keys_from_parent = settings.default_pages["keys_from_parent"]
             item = handle_default_page(parent_item, item, keys_from_parent)
             metadata.__fix_relations__[item_uid] = parent_uid
             yield item
         elif default_page_uid := metadata.default_page.pop(item_uid, None):
-            metadata.__processing_default_page__[default_page_uid] = item
+            # Only keep the keys merged into the default page
+            parked = parent_keys(item, keys_from_parent)
+            metadata.__processing_default_page__[default_page_uid] = parked
             yield None
         else:
             yield item
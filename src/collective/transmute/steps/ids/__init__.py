@@ -9,6 +9,9 @@ support export prefix removal, path cleanup, and short ID normalization.
 from .cleanup import path_cleanup
 from .prefixes import path_prefixes
 from collective.transmute import _types as t
+from collective.transmute.utils.pipeline import header_step
+from collective.transmute.utils.pipeline import sync_step
+from collective.transmute.utils.rewrite import get_path_rewriter
 
 import re
 
@@ -53,11 +56,13 @@ def fix_short_id(id_: str) -> str:
     return id_
 
 
-async def process_export_prefix(
+@header_step
+@sync_step
+def process_export_prefix(
     item: t.PloneItem,
     state: t.PipelineState,
     settings: t.TransmuteSettings,
-) -> t.PloneItemGenerator:
+) -> t.PloneItem:
     """
     Remove export prefixes from the ``@id`` field of an item.
 
@@ -70,8 +75,8 @@ async def process_export_prefix(
     settings : TransmuteSettings
         The transmute settings object.
 
-    Yields
-    ------
+    Returns
+    -------
     PloneItem
         The updated item with export prefix removed from ``@id``.
 
@@ -82,21 +87,20 @@ async def process_export_prefix(
         >>> async for result in process_export_prefix(item, state, settings):
         ...     print(result['@id'])
     """
-    path = item["@id"]
-    for src in settings.paths["export_prefixes"]:
-        if path.startswith(src):
-            path = path.replace(src, "")
+    path = get_path_rewriter(settings).remove_export_prefixes(item["@id"])
     item["@id"] = path
     # Used in reports
     item["_@id"] = path
-    yield item
+    return item
 
 
-async def process_ids(
+@header_step
+@sync_step
+def process_ids(
     item: t.PloneItem,
     state: t.PipelineState,
     settings: t.TransmuteSettings,
-) -> t.PloneItemGenerator:
+) -> t.PloneItem:
     """
     Normalize and clean up the ``@id`` and ``id`` fields of an item.
 
@@ -109,8 +113,8 @@ async def process_ids(
     settings : TransmuteSettings
         The transmute settings object.
 
-    Yields
-    ------
+    Returns
+    -------
     PloneItem
         The updated item with cleaned up IDs.
 
@@ -130,4 +134,4 @@ async def process_ids(
         path = "/".join(parts)
         item["@id"] = path
         item["id"] = parts[-1]
-    yield item
+    return item
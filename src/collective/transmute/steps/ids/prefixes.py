@@ -1,4 +1,5 @@
 from collective.transmute import _types as t
+from collective.transmute.utils.rewrite import get_path_rewriter
 
 
 def _prefixes_from_settings(
@@ -25,22 +26,6 @@ def get_prefixes(
     return prefixes
 
 
-def _path_prefixes(prefixes: tuple[tuple[str, str], ...], path: str) -> str:
-    """
-    Process path prefixes, replacing source prefixes with target prefixes.
-    """
-    new_path = path
-    for prefix, replacement in prefixes:
-        if not new_path.startswith(prefix):
-            continue
-        elif new_path == prefix:
-            new_path = new_path.replace(prefix, replacement, 1)
-        else:
-            # Only replace if it's a full path segment
-            new_path = new_path.replace(f"{prefix}/", f"{replacement}/", 1)
-    return new_path
-
-
 def path_prefixes(
     state: t.PipelineState, settings: t.TransmuteSettings, path: str
 ) -> str:
@@ -48,4 +33,4 @@ def path_prefixes(
     Process path prefixes for a given path.
     """
     prefixes = get_prefixes(state, settings)
-    return _path_prefixes(prefixes, path)
+    return get_path_rewriter(settings).replace_prefixes(path, prefixes)
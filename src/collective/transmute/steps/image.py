@@ -9,6 +9,7 @@ image conversion.
 
 from collective.transmute import _types as t
 from collective.transmute.utils import item as utils
+from collective.transmute.utils.pipeline import applies_to
 
 
 IMAGE_FIELDS: tuple[str, ...] = ("image", "preview_image")
@@ -68,6 +69,7 @@ def cleanup_image_fields(item: t.PloneItem) -> t.PloneItem:
     return item
 
 
+@applies_to(types=get_conversion_types)
 async def process_image_to_preview_image_link(
     item: t.PloneItem,
     state: t.PipelineState,
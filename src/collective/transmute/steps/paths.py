@@ -7,11 +7,37 @@ paths are allowed or dropped during processing.
 """
 
 from collections import defaultdict
+from collections.abc import Collection
 from collective.transmute import _types as t
+from collective.transmute.utils.pipeline import header_step
+
+
+def _match(path: str, prefixes: Collection[str]) -> str | None:
+    """
+    Return the shortest prefix of a path among a collection of prefixes.
+
+    Parameters
+    ----------
+    path : str
+        The path to check.
+    prefixes : Collection[str]
+        The path prefixes. A ``PrefixSet``, as loaded from the settings, is
+        matched using its index; any other collection is indexed first.
+
+    Returns
+    -------
+    str or None
+        The matching prefix, or None if the path matches no prefix.
+    """
+    index = prefixes if isinstance(prefixes, t.PrefixSet) else t.PrefixSet(prefixes)
+    return index.match(path)
 
 
 def _is_valid_path(
-    path: str, allowed: set[str], drop: set[str], dropped_by_path_prefix: dict
+    path: str,
+    allowed: Collection[str],
+    drop: Collection[str],
+    dropped_by_path_prefix: dict,
 ) -> bool:
     """
     Check if a path is allowed to be processed based on allowed and drop prefixes.
@@ -20,12 +46,13 @@ def _is_valid_path(
     ----------
     path : str
         The path to check.
-    allowed : set[str]
-        Set of allowed path prefixes.
-    drop : set[str]
-        Set of drop path prefixes.
+    allowed : Collection[str]
+        Allowed path prefixes.
+    drop : Collection[str]
+        Drop path prefixes.
     dropped_by_path_prefix : dict[str, int]
-        Dictionary mapping dropped path prefixes to their count.
+        Dictionary mapping dropped path prefixes to their count. A dropped path
+        is counted under the shortest drop prefix it matches.
 
     Returns
     -------
@@ -39,19 +66,15 @@ def _is_valid_path(
         >>> _is_valid_path('/foo/bar', {'/foo'}, {'/foo/bar'})
         False
     """
-    status = True
-    for prefix in drop:
-        if path.startswith(prefix):
-            dropped_by_path_prefix[prefix] += 1
-            return False
+    if drop and (prefix := _match(path, drop)) is not None:
+        dropped_by_path_prefix[prefix] += 1
+        return False
     if allowed:
-        status = False
-        for prefix in allowed:
-            if path.startswith(prefix):
-                return True
-    return status
+        return _match(path, allowed) is not None
+    return True
 
 
+@header_step
 async def process_paths(
     item: t.PloneItem,
     state: t.PipelineState,
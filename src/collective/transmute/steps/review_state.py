@@ -14,6 +14,7 @@ Example:
 
 from collective.transmute import _types as t
 from collective.transmute.utils import workflow
+from collective.transmute.utils.pipeline import header_step
 
 
 def _is_valid_state(state_filter: tuple[str, ...], review_state: str) -> bool:
@@ -41,6 +42,7 @@ def _is_valid_state(state_filter: tuple[str, ...], review_state: str) -> bool:
     return status
 
 
+@header_step
 async def process_review_state(
     item: t.PloneItem, state: t.PipelineState, settings: t.TransmuteSettings
 ) -> t.PloneItemGenerator:
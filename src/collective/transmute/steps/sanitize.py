@@ -12,6 +12,7 @@ Example:
 """
 
 from collective.transmute import _types as t
+from collective.transmute.utils.pipeline import sync_step
 
 
 _DROP_KEYS: dict[bool, set[str]] = {}
@@ -43,9 +44,10 @@ def get_drop_keys(has_blocks: bool, settings: t.TransmuteSettings) -> set[str]:
     return _DROP_KEYS[has_blocks]
 
 
-async def process_cleanup(
+@sync_step
+def process_cleanup(
     item: t.PloneItem, state: t.PipelineState, settings: t.TransmuteSettings
-) -> t.PloneItemGenerator:
+) -> t.PloneItem:
     """
     Pipeline step to sanitize a Plone item by dropping unwanted keys.
 
@@ -57,7 +59,7 @@ async def process_cleanup(
         state (PipelineState): The pipeline state object.
         settings (TransmuteSettings): The transmute settings object.
 
-    Yields:
+    Returns:
         PloneItem: The sanitized item.
 
     Example:
@@ -69,4 +71,4 @@ async def process_cleanup(
     has_blocks: bool = "blocks" in item
     drop_keys: set[str] = get_drop_keys(has_blocks, settings)
     item = {k: v for k, v in item.items() if k not in drop_keys}
-    yield item
+    return item
@@ -3,8 +3,10 @@ Pipeline step to drop items based on their UID.
 """
 
 from collective.transmute import _types as t
+from collective.transmute.utils.pipeline import header_step
 
 
+@header_step
 async def drop_item_by_uid(
     item: t.PloneItem,
     state: t.PipelineState,
@@ -1,16 +1,22 @@
 from .data import sort_data_by_value
 from .performance import report_time
+from .pipeline import applies_to
 from .pipeline import check_steps
+from .pipeline import header_step
 from .pipeline import load_all_steps
 from .pipeline import load_processor
 from .pipeline import load_step
+from .pipeline import sync_step
 
 
 __all__ = [
+    "applies_to",
     "check_steps",
+    "header_step",
     "load_all_steps",
     "load_processor",
     "load_step",
     "report_time",
     "sort_data_by_value",
+    "sync_step",
 ]
@@ -0,0 +1,217 @@
+"""
+Blob payload utilities for ``collective.transmute``.
+
+This module provides helper functions to load content files while keeping the
+base64 payloads of blob fields out of memory. Payloads are replaced, before the
+JSON is parsed, by references to their position in the source file, and are read
+again only when the blob is exported.
+"""
+
+from collections.abc import Iterable
+from collective.transmute import _types as t
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import orjson
+import re
+
+
+_MARKER = "\x00transmute-blob-"
+"""Prefix of the placeholders replacing blob payloads before parsing."""
+
+_DATA_KEY = b'"data"'
+
+_DATA_VALUE_RE = re.compile(rb'\s*:\s*"')
+
+_STRUCTURE_RE = re.compile(rb"[{}\[\]]")
+
+_WHITESPACE = b" \t\n\r\f\v"
+
+
+@cache
+def _field_keys(field_names: tuple[str, ...]) -> tuple[bytes, ...]:
+    """Return the JSON keys of the blob fields."""
+    return tuple(f'"{name}"'.encode() for name in field_names)
+
+
+def _is_field_object(data: bytes, brace: int, keys: tuple[bytes, ...]) -> bool:
+    """Check if the object opened at ``brace`` is assigned to one of ``keys``."""
+    head = data[max(brace - 256, 0) : brace].rstrip(_WHITESPACE)
+    if not head.endswith(b":"):
+        return False
+    head = head[:-1].rstrip(_WHITESPACE)
+    return any(
+        head.endswith(key) and not head[: -len(key)].endswith(b"\\") for key in keys
+    )
+
+
+def splice_blob_payloads(
+    data: bytes, field_names: Iterable[str]
+) -> tuple[bytes, list[tuple[int, int]]]:
+    """
+    Replace the ``data`` payload of blob fields by placeholders.
+
+    Only payloads that can be safely located are replaced: the ``data`` key must
+    be a direct key of an object assigned to one of the ``field_names``, and the
+    payload must not contain escape sequences.
+
+    Payloads are located with ``bytes.find``, which skips a base64 payload much
+    faster than a regular expression, or a JSON parser, can.
+
+    Parameters
+    ----------
+    data : bytes
+        The raw JSON document.
+    field_names : Iterable[str]
+        Names of the blob fields.
+
+    Returns
+    -------
+    tuple[bytes, list[tuple[int, int]]]
+        The JSON document with placeholders and the offset and length, in the
+        original document, of each replaced payload.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> splice_blob_payloads(b'{"file": {"data": "aGVsbG8="}}', ["file"])
+        (b'{"file": {"data": "\\\\u0000transmute-blob-0"}}', [(19, 8)])
+    """
+    keys = _field_keys(tuple(field_names))
+    parts: list[bytes] = []
+    references: list[tuple[int, int]] = []
+    position = 0
+    search = 0
+    while (key := data.find(_DATA_KEY, search)) != -1:
+        search = key + len(_DATA_KEY)
+        value_match = _DATA_VALUE_RE.match(data, search)
+        if value_match is None or data[key - 1 : key] == b"\\":
+            continue
+        # The data key must be a direct key of a blob field object
+        brace = data.rfind(b"{", position, key)
+        if brace == -1 or _STRUCTURE_RE.search(data, brace + 1, key):
+            continue
+        if not _is_field_object(data, brace, keys):
+            continue
+        begin = value_match.end()
+        end = data.find(b'"', begin)
+        if end == -1:
+            break
+        if data.find(b"\\", begin, end) != -1:
+            continue
+        parts.append(data[position:begin])
+        parts.append(f"\\u0000transmute-blob-{len(references)}".encode())
+        references.append((begin, end - begin))
+        position = search = end
+    if not references:
+        return data, references
+    parts.append(data[position:])
+    return b"".join(parts), references
+
+
+def _restore(value: Any, payloads: dict[str, str]) -> Any:
+    """Replace placeholders found outside blob fields by the original payloads."""
+    if isinstance(value, dict):
+        return {key: _restore(sub_value, payloads) for key, sub_value in value.items()}
+    if isinstance(value, list):
+        return [_restore(sub_value, payloads) for sub_value in value]
+    if isinstance(value, str) and value in payloads:
+        return payloads[value]
+    return value
+
+
+def load_item(
+    filepath: Path, data: bytes, field_names: Iterable[str], keep_data: bool = False
+) -> t.PloneItem:
+    """
+    Parse a content file, keeping base64 blob payloads in the source file.
+
+    The ``data`` of each blob field, with base64 encoding, is replaced by a
+    ``BlobReference`` pointing to the payload in ``filepath``.
+
+    Parameters
+    ----------
+    filepath : Path
+        The source file.
+    data : bytes
+        The contents of the source file.
+    field_names : Iterable[str]
+        Names of the blob fields.
+    keep_data : bool, optional
+        Keep ``data`` in the references, so payloads are read from memory
+        instead of the source file, by default False.
+
+    Returns
+    -------
+    PloneItem
+        The parsed item.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> item = load_item(path, path.read_bytes(), ["file", "image"])
+        >>> item["file"]["data"]
+        BlobReference(.../1.json, 1234, 5678)
+    """
+    field_names = tuple(field_names)
+    spliced, references = splice_blob_payloads(data, field_names)
+    item: t.PloneItem = orjson.loads(spliced)
+    if not references:
+        return item
+    pending = {f"{_MARKER}{idx}": ref for idx, ref in enumerate(references)}
+    source = data if keep_data else None
+    for name in field_names:
+        blob = item.get(name)
+        if not isinstance(blob, dict) or (marker := blob.get("data")) not in pending:
+            continue
+        offset, length = pending.pop(marker)
+        if blob.get("encoding", "base64") == "base64":
+            blob["data"] = t.BlobReference(filepath, offset, length, source)
+        else:
+            blob["data"] = data[offset : offset + length].decode("utf-8")
+    if pending:
+        payloads = {
+            marker: data[offset : offset + length].decode("utf-8")
+            for marker, (offset, length) in pending.items()
+        }
+        item = _restore(item, payloads)
+    return item
+
+
+def load_payloads(item: t.PloneItem, field_names: Iterable[str]) -> t.PloneItem:
+    """
+    Read the payloads of blob fields kept in the source file.
+
+    The ``BlobReference`` objects set by :func:`load_item` are replaced, in place,
+    by the base64 payloads they point to.
+
+    Parameters
+    ----------
+    item : PloneItem
+        The item.
+    field_names : Iterable[str]
+        Names of the blob fields.
+
+    Returns
+    -------
+    PloneItem
+        The item, with its payloads.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> item = load_payloads(load_item(path, data, ["file"]), ["file"])
+        >>> item["file"]["data"]
+        'JVBERi0xLjQK...'
+    """
+    for name in field_names:
+        blob = item.get(name)
+        if isinstance(blob, dict) and isinstance(
+            reference := blob.get("data"), t.BlobReference
+        ):
+            blob["data"] = reference.read()
+    return item
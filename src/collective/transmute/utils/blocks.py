@@ -0,0 +1,568 @@
+"""
+HTML to Volto blocks conversion for ``collective.transmute``.
+
+Converting the HTML of an item to blocks, with ``collective.html2blocks``, is the
+most CPU intensive part of a pipeline run. With ``blocks_workers`` set in the
+``[config]`` section of ``transmute.toml``, a ``BlocksConverter`` runs the
+conversions in a process pool.
+
+The converter reads ahead of the pipeline: the HTML of the next items is submitted
+to the pool as soon as they are read, so it is converted while the pipeline
+handles the previous items. Items are still processed one at a time, in order,
+and an item whose HTML was changed by an earlier step is converted again.
+
+Conversions are also stored in a persistent ``BlocksCache``, an SQLite database
+in the cache folder of ``collective.transmute``, keyed by a hash of the HTML and
+of the ``collective.html2blocks`` version. Items sharing the same HTML, and the
+next runs against the same export, reuse the stored blocks.
+"""
+
+from collections import deque
+from collections.abc import AsyncGenerator
+from collections.abc import AsyncIterator
+from collections.abc import Iterator
+from collective.html2blocks.converter import html_to_blocks
+from collective.html2blocks.converter import volto_blocks
+from collective.html2blocks.utils.blocks import info_from_blocks
+from collective.transmute import _types as t
+from collective.transmute.utils.listing import cache_dir
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from contextlib import contextmanager
+from contextlib import suppress
+from contextvars import ContextVar
+from copy import deepcopy
+from functools import cache
+from importlib.metadata import version
+from pathlib import Path
+
+import asyncio
+import hashlib
+import multiprocessing
+import orjson
+import sqlite3
+import time
+
+
+CACHE_FILE = "blocks.sqlite"
+"""Name of the blocks cache database, in the cache folder."""
+
+CACHE_BATCH_SIZE = 1000
+"""Number of buffered cache writes flushed to the database at once."""
+
+
+_CONVERTER: ContextVar["BlocksConverter | None"] = ContextVar(
+    "blocks_converter", default=None
+)
+"""Converter of the running pipeline, if any."""
+
+_CACHE: ContextVar["BlocksCache | None"] = ContextVar("blocks_cache", default=None)
+"""Blocks cache of the running pipeline, if any."""
+
+
+def item_html(item: t.PloneItem) -> str:
+    """
+    Return the HTML of the ``text`` field of an item.
+
+    Parameters
+    ----------
+    item : PloneItem
+        The item.
+
+    Returns
+    -------
+    str
+        The HTML, or an empty string.
+    """
+    text = item.get("text")
+    return text.get("data", "") or "" if isinstance(text, dict) else ""
+
+
+@cache
+def _cache_salt() -> bytes:
+    """Return the prefix of the cache keys, changed by ``collective.html2blocks``."""
+    return f"html2blocks-{version('collective.html2blocks')}\0".encode()
+
+
+class BlocksCache:
+    """
+    Persistent cache of HTML to Volto blocks conversions.
+
+    New entries are buffered and written in batches. When the database grows
+    over ``max_size`` bytes, the least recently used entries are evicted on
+    :meth:`close`.
+
+    The cache is only an optimization: database errors disable it.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the database file.
+    max_size : int
+        Maximum size, in bytes, of the stored blocks.
+    stats : BlocksCacheStats, optional
+        Statistics updated by the lookups.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_size: int = 512 * 1024 * 1024,
+        stats: t.BlocksCacheStats | None = None,
+    ):
+        self.path = path
+        self.max_size = max_size
+        self.stats = stats if stats is not None else t.BlocksCacheStats()
+        self.evicted = 0
+        """Number of entries evicted by :meth:`close`."""
+        self._pending: dict[str, bytes] = {}
+        self._used: set[str] = set()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Shard workers share the database
+        self._db: sqlite3.Connection | None = sqlite3.connect(path, timeout=30)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS blocks "
+            "(key TEXT PRIMARY KEY, value BLOB, size INTEGER, used INTEGER)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS blocks_used ON blocks (used)")
+
+    @staticmethod
+    def key(source: str) -> str:
+        """
+        Return the cache key of HTML.
+
+        Parameters
+        ----------
+        source : str
+            The HTML.
+
+        Returns
+        -------
+        str
+            Hash of the HTML and of the ``collective.html2blocks`` version.
+        """
+        return hashlib.sha256(_cache_salt() + source.encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str) -> bytes | None:
+        if (value := self._pending.get(key)) is not None:
+            return value
+        if not self._db:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT value FROM blocks WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            self._disable()
+            return None
+        return row[0] if row else None
+
+    def has(self, source: str) -> bool:
+        """
+        Check if the conversion of HTML is cached.
+
+        Parameters
+        ----------
+        source : str
+            The HTML.
+
+        Returns
+        -------
+        bool
+            ``True`` if the blocks are cached.
+        """
+        return self._lookup(self.key(source)) is not None
+
+    def get(self, source: str) -> list[t.VoltoBlock] | None:
+        """
+        Return the cached blocks of HTML, updating the statistics.
+
+        Parameters
+        ----------
+        source : str
+            The HTML.
+
+        Returns
+        -------
+        list[VoltoBlock] or None
+            A copy of the cached blocks, or ``None``.
+        """
+        key = self.key(source)
+        value = self._lookup(key)
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self._used.add(key)
+        return orjson.loads(value)
+
+    def put(self, source: str, blocks: list[t.VoltoBlock]) -> None:
+        """
+        Store the blocks converted from HTML.
+
+        Parameters
+        ----------
+        source : str
+            The HTML.
+        blocks : list[VoltoBlock]
+            The blocks, serialized right away.
+        """
+        if not self._db:
+            return
+        self._pending[self.key(source)] = orjson.dumps(blocks)
+        if len(self._pending) >= CACHE_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered entries, and the last use of the cached ones."""
+        if not self._db:
+            return
+        now = int(time.time())
+        rows = [(key, value, len(value), now) for key, value in self._pending.items()]
+        used = [(now, key) for key in self._used]
+        self._pending.clear()
+        self._used.clear()
+        try:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?)", rows
+                )
+                self._db.executemany("UPDATE blocks SET used = ? WHERE key = ?", used)
+        except sqlite3.Error:
+            self._disable()
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        (size,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM blocks").fetchone()
+        if size <= self.max_size:
+            return
+        # Evict down to 90% of the maximum size, to avoid evicting on every run
+        excess = size - self.max_size * 9 // 10
+        keys: list[tuple[str]] = []
+        for key, entry_size in db.execute(
+            "SELECT key, size FROM blocks ORDER BY used, key"
+        ):
+            keys.append((key,))
+            excess -= entry_size
+            if excess <= 0:
+                break
+        with db:
+            db.executemany("DELETE FROM blocks WHERE key = ?", keys)
+        self.evicted += len(keys)
+
+    def close(self) -> None:
+        """Flush the buffered entries, evict old entries and close the database."""
+        self.flush()
+        if not (db := self._db):
+            return
+        with suppress(sqlite3.Error):
+            self._evict(db)
+        db.close()
+        self._db = None
+
+    def _disable(self) -> None:
+        if self._db:
+            self._db.close()
+        self._db = None
+        self._pending.clear()
+
+
+class BlocksConverter:
+    """
+    Convert HTML to Volto blocks in a process pool, reading ahead of the pipeline.
+
+    Conversions are keyed by their HTML, so items with the same text share a
+    single conversion.
+
+    Parameters
+    ----------
+    workers : int
+        Number of worker processes.
+    queue_size : int
+        Maximum number of items read ahead, and so of conversions in flight.
+    """
+
+    def __init__(self, workers: int, queue_size: int = 32):
+        self.workers = max(workers, 1)
+        self.queue_size = max(queue_size, 1)
+        self._pool: ProcessPoolExecutor | None = None
+        self._pending: dict[str, tuple[asyncio.Future, int]] = {}
+        """Conversions submitted ahead, with the number of items waiting for them."""
+        self.hits = 0
+        """Number of conversions submitted ahead and used by the pipeline."""
+        self.misses = 0
+        """Number of conversions not submitted ahead."""
+
+    def start(self) -> None:
+        """Start the process pool."""
+        context = multiprocessing.get_context("spawn")
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+
+    def stop(self) -> None:
+        """Cancel pending conversions and stop the process pool."""
+        for future, _ in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        if self._pool:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _run(self, source: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._pool, html_to_blocks, source)
+
+    def submit(self, source: str) -> None:
+        """
+        Start the conversion of HTML in the pool.
+
+        Parameters
+        ----------
+        source : str
+            The HTML of an item read ahead.
+        """
+        if not source:
+            return
+        if (blocks_cache := active_cache()) and blocks_cache.has(source):
+            return
+        future, count = self._pending.get(source) or (None, 0)
+        self._pending[source] = (future or self._run(source), count + 1)
+
+    def release(self, source: str) -> None:
+        """
+        Signal that an item read ahead was processed by the pipeline.
+
+        Parameters
+        ----------
+        source : str
+            The HTML the item had when it was read.
+        """
+        if source not in self._pending:
+            return
+        future, count = self._pending[source]
+        if count > 1:
+            self._pending[source] = (future, count - 1)
+            return
+        del self._pending[source]
+        future.cancel()
+
+    async def convert(self, source: str) -> list[t.VoltoBlock]:
+        """
+        Return the blocks converted from HTML.
+
+        Parameters
+        ----------
+        source : str
+            The HTML to convert.
+
+        Returns
+        -------
+        list[VoltoBlock]
+            The blocks, in order.
+        """
+        if not source:
+            return []
+        if source not in self._pending:
+            self.misses += 1
+            return await self._run(source)
+        self.hits += 1
+        future, count = self._pending[source]
+        blocks = await future
+        # Another item read ahead uses the same conversion
+        return deepcopy(blocks) if count > 1 else blocks
+
+    async def read_ahead(
+        self, items: AsyncIterator[tuple[str, t.PloneItem]]
+    ) -> AsyncGenerator[tuple[str, t.PloneItem], None]:
+        """
+        Yield items from a reader, submitting their HTML ahead.
+
+        Parameters
+        ----------
+        items : AsyncIterator[tuple[str, PloneItem]]
+            Filenames and items, as yielded by ``json_reader``.
+
+        Yields
+        ------
+        tuple[str, PloneItem]
+            The filenames and items, in the same order.
+        """
+        window: deque[tuple[str, t.PloneItem, str]] = deque()
+
+        def drain(size: int) -> Iterator[tuple[str, t.PloneItem, str]]:
+            while len(window) > size:
+                yield window.popleft()
+
+        async for filename, item in items:
+            source = item_html(item)
+            self.submit(source)
+            window.append((filename, item, source))
+            for filename, item, source in drain(self.queue_size):
+                yield filename, item
+                self.release(source)
+        for filename, item, source in drain(0):
+            yield filename, item
+            self.release(source)
+
+
+@asynccontextmanager
+async def blocks_converter(
+    settings: t.TransmuteSettings, enabled: bool = True
+) -> AsyncGenerator[BlocksConverter | None, None]:
+    """
+    Run the block conversions of a pipeline run in a process pool.
+
+    The pool is only started when ``blocks_workers`` is greater than zero.
+
+    Parameters
+    ----------
+    settings : TransmuteSettings
+        The transmute settings object.
+    enabled : bool
+        Use a process pool, if configured.
+
+    Yields
+    ------
+    BlocksConverter or None
+        The active converter, also returned by :func:`active_converter`.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> async with blocks_converter(settings):
+        ...     await process_items(...)
+    """
+    config = settings.config
+    workers: int = config.get("blocks_workers", 0)
+    if not enabled or workers < 1:
+        yield None
+        return
+    converter = BlocksConverter(workers, config.get("blocks_queue_size", 32))
+    converter.start()
+    token = _CONVERTER.set(converter)
+    try:
+        yield converter
+    finally:
+        _CONVERTER.reset(token)
+        converter.stop()
+
+
+def active_converter() -> BlocksConverter | None:
+    """
+    Return the block converter of the running pipeline.
+
+    Returns
+    -------
+    BlocksConverter or None
+        The converter, or ``None`` when blocks are converted inline.
+    """
+    return _CONVERTER.get()
+
+
+@contextmanager
+def blocks_cache(
+    settings: t.TransmuteSettings, stats: t.BlocksCacheStats | None = None
+) -> Iterator[BlocksCache | None]:
+    """
+    Open the blocks cache for a pipeline run.
+
+    The cache is used when ``blocks_cache`` is enabled, and bounded by
+    ``blocks_cache_max_mb``.
+
+    Parameters
+    ----------
+    settings : TransmuteSettings
+        The transmute settings object.
+    stats : BlocksCacheStats, optional
+        Statistics updated by the lookups, usually ``state.blocks_cache``.
+
+    Yields
+    ------
+    BlocksCache or None
+        The cache, also returned by :func:`active_cache`.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> with blocks_cache(settings, state.blocks_cache):
+        ...     await process_items(...)
+    """
+    config = settings.config
+    blocks_cache_: BlocksCache | None = None
+    if config.get("blocks_cache", True):
+        max_size = config.get("blocks_cache_max_mb", 512) * 1024 * 1024
+        try:
+            blocks_cache_ = BlocksCache(cache_dir() / CACHE_FILE, max_size, stats)
+        except (OSError, sqlite3.Error):
+            blocks_cache_ = None
+    if not blocks_cache_:
+        yield None
+        return
+    token = _CACHE.set(blocks_cache_)
+    try:
+        yield blocks_cache_
+    finally:
+        _CACHE.reset(token)
+        blocks_cache_.close()
+
+
+def active_cache() -> BlocksCache | None:
+    """
+    Return the blocks cache of the running pipeline.
+
+    Returns
+    -------
+    BlocksCache or None
+        The cache, or ``None`` when conversions are not cached.
+    """
+    return _CACHE.get()
+
+
+async def _html_to_blocks(source: str) -> list[t.VoltoBlock]:
+    """Convert HTML, with the active cache and converter."""
+    if not source:
+        return []
+    blocks_cache_ = active_cache()
+    if blocks_cache_ and (blocks := blocks_cache_.get(source)) is not None:
+        return blocks
+    converter = active_converter()
+    blocks = await converter.convert(source) if converter else html_to_blocks(source)
+    if blocks_cache_:
+        blocks_cache_.put(source, blocks)
+    return blocks
+
+
+async def convert_blocks(
+    source: str,
+    default_blocks: list[t.VoltoBlock],
+    additional_blocks: list[t.VoltoBlock],
+) -> t.VoltoBlocksInfo:
+    """
+    Convert HTML to Volto blocks, with the active cache and converter if any.
+
+    Parameters
+    ----------
+    source : str
+        The HTML to convert.
+    default_blocks : list[VoltoBlock]
+        Blocks added before the converted ones.
+    additional_blocks : list[VoltoBlock]
+        Blocks added after the converted ones.
+
+    Returns
+    -------
+    VoltoBlocksInfo
+        The blocks and their layout, as returned by ``volto_blocks``.
+    """
+    if not (active_converter() or active_cache()):
+        return volto_blocks(
+            source=source,
+            default_blocks=default_blocks,
+            additional_blocks=additional_blocks,
+        )
+    blocks = list(default_blocks)
+    blocks.extend(await _html_to_blocks(source))
+    blocks.extend(additional_blocks)
+    return info_from_blocks(blocks)
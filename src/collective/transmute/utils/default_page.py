@@ -9,6 +9,46 @@ item data into default pages, and to handle special cases such as Link types.
 from collective.transmute import _types as t
 
 
+MERGE_KEYS = ("UID", "title")
+"""Keys of the parent item always read when merging its default page."""
+
+
+def parent_keys(
+    parent_item: t.PloneItem, keys_from_parent: tuple[str, ...]
+) -> t.PloneItem:
+    """
+    Return the keys of a parent item used to merge its default page.
+
+    Parent items waiting for their default page are kept in memory until it is
+    processed, so only the keys read by :func:`handle_default_page` are kept.
+
+    Parameters
+    ----------
+    parent_item : PloneItem
+        The parent item.
+    keys_from_parent : tuple[str, ...]
+        Keys to copy from the parent item.
+
+    Returns
+    -------
+    PloneItem
+        A new item, with the ``UID``, ``title`` and ``keys_from_parent`` of the
+        parent item.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> parent_keys(folder, ("@id", "id"))
+        {'@id': '/ingressos', 'UID': '...', 'id': 'ingressos', 'title': 'Ingressos'}
+    """
+    return {
+        key: value
+        for key, value in parent_item.items()
+        if key in MERGE_KEYS or key in keys_from_parent
+    }
+
+
 def _merge_items(
     parent_item: t.PloneItem, item: t.PloneItem, keys_from_parent: tuple[str, ...]
 ) -> t.PloneItem:
@@ -9,16 +9,21 @@ format expected by ``plone.exportimport``.
 
 from .redirects import initialize_redirects
 from collections.abc import AsyncGenerator
+from collections.abc import Container
+from collections.abc import Iterable
+from collections.abc import Iterator
 from collective.transmute import _types as t
 from collective.transmute._types import c_exportimport as t_expimp
-from collective.transmute.utils import files
+from collective.transmute.utils import json_stream
 from collective.transmute.utils import redirects as redirect_utils
-from dataclasses import asdict
 from pathlib import Path
+from typing import Any
+
+import asyncio
 
 
 def _initialize_localroles(
-    data: list[t_expimp.LocalRoles],
+    data: Iterable[t_expimp.LocalRoles],
 ) -> dict[str, t.PloneItemLocalRoles]:
     """
     Initialize local roles from the provided data.
@@ -28,7 +33,7 @@ def _initialize_localroles(
 
     Parameters
     ----------
-    data : list[LocalRoles]
+    data : Iterable[LocalRoles]
         The input data containing local roles information.
 
     Returns
@@ -46,10 +51,43 @@ def _initialize_localroles(
     return local_roles
 
 
+def _values(path: Path) -> Iterator[Any]:
+    """Yield the items of a metadata file, parsing it incrementally."""
+    return (value for _, value in json_stream.iter_json_file(path))
+
+
+def _load_metadata(metadata_files: Iterable[Path]) -> dict[str, Any]:
+    """Build the metadata mappings, reading each file incrementally."""
+    paths = {
+        path.name.replace("export_", "").replace(".json", ""): path
+        for path in metadata_files
+    }
+    data: dict[str, Any] = {}
+    if path := paths.get("defaultpages"):
+        data["default_page"] = {
+            item["uuid"]: item["default_page_uuid"] for item in _values(path)
+        }
+    if path := paths.get("localroles"):
+        data["local_roles"] = _initialize_localroles(_values(path))
+    if path := paths.get("ordering"):
+        data["ordering"] = {item["uuid"]: item["order"] for item in _values(path)}
+    if path := paths.get("relations"):
+        data["relations"] = list(_values(path))
+    if path := paths.get("redirects"):
+        data["redirects"] = initialize_redirects(json_stream.iter_json_file(path))
+    if path := paths.get("members"):
+        data["principals"] = dict(json_stream.iter_json_file(path))
+    return data
+
+
 async def initialize_metadata(src_files: t.SourceFiles, dst: Path) -> t.MetadataInfo:
     """
     Initialize and load metadata from source files into a ``MetadataInfo`` object.
 
+    Metadata files are parsed incrementally, in a thread, and the mappings are
+    built from their items as they are read, so large files are never fully
+    loaded in memory. Files not used by the metadata are not read.
+
     Parameters
     ----------
     src_files : SourceFiles
@@ -63,48 +101,34 @@ async def initialize_metadata(src_files: t.SourceFiles, dst: Path) -> t.Metadata
         The loaded metadata information object.
     """
     path = dst / "__metadata__.json"
-    metadata_files = src_files.metadata
-    data = {}
-    async for filename, content in files.json_reader(metadata_files):
-        key = filename.replace("export_", "").replace(".json", "")
-        data[key] = content
-
-    # Process default_pages
-    default_page = {
-        item["uuid"]: item["default_page_uuid"] for item in data.get("defaultpages", [])
-    }
-    local_permissions: dict[str, dict] = {}
-
-    # Process local_roles
-    local_roles: dict[str, t.PloneItemLocalRoles] = _initialize_localroles(
-        data.get("localroles", [])
-    )
-
-    ordering: dict[str, dict] = {
-        item["uuid"]: item["order"] for item in data.get("ordering", [])
-    }
-    relations: list[dict] = data.get("relations", [])
-    redirects: dict[str, str] = initialize_redirects(data.get("redirects", {}))
-    principals: dict[str, list[dict]] = data.get("members", {})
-
+    data = await asyncio.to_thread(_load_metadata, src_files.metadata)
     return t.MetadataInfo(
         path=path,
-        default_page=default_page,
-        local_permissions=local_permissions,
-        local_roles=local_roles,
-        ordering=ordering,
-        relations=relations,
-        redirects=redirects,
-        principals=principals,
+        default_page=data.get("default_page", {}),
+        local_permissions={},
+        local_roles=data.get("local_roles", {}),
+        ordering=data.get("ordering", {}),
+        relations=data.get("relations", []),
+        redirects=data.get("redirects", {}),
+        principals=data.get("principals", {}),
     )
 
 
+def _seen(data: dict, seen: Container[str]) -> t.JSONObject:
+    """Return the entries of a mapping for exported items, without copying it."""
+    return t.JSONObject((key, value) for key, value in data.items() if key in seen)
+
+
 async def prepare_metadata_file(
     metadata: t.MetadataInfo, state: t.PipelineState, settings: t.TransmuteSettings
-) -> AsyncGenerator[tuple[dict | list, Path], None]:
+) -> AsyncGenerator[tuple[t.JSONValue, Path], None]:
     """
     Prepare and yield metadata files for export, including debug and relations data.
 
+    The metadata is not copied: large mappings and lists are yielded as
+    ``JSONObject`` and ``JSONArray`` streams, filtered while they are written by
+    :func:`collective.transmute.utils.files.stream_json`.
+
     Parameters
     ----------
     metadata : MetadataInfo
@@ -116,43 +140,56 @@ async def prepare_metadata_file(
 
     Yields
     ------
-    tuple[dict | list, Path]
+    tuple[JSONValue, Path]
         Tuples of data and their corresponding file paths.
     """
-    data: dict = asdict(metadata)
-    path: Path = data.pop("path")
-    fix_relations: dict[str, str] = data.pop("__fix_relations__", {})
+    path: Path = metadata.path
     # Handle principals data
-    principals: dict[str, list[dict]] = data.pop("principals", {})
-    async for princ_data, princ_path in prepare_principals_data(principals, path):
+    async for princ_data, princ_path in prepare_principals_data(
+        metadata.principals, path
+    ):
         yield princ_data, princ_path
     # Handle relations data
-    relations = data.pop("relations", [])
     async for rel_data, rel_path in prepare_relations_data(
-        relations, fix_relations, path, state
+        metadata.relations, metadata.__fix_relations__, path, state
     ):
         yield rel_data, rel_path
     # Handle redirects data
-    redirects: dict[str, str] = data.pop("redirects", {})
     async for red_data, red_path in prepare_redirects_data(
-        redirects, path, state.paths, settings.site_root["dest"]
+        metadata.redirects, path, state.paths, settings.site_root["dest"]
     ):
         yield red_data, red_path
 
+    blob_files = t.JSONArray(metadata._blob_files_)
+    data_files = t.JSONArray(metadata._data_files_)
     if settings.is_debug:
-        data["__seen__"] = list(state.seen)
+        debug_data = t.JSONObject([
+            ("__version__", metadata.__version__),
+            ("__processing_default_page__", metadata.__processing_default_page__),
+            ("_blob_files_", blob_files),
+            ("_data_files_", data_files),
+            ("default_page", t.JSONObject(metadata.default_page.items())),
+            ("local_permissions", metadata.local_permissions),
+            ("local_roles", t.JSONObject(metadata.local_roles.items())),
+            ("ordering", t.JSONObject(metadata.ordering.items())),
+            ("__seen__", t.JSONArray(state.seen)),
+        ])
         debug_path = path.parent / "__debug_metadata__.json"
-        yield data, debug_path
-    remove = [key for key in data if key.startswith("__") and key != "__version__"]
-    if not bool(settings.default_pages["keep"]):
-        # Remove default_page from list
-        data["default_page"] = {}
-
-    for key in ["default_page", "ordering", "local_roles"]:
-        data[key] = {k: v for k, v in data[key].items() if k in state.seen}
-    data["relations"] = []
-    for item in remove:
-        data.pop(item)
+        yield debug_data, debug_path
+    seen = state.seen
+    default_page: t.JSONValue = {}
+    if bool(settings.default_pages["keep"]):
+        default_page = _seen(metadata.default_page, seen)
+    data = t.JSONObject([
+        ("__version__", metadata.__version__),
+        ("_blob_files_", blob_files),
+        ("_data_files_", data_files),
+        ("default_page", default_page),
+        ("local_permissions", metadata.local_permissions),
+        ("local_roles", _seen(metadata.local_roles, seen)),
+        ("ordering", _seen(metadata.ordering, seen)),
+        ("relations", []),
+    ])
     yield data, path
 
 
@@ -161,7 +198,7 @@ async def prepare_relations_data(
     to_fix: dict[str, str],
     metadata_path: Path,
     state: t.PipelineState,
-) -> AsyncGenerator[tuple[list[dict], Path], None]:
+) -> AsyncGenerator[tuple[t.JSONArray, Path], None]:
     """
     Prepare and yield relations data for export.
 
@@ -178,8 +215,8 @@ async def prepare_relations_data(
 
     Yields
     ------
-    tuple[list[dict], Path]
-        Tuples of relations data and their corresponding file paths.
+    tuple[JSONArray, Path]
+        The relations, resolved as they are iterated, and the file path.
     """
 
     def final_uid(item: dict, attr: str) -> str | None:
@@ -188,28 +225,31 @@ async def prepare_relations_data(
             uid = uids.get(uid, to_fix.get(uid))
         return uid if uid else None
 
-    data = []
+    def valid_relations() -> Iterator[dict[str, str]]:
+        for item in relations:
+            from_uuid: str | None = final_uid(item, "from_uuid")
+            to_uuid: str | None = final_uid(item, "to_uuid")
+            from_attribute: str = item.get(
+                "relationship", item.get("from_attribute", "")
+            )
+            if from_uuid and to_uuid and from_attribute and from_uuid != to_uuid:
+                yield {
+                    "from_attribute": from_attribute,
+                    "from_uuid": from_uuid,
+                    "to_uuid": to_uuid,
+                }
+
     uids = state.uids
-    for item in relations:
-        from_uuid: str | None = final_uid(item, "from_uuid")
-        to_uuid: str | None = final_uid(item, "to_uuid")
-        from_attribute: str = item.get("relationship", item.get("from_attribute", ""))
-        if from_uuid and to_uuid and from_attribute and from_uuid != to_uuid:
-            data.append({
-                "from_attribute": from_attribute,
-                "from_uuid": from_uuid,
-                "to_uuid": to_uuid,
-            })
     path = (metadata_path.parent.parent / "relations.json").resolve()
-    yield data, path
+    yield t.JSONArray(valid_relations()), path
 
 
 async def prepare_redirects_data(
     redirects: dict[str, str],
     metadata_path: Path,
-    state_paths: list[tuple[str, str, str]],
+    state_paths: Iterable[tuple[str, str, str]],
     site_root: str,
-) -> AsyncGenerator[tuple[dict[str, str], Path], None]:
+) -> AsyncGenerator[tuple[t.JSONObject, Path], None]:
     """
     Prepare and yield redirects data for export as a JSON file.
 
@@ -221,14 +261,14 @@ async def prepare_redirects_data(
             Mapping of source paths to destination paths.
         metadata_path (Path):
             Path to the metadata file. Used to determine output location.
-        state_paths (list[tuple[str, str, str]]):
-            List of valid paths from the pipeline state.
+        state_paths (Iterable[tuple[str, str, str]]):
+            Valid paths from the pipeline state.
         site_root (str):
             The root path for the destination site.
 
     Yields:
-        tuple[dict[str, str], Path]:
-            The filtered redirects mapping and the output file path.
+        tuple[JSONObject, Path]:
+            The redirects, filtered as they are iterated, and the output file path.
 
     Example:
         >>> async for result in prepare_redirects_data(
@@ -237,8 +277,12 @@ async def prepare_redirects_data(
         ...     data, path = result
         ...     print(path)
     """
-    valid_paths = {f"{site_root}{p[0]}" for p in state_paths}
-    data = redirect_utils.filter_redirects(redirects, valid_paths)
+    # Only keep the paths used as a redirect target
+    targets = set(redirects.values())
+    valid_paths = {
+        target for item in state_paths if (target := f"{site_root}{item[0]}") in targets
+    }
+    data = t.JSONObject(redirect_utils.iter_redirects(redirects, valid_paths))
     path = (metadata_path.parent.parent / "redirects.json").resolve()
     yield data, path
 
@@ -258,8 +302,8 @@ async def prepare_principals_data(
             Mapping of principals data.
         metadata_path (Path):
             Path to the metadata file. Used to determine output location.
-        state_paths (list[tuple[str, str, str]]):
-            List of valid paths from the pipeline state.
+        state_paths (Iterable[tuple[str, str, str]]):
+            Valid paths from the pipeline state.
         site_root (str):
             The root path for the destination site.
 
@@ -7,16 +7,22 @@ pipeline. Functions here support JSON, CSV, and binary blob operations.
 """
 
 from aiofiles.os import makedirs
-from base64 import b64decode
+from collections import deque
 from collections.abc import AsyncGenerator
 from collections.abc import Iterable
 from collections.abc import Iterator
 from collective.transmute import _types as t
 from collective.transmute import get_logger
+from collective.transmute.utils import blobs as blob_utils
 from collective.transmute.utils import exportimport as ei_utils
+from collective.transmute.utils import listing
+from collective.transmute.utils.performance import peak_rss
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import aiofiles
+import asyncio
+import binascii
 import csv
 import json
 import orjson
@@ -25,15 +31,36 @@ import shutil
 
 SUFFIX = ".json"
 
+BLOB_CHUNK_SIZE = 4 * 1024 * 1024
+"""Number of base64 characters decoded at a time when writing blobs."""
 
-def json_dumps(data: dict | list) -> bytes:
+_NON_BASE64 = bytes(
+    sorted(
+        set(range(256))
+        - set(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=")
+    )
+)
+
+
+def _json_default(value: object) -> str:
+    """Serialize values not supported by the JSON encoders."""
+    if isinstance(value, t.BlobReference):
+        return value.read()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def json_dumps(data: dict | list, indent: bool = True) -> bytes:
     """
     Dump a dictionary or list to a JSON-formatted bytes object.
 
+    Blob payloads still kept in their source file are read and included.
+
     Parameters
     ----------
     data : dict or list
         The data to serialize to JSON.
+    indent : bool, optional
+        Indent the JSON with two spaces (default: True).
 
     Returns
     -------
@@ -42,9 +69,15 @@ def json_dumps(data: dict | list) -> bytes:
     """
     try:
         # Handles recursion of 255 levels
-        response: bytes = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        response: bytes = orjson.dumps(
+            data,
+            default=_json_default,
+            option=orjson.OPT_INDENT_2 if indent else None,
+        )
     except orjson.JSONEncodeError:
-        response = json.dumps(data, indent=2).encode("utf-8")
+        response = json.dumps(
+            data, indent=2 if indent else None, default=_json_default
+        ).encode("utf-8")
     return response
 
 
@@ -69,6 +102,97 @@ async def json_dump(data: dict | list, path: Path) -> Path:
     return path
 
 
+def _encode(value: object, level: int) -> bytes:
+    """Encode a value, indented to be nested ``level`` times."""
+    data = json_dumps(value) if isinstance(value, dict | list) else None
+    if data is None:
+        data = orjson.dumps(value, default=_json_default)
+    if level and b"\n" in data:
+        # Newlines inside JSON strings are escaped, only the indentation has them
+        data = data.replace(b"\n", b"\n" + b"  " * level)
+    return data
+
+
+def iter_json(value: object, level: int = 0) -> Iterator[bytes]:
+    """
+    Encode a value as indented JSON, in chunks.
+
+    ``JSONObject`` and ``JSONArray`` values are encoded member by member, as they
+    are iterated, so they can be filtered on the fly without building a copy.
+    The result is the same as ``json_dumps`` for the equivalent dict or list.
+
+    Parameters
+    ----------
+    value : object
+        The value to encode.
+    level : int, optional
+        Nesting level of the value (default: 0).
+
+    Yields
+    ------
+    bytes
+        Chunks of the JSON document.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> data = t.JSONObject((k, v) for k, v in ordering.items() if k in seen)
+        >>> b"".join(iter_json(data))
+    """
+    if isinstance(value, t.JSONObject):
+        members = ((orjson.dumps(key) + b": ", item) for key, item in value.items)
+        opening, closing = b"{", b"}"
+    elif isinstance(value, t.JSONArray):
+        members = ((b"", item) for item in value.values)
+        opening, closing = b"[", b"]"
+    else:
+        yield _encode(value, level)
+        return
+    indent = b"\n" + b"  " * (level + 1)
+    separator = opening + indent
+    for prefix, item in members:
+        yield separator + prefix
+        yield from iter_json(item, level + 1)
+        separator = b"," + indent
+    if separator[:1] == opening:
+        yield opening + closing
+    else:
+        yield b"\n" + b"  " * level + closing
+
+
+async def stream_json(value: object, path: Path, buffer_size: int = 1 << 20) -> Path:
+    """
+    Write a value as indented JSON, encoding it as it is written.
+
+    Parameters
+    ----------
+    value : object
+        The value to write, see :func:`iter_json`.
+    path : Path
+        The file path to write to.
+    buffer_size : int, optional
+        Number of bytes buffered before each write (default: 1 MiB).
+
+    Returns
+    -------
+    Path
+        The path to the written file.
+    """
+    buffer: list[bytes] = []
+    size = 0
+    async with aiofiles.open(path, "wb") as f:
+        for chunk in iter_json(value):
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= buffer_size:
+                await f.write(b"".join(buffer))
+                buffer.clear()
+                size = 0
+        await f.write(b"".join(buffer))
+    return path
+
+
 async def csv_dump(data: dict | list, header: list[str], path: Path) -> Path:
     """
     Dump data to a CSV file.
@@ -167,6 +291,8 @@ def _sort_content_files(content: list[Path]) -> list[Path]:
     """
     Order content files numerically by filename.
 
+    Files not named after a number come last, sorted by name.
+
     Parameters
     ----------
     content : list[Path]
@@ -177,64 +303,270 @@ def _sort_content_files(content: list[Path]) -> list[Path]:
     list[Path]
         Sorted list of file paths.
     """
+    return sorted(content, key=lambda path: listing.content_sort_key(path.name))
 
-    def key(filepath: Path) -> str:
-        name, _ = filepath.name.split(".")
-        return f"{int(name):07d}"
-
-    result = sorted(content, key=lambda x: key(x))
-    return result
 
-
-def get_src_files(src: Path) -> t.SourceFiles:
+def get_src_files(src: Path, cache: bool = True) -> t.SourceFiles:
     """
     Return a ``SourceFiles`` object containing metadata and content files
     from a directory.
 
+    The listing is cached, and reused while no directory of ``src`` changes
+    (see :mod:`collective.transmute.utils.listing`).
+
     Parameters
     ----------
     src : Path
         The source directory to scan.
+    cache : bool
+        Use, and update, the listing cache.
 
     Returns
     -------
     SourceFiles
         An object containing lists of metadata and content files.
     """
-    metadata = []
-    content = []
-    for filepath in src.glob("**/*.json"):
-        filepath = filepath.resolve()
-        name = filepath.name
-        if name.startswith("export_") or name in ("errors.json", "paths.json"):
-            metadata.append(filepath)
-        else:
-            content.append(filepath)
-    content = _sort_content_files(content)
+    metadata, content = listing.list_src_files(src, cache=cache)
     return t.SourceFiles(metadata, content)
 
 
 async def json_reader(
     files: Iterable[Path],
+    prefetch: int = 0,
+    max_bytes: int = 0,
+    stats: t.ReaderStats | None = None,
+    blob_fields: Iterable[str] = (),
+    keep_data: bool = False,
 ) -> AsyncGenerator[tuple[str, t.PloneItem], None]:
     """
     Asynchronously read JSON files and yield filename and data.
 
+    With ``prefetch`` greater than zero, up to ``prefetch`` files are loaded ahead
+    by a thread pool, while files are still yielded in the order of ``files``.
+    Loading ahead stops while the loaded, but not yet yielded, files use more
+    than ``max_bytes`` (``0`` means no limit).
+
+    When ``blob_fields`` are given, the base64 payloads of these fields are not
+    loaded: they are replaced by ``BlobReference`` objects pointing to the source
+    file (see :mod:`collective.transmute.utils.blobs`). With ``keep_data``, the
+    references also keep the contents of the file read, so the payloads are then
+    read from memory.
+
     Parameters
     ----------
     files : Iterable[Path]
         Iterable of file paths to read.
+    prefetch : int, optional
+        Number of files to load ahead, by default 0.
+    max_bytes : int, optional
+        Maximum size of the files loaded ahead, by default 0.
+    stats : ReaderStats, optional
+        Object updated with prefetch hits and misses.
+    blob_fields : Iterable[str], optional
+        Names of the blob fields to keep in the source files, by default none.
+    keep_data : bool, optional
+        Keep the contents of the files in the blob references, by default False.
 
     Yields
     ------
     tuple[str, PloneItem]
         Filename and loaded JSON data.
     """
+    blob_fields = tuple(blob_fields)
+    if prefetch < 1:
+        source = _read_files(files)
+    else:
+        stats = stats if stats is not None else t.ReaderStats()
+        source = _prefetch_files(files, prefetch, max_bytes, stats)
+    async for filepath, data in source:
+        if blob_fields:
+            item = blob_utils.load_item(filepath, data, blob_fields, keep_data)
+        else:
+            item = orjson.loads(data)
+        yield filepath.name, item
+
+
+async def _read_files(
+    files: Iterable[Path],
+) -> AsyncGenerator[tuple[Path, bytes], None]:
+    """Read files, one at a time."""
     for filepath in files:
-        filename = filepath.name
         async with aiofiles.open(filepath, "rb") as f:
             data = await f.read()
-            yield filename, orjson.loads(data.decode("utf-8"))
+        yield filepath, data
+
+
+async def _prefetch_files(
+    files: Iterable[Path], prefetch: int, max_bytes: int, stats: t.ReaderStats
+) -> AsyncGenerator[tuple[Path, bytes], None]:
+    """Read files in order, loading up to ``prefetch`` files ahead."""
+    loop = asyncio.get_running_loop()
+    files_iter = iter(files)
+    pending: deque[tuple[Path, asyncio.Future[bytes]]] = deque()
+
+    def buffered() -> int:
+        return sum(len(f.result()) for _, f in pending if f.done())
+
+    with ThreadPoolExecutor(max_workers=prefetch) as executor:
+
+        def schedule() -> None:
+            while len(pending) < prefetch and not (
+                max_bytes and buffered() > max_bytes
+            ):
+                filepath = next(files_iter, None)
+                if filepath is None:
+                    return
+                future = loop.run_in_executor(executor, filepath.read_bytes)
+                pending.append((filepath, future))
+
+        schedule()
+        while pending:
+            filepath, future = pending.popleft()
+            if future.done():
+                stats.hits += 1
+            else:
+                stats.misses += 1
+            data = await future
+            schedule()
+            yield filepath, data
+
+
+class Base64Decoder:
+    """
+    Incremental base64 decoder.
+
+    Characters outside the base64 alphabet, like line breaks, are ignored, as
+    done by ``base64.b64decode``. Incomplete quanta are kept until the next call.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> decoder = Base64Decoder()
+        >>> decoder.decode(b"aGVsb") + decoder.decode(b"G8=") + decoder.flush()
+        b'hello'
+    """
+
+    def __init__(self):
+        self._carry = b""
+
+    def decode(self, raw: bytes) -> bytes:
+        """
+        Decode a chunk of base64 encoded data.
+
+        Parameters
+        ----------
+        raw : bytes
+            The next chunk of encoded data.
+
+        Returns
+        -------
+        bytes
+            The decoded data available so far.
+        """
+        chunk = self._carry + raw.translate(None, _NON_BASE64)
+        size = len(chunk) - len(chunk) % 4
+        self._carry = chunk[size:]
+        return binascii.a2b_base64(memoryview(chunk)[:size]) if size else b""
+
+    def flush(self) -> bytes:
+        """
+        Decode the remaining data.
+
+        Returns
+        -------
+        bytes
+            The decoded remaining data.
+        """
+        carry, self._carry = self._carry, b""
+        return binascii.a2b_base64(carry) if carry else b""
+
+
+def iter_base64_decode(data: str, chunk_size: int = BLOB_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Decode a base64 string in chunks.
+
+    Only ``chunk_size`` characters of ``data`` are encoded and decoded at a time.
+
+    Parameters
+    ----------
+    data : str
+        The base64 encoded data.
+    chunk_size : int, optional
+        Number of characters decoded at a time, by default ``BLOB_CHUNK_SIZE``.
+
+    Yields
+    ------
+    bytes
+        Decoded chunks of data.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> b"".join(iter_base64_decode("aGVsbG8=", chunk_size=3))
+        b'hello'
+    """
+    decoder = Base64Decoder()
+    for start in range(0, len(data), chunk_size):
+        if chunk := decoder.decode(data[start : start + chunk_size].encode("utf-8")):
+            yield chunk
+    if chunk := decoder.flush():
+        yield chunk
+
+
+async def _payload_chunks(
+    data: str | t.BlobReference, chunk_size: int = BLOB_CHUNK_SIZE
+) -> AsyncGenerator[bytes, None]:
+    """Yield chunks of a base64 payload, read from memory or from its source."""
+    if isinstance(data, str):
+        for start in range(0, len(data), chunk_size):
+            yield data[start : start + chunk_size].encode("utf-8")
+        return
+    async with aiofiles.open(data.path, "rb") as f:
+        await f.seek(data.offset)
+        remaining = data.length
+        while remaining > 0:
+            raw = await f.read(min(chunk_size, remaining))
+            if not raw:
+                break
+            remaining -= len(raw)
+            yield raw
+
+
+async def write_blob(filepath: Path, data: str | t.BlobReference) -> int:
+    """
+    Decode base64 data and write it, incrementally, to a file.
+
+    Payloads kept in their source file, as a ``BlobReference``, are streamed
+    from the source file. The peak resident set size of the process is logged
+    after each blob is written, to help tracking memory usage with large files.
+
+    Parameters
+    ----------
+    filepath : Path
+        The file to write.
+    data : str or BlobReference
+        The base64 encoded data, or a reference to it.
+
+    Returns
+    -------
+    int
+        Number of bytes written.
+    """
+    decoder = Base64Decoder()
+    size = 0
+    async with aiofiles.open(filepath, "wb") as f:
+        async for raw in _payload_chunks(data):
+            chunk = decoder.decode(raw)
+            size += len(chunk)
+            await f.write(chunk)
+        chunk = decoder.flush()
+        size += len(chunk)
+        await f.write(chunk)
+    rss = peak_rss() / (1024 * 1024)
+    get_logger().debug(f"Wrote blob {filepath} ({size} bytes), peak RSS {rss:.1f} MB")
+    return size
 
 
 async def export_blob(field: str, blob: dict, content_path: Path, item_id: str) -> dict:
@@ -259,17 +591,19 @@ async def export_blob(field: str, blob: dict, content_path: Path, item_id: str)
     """
     await makedirs(content_path / field, exist_ok=True)
     filename = blob["filename"] or item_id
-    data = b64decode(blob.pop("data").encode("utf-8"))
     filepath: Path = content_path / field / filename
-    async with aiofiles.open(filepath, "wb") as f:
-        await f.write(data)
+    await write_blob(filepath, blob.pop("data"))
     blob["blob_path"] = f"{filepath.relative_to(content_path.parent)}"
     return blob
 
 
-async def export_item(item: t.PloneItem, parent_folder: Path) -> t.ItemFiles:
+def prepare_item_export(item: t.PloneItem, parent_folder: Path) -> t.ItemExport:
     """
-    Export an item and its blobs to disk.
+    Prepare the export of an item, without writing anything to disk.
+
+    Blob payloads are removed from the item and the final paths of the data file
+    and blob files are computed, so the bookkeeping of the export is known before
+    the files are written.
 
     Parameters
     ----------
@@ -280,26 +614,79 @@ async def export_item(item: t.PloneItem, parent_folder: Path) -> t.ItemFiles:
 
     Returns
     -------
-    ItemFiles
-        An object containing the data file path and blob file paths.
+    ItemExport
+        The files created by the export, the data to write and the blob payloads.
     """
-    # Return blobs created here
     blob_files = []
+    blob_payloads = []
     uid = item.get("UID")
     item_id = item.get("id")
     content_folder = parent_folder / f"{uid}"
     data_path: Path = content_folder / "data.json"
     blobs = item.pop("_blob_files_", {}) or {}
-    for field, value in blobs.items():
-        blob = await export_blob(field, value, content_folder, item_id)
+    for field, blob in blobs.items():
+        filename = blob["filename"] or item_id
+        filepath: Path = content_folder / field / filename
+        blob_payloads.append((filepath, blob.pop("data")))
+        blob["blob_path"] = f"{filepath.relative_to(parent_folder)}"
         blob_files.append(blob["blob_path"])
         item[field] = blob
-    await makedirs(content_folder, exist_ok=True)
     # Remove internal keys
     item_dict = {key: value for key, value in item.items() if not key.startswith("_")}
-    async with aiofiles.open(data_path, "wb") as f:
-        await f.write(json_dumps(item_dict))
-    return t.ItemFiles(f"{data_path.relative_to(parent_folder)}", blob_files)
+    files = t.ItemFiles(f"{data_path.relative_to(parent_folder)}", blob_files)
+    return t.ItemExport(files, data_path, item_dict, blob_payloads)
+
+
+async def write_item_export(export: t.ItemExport) -> t.ItemFiles:
+    """
+    Write an item export, prepared by ``prepare_item_export``, to disk.
+
+    Blob payloads are removed from the export as they are written, so their
+    memory can be released before the next blob is decoded. The data file is not
+    written when ``export.write_data`` is false.
+
+    Parameters
+    ----------
+    export : ItemExport
+        The prepared item export.
+
+    Returns
+    -------
+    ItemFiles
+        An object containing the data file path and blob file paths.
+    """
+    blobs = export.blobs
+    while blobs:
+        filepath, payload = blobs.pop(0)
+        await makedirs(filepath.parent, exist_ok=True)
+        await write_blob(filepath, payload)
+        del payload
+    if not export.write_data:
+        return export.files
+    await makedirs(export.data_path.parent, exist_ok=True)
+    async with aiofiles.open(export.data_path, "wb") as f:
+        await f.write(json_dumps(export.data))
+    return export.files
+
+
+async def export_item(item: t.PloneItem, parent_folder: Path) -> t.ItemFiles:
+    """
+    Export an item and its blobs to disk.
+
+    Parameters
+    ----------
+    item : PloneItem
+        The item to export.
+    parent_folder : Path
+        The parent folder for the item.
+
+    Returns
+    -------
+    ItemFiles
+        An object containing the data file path and blob file paths.
+    """
+    export = prepare_item_export(item, parent_folder)
+    return await write_item_export(export)
 
 
 async def export_metadata(
@@ -311,6 +698,8 @@ async def export_metadata(
     """
     Export metadata to disk, including debug and relations files if needed.
 
+    Files are encoded while they are written, see :func:`stream_json`.
+
     Parameters
     ----------
     metadata : MetadataInfo
@@ -332,9 +721,8 @@ async def export_metadata(
         # Ensure parent directory exists
         parent = path.parent
         await makedirs(parent, exist_ok=True)
-        async with aiofiles.open(path, "wb") as f:
-            await f.write(json_dumps(data))
-            consoles.debug(f"Wrote {path}")
+        await stream_json(data, path)
+        consoles.debug(f"Wrote {path}")
     return path
 
 
@@ -0,0 +1,459 @@
+"""
+Source index for ``collective.transmute``.
+
+Planning shards, incremental runs, or a report only needs a few fields of each
+item, but reading them means parsing every content file of the export. The
+source index is an SQLite database, in the cache folder of
+``collective.transmute``, holding a summary of each content file: its size, the
+identifiers, type, review state and dates of its item, and the size of its blobs.
+
+The index is updated incrementally: only files whose size or modification time
+changed since the last update are read again, and rows of removed files are
+deleted. Base64 blob payloads are never decoded, only measured.
+"""
+
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from collective.transmute import _types as t
+from collective.transmute.utils import blobs as blob_utils
+from collective.transmute.utils.listing import RACY_NS
+from collective.transmute.utils.listing import cache_dir
+from collective.transmute.utils.listing import cache_key
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+import multiprocessing
+import orjson
+import os
+import sqlite3
+import time
+
+
+INDEX_VERSION = 1
+"""Version of the format of the source index."""
+
+INDEX_CHUNK_SIZE = 500
+"""Number of files read by a worker in a single task."""
+
+QUERY_CHUNK_SIZE = 500
+"""Number of files looked up in a single query."""
+
+_COLUMNS = (
+    "path",
+    "size",
+    "mtime_ns",
+    "uid",
+    "id",
+    "parent",
+    "type",
+    "review_state",
+    "created",
+    "modified",
+    "effective",
+    "title",
+    "workflow",
+    "layout",
+    "subjects",
+    "creators",
+    "blobs",
+)
+"""Columns of the ``items`` table, in the order of ``IndexEntry`` fields."""
+
+_JSON_COLUMNS = 3
+"""Number of trailing columns stored as JSON."""
+
+
+def index_path(root: Path) -> Path:
+    """
+    Return the path of the source index of an export.
+
+    Parameters
+    ----------
+    root : Path
+        The resolved export folder.
+
+    Returns
+    -------
+    Path
+        The path of the database file.
+    """
+    return cache_dir() / f"index-{cache_key(root)}.sqlite"
+
+
+def _text(value: Any) -> str | None:
+    """Return a value stored in a text column."""
+    if value is None or isinstance(value, str):
+        return value
+    return orjson.dumps(value).decode("utf-8")
+
+
+def _blob_size(data: bytes, blob: dict) -> int | None:
+    """Return the size, in bytes, of the decoded payload of a blob field."""
+    value = blob.get("data")
+    if isinstance(value, t.BlobReference):
+        end = value.offset + value.length
+        padding = data[max(end - 2, value.offset) : end].count(b"=")
+        return value.length * 3 // 4 - padding
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return None
+
+
+def item_entry(
+    item: t.PloneItem,
+    path: str = "",
+    size: int = 0,
+    mtime_ns: int = 0,
+    blobs: dict[str, int] | None = None,
+) -> t.IndexEntry:
+    """
+    Return the index entry of an item.
+
+    Parameters
+    ----------
+    item : PloneItem
+        The item, as read from its content file.
+    path : str, optional
+        Path of the content file, relative to the export folder.
+    size : int, optional
+        Size of the content file, in bytes.
+    mtime_ns : int, optional
+        Modification time of the content file.
+    blobs : dict[str, int] | None, optional
+        Size of the blob of each blob field.
+
+    Returns
+    -------
+    IndexEntry
+        The entry.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> item_entry({"@id": "http://localhost:8080/Plone/news", "UID": "a"})
+        IndexEntry(path='', ..., parent='http://localhost:8080/Plone', ...)
+    """
+    item_id = item.get("@id", "") or ""
+    parent = item.get("parent")
+    if isinstance(parent, dict) and parent.get("@id"):
+        parent_id = parent["@id"]
+    else:
+        parent_id = item_id.rpartition("/")[0]
+    workflow_history = item.get("workflow_history", {}) or {}
+    return t.IndexEntry(
+        path=path,
+        size=size,
+        mtime_ns=mtime_ns,
+        uid=item.get("UID", "") or "",
+        id=item_id,
+        parent=parent_id,
+        type=_text(item.get("@type")),
+        review_state=_text(item.get("review_state")),
+        created=_text(item.get("created")),
+        modified=_text(item.get("modified")),
+        effective=_text(item.get("effective")),
+        title=_text(item.get("title")),
+        workflow=next(iter(workflow_history), None),
+        layout=_text(item.get("layout")),
+        subjects=list(item.get("subjects", []) or []),
+        creators=list(item.get("creators", []) or []),
+        blobs=blobs or {},
+    )
+
+
+def _read_entry(
+    filepath: Path, path: str, field_names: tuple[str, ...], started: int
+) -> t.IndexEntry:
+    """Read the index entry of a content file."""
+    stat = os.stat(filepath)
+    data = filepath.read_bytes()
+    item = blob_utils.load_item(filepath, data, field_names)
+    blobs: dict[str, int] = {}
+    for name in field_names:
+        blob = item.get(name)
+        if isinstance(blob, dict) and (blob_size := _blob_size(data, blob)) is not None:
+            blobs[name] = blob_size
+    # Files modified right before the update are read again by the next one
+    mtime_ns = stat.st_mtime_ns if stat.st_mtime_ns < started - RACY_NS else -1
+    return item_entry(item, path, stat.st_size, mtime_ns, blobs)
+
+
+def _row(entry: t.IndexEntry) -> tuple:
+    values = [getattr(entry, column) for column in _COLUMNS]
+    for idx in range(len(values) - _JSON_COLUMNS, len(values)):
+        values[idx] = orjson.dumps(values[idx]).decode("utf-8")
+    return tuple(values)
+
+
+def _entry(row: Sequence[Any]) -> t.IndexEntry:
+    split = len(row) - _JSON_COLUMNS
+    values = [*row[:split], *(orjson.loads(value) for value in row[split:])]
+    return t.IndexEntry(*values)
+
+
+def _read_rows(
+    files: list[tuple[Path, str]], field_names: tuple[str, ...], started: int
+) -> list[tuple]:
+    """Read the rows of a chunk of content files, in a worker process."""
+    return [
+        _row(_read_entry(filepath, path, field_names, started))
+        for filepath, path in files
+    ]
+
+
+class SourceIndex:
+    """
+    Summary of the content files of an export, stored in an SQLite database.
+
+    The index is rebuilt from scratch when its format, the export folder, or the
+    blob fields change.
+
+    Parameters
+    ----------
+    root : Path
+        The resolved export folder.
+    field_names : Iterable[str], optional
+        Names of the blob fields, whose payloads are measured without being
+        parsed.
+    path : Path | None, optional
+        Path of the database file, defaulting to :func:`index_path`.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> with SourceIndex(root, ["file", "image"]) as index:
+        ...     stats = index.update(content_files)
+        ...     headers = index.headers(content_files)
+    """
+
+    def __init__(
+        self, root: Path, field_names: Iterable[str] = (), path: Path | None = None
+    ):
+        self.root = root
+        self.field_names = tuple(field_names)
+        self.path = path or index_path(root)
+        self._prefix = f"{root}{os.sep}"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._setup()
+
+    def _setup(self) -> None:
+        """Create the tables, dropping the items indexed with another setup."""
+        db = self._db
+        db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        config = orjson.dumps({
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "field_names": self.field_names,
+        }).decode("utf-8")
+        row = db.execute("SELECT value FROM meta WHERE key = 'config'").fetchone()
+        with db:
+            if row is None or row[0] != config:
+                db.execute("DROP TABLE IF EXISTS items")
+                db.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('config', ?)",
+                    (config,),
+                )
+            columns = ", ".join(
+                f"{column} INTEGER" if column in ("size", "mtime_ns") else column
+                for column in _COLUMNS[1:]
+            )
+            db.execute(
+                f"CREATE TABLE IF NOT EXISTS items (path TEXT PRIMARY KEY, {columns})"
+            )
+            for column in ("uid", "id", "parent"):
+                db.execute(
+                    f"CREATE INDEX IF NOT EXISTS items_{column} ON items ({column})"
+                )
+
+    def __enter__(self) -> "SourceIndex":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
+
+    def clear(self) -> None:
+        """Remove all entries, so the next update reads all files again."""
+        with self._db as db:
+            db.execute("DELETE FROM items")
+
+    def _key(self, filepath: Path) -> str:
+        """Return the key of a content file: its path relative to the export."""
+        path = str(filepath)
+        if path.startswith(self._prefix):
+            return path[len(self._prefix) :]
+        return os.path.relpath(path, self.root)
+
+    def _stale(
+        self, files: Sequence[Path], stats: t.IndexStats
+    ) -> tuple[list[tuple[Path, str]], list[str]]:
+        """Return the files to read again, and the keys of removed files."""
+        known = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self._db.execute(
+                "SELECT path, size, mtime_ns FROM items"
+            )
+        }
+        stale: list[tuple[Path, str]] = []
+        for filepath in files:
+            key = self._key(filepath)
+            previous = known.pop(key, None)
+            stat = os.stat(filepath)
+            if previous == (stat.st_size, stat.st_mtime_ns):
+                stats.unchanged += 1
+                continue
+            if previous is None:
+                stats.added += 1
+            else:
+                stats.updated += 1
+            stale.append((filepath, key))
+        stats.removed = len(known)
+        return stale, list(known)
+
+    def _read(self, stale: list[tuple[Path, str]], workers: int) -> Iterator[tuple]:
+        """Read the rows of the stale files, in a process pool with many workers."""
+        started = time.time_ns()
+        chunks = [
+            stale[idx : idx + INDEX_CHUNK_SIZE]
+            for idx in range(0, len(stale), INDEX_CHUNK_SIZE)
+        ]
+        if workers <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                yield from _read_rows(chunk, self.field_names, started)
+            return
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [
+                pool.submit(_read_rows, chunk, self.field_names, started)
+                for chunk in chunks
+            ]
+            for future in futures:
+                yield from future.result()
+
+    def update(self, files: Sequence[Path], workers: int = 1) -> t.IndexStats:
+        """
+        Update the index with the content files of the export.
+
+        Parameters
+        ----------
+        files : Sequence[Path]
+            All content files of the export. Rows of other files are deleted.
+        workers : int, optional
+            Number of worker processes reading the changed files.
+
+        Returns
+        -------
+        IndexStats
+            The number of added, updated, removed and unchanged files.
+        """
+        stats = t.IndexStats()
+        stale, removed = self._stale(files, stats)
+        placeholders = ", ".join("?" * len(_COLUMNS))
+        insert = f"INSERT OR REPLACE INTO items VALUES ({placeholders})"  # noqa: S608
+        with self._db as db:
+            db.executemany(
+                "DELETE FROM items WHERE path = ?", ((key,) for key in removed)
+            )
+            db.executemany(insert, self._read(stale, workers))
+        return stats
+
+    def _lookup(self, files: Sequence[Path], columns: str) -> Iterator[tuple]:
+        """Return the rows of the content files, in order."""
+        for idx in range(0, len(files), QUERY_CHUNK_SIZE):
+            chunk = files[idx : idx + QUERY_CHUNK_SIZE]
+            keys = [self._key(filepath) for filepath in chunk]
+            placeholders = ", ".join("?" * len(keys))
+            query = f"SELECT path, {columns} FROM items WHERE path IN ({placeholders})"  # noqa: S608
+            rows = {row[0]: row[1:] for row in self._db.execute(query, keys)}
+            for filepath, key in zip(chunk, keys, strict=True):
+                if (row := rows.get(key)) is None:
+                    raise KeyError(f"{filepath} is not in the source index")
+                yield row
+
+    def entries(self, files: Sequence[Path]) -> Iterator[t.IndexEntry]:
+        """
+        Return the entries of content files.
+
+        Parameters
+        ----------
+        files : Sequence[Path]
+            Content files, already in the index.
+
+        Yields
+        ------
+        IndexEntry
+            The entry of each file, in order.
+
+        Raises
+        ------
+        KeyError
+            If a file is not in the index.
+        """
+        columns = ", ".join(_COLUMNS)
+        for row in self._lookup(files, columns):
+            yield _entry(row)
+
+    def headers(self, files: Sequence[Path]) -> list[tuple[str, str]]:
+        """
+        Return the ``UID`` and ``@id`` of content files.
+
+        Parameters
+        ----------
+        files : Sequence[Path]
+            Content files, already in the index.
+
+        Returns
+        -------
+        list[tuple[str, str]]
+            ``(UID, @id)`` for each file, in the same order.
+
+        Raises
+        ------
+        KeyError
+            If a file is not in the index.
+        """
+        return [(uid, item_id) for uid, item_id in self._lookup(files, "uid, id")]
+
+
+def open_index(src: Path, settings: t.TransmuteSettings) -> SourceIndex:
+    """
+    Open the source index of an export.
+
+    Parameters
+    ----------
+    src : Path
+        The export folder.
+    settings : TransmuteSettings
+        The transmute settings object, with the blob fields in
+        ``steps.blobs.field_names``.
+
+    Returns
+    -------
+    SourceIndex
+        The source index, to be updated before use.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> with open_index(Path("export"), settings) as index:
+        ...     index.update(src_files.content)
+    """
+    blobs_settings: dict = settings.steps.get("blobs", {})
+    return SourceIndex(src.resolve(), blobs_settings.get("field_names", ()))
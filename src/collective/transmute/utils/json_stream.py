@@ -0,0 +1,131 @@
+"""
+Incremental JSON parsing for ``collective.transmute``.
+
+The metadata files of a ``collective.exportimport`` export (``export_*.json``) are
+a single JSON array, or object, that can grow to gigabytes on big sites. This
+module reads them in chunks and yields their top-level members one by one, so
+callers can build compact mappings from them without loading the whole document.
+
+Each chunk is cut at a comma and the members before it are parsed, at once, by
+``orjson``. A cut is only accepted if the members parse: a comma inside a string
+leaves the string open and a comma inside a nested value leaves its brackets
+unbalanced, so only commas separating top-level members are accepted.
+"""
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+
+CHUNK_SIZE = 1 << 20
+"""Number of bytes read from the file at once."""
+
+MAX_ATTEMPTS = 4
+"""Number of commas of a chunk tried as a cut before reading more data."""
+
+_BRACKETS = {b"[": b"]", b"{": b"}"}
+
+_WHITESPACE = b" \t\n\r"
+
+
+def _preceding(buffer: bytes, idx: int) -> bytes:
+    """Return the last non-whitespace byte before ``idx``."""
+    return buffer[max(idx - 64, 0) : idx].rstrip(_WHITESPACE)[-1:]
+
+
+def _parse(opening: bytes, data: bytes) -> list[tuple[str | None, Any]]:
+    """Parse top-level members, raising ``orjson.JSONDecodeError`` if invalid."""
+    value = orjson.loads(opening + data + _BRACKETS[opening])
+    if opening == b"{":
+        return list(value.items())
+    return [(None, item) for item in value]
+
+
+def _cut(
+    opening: bytes, buffer: bytes, hint: bytes
+) -> tuple[int, list[tuple[str | None, Any]]] | None:
+    """Return the last member separator of a buffer, and the members before it."""
+    end = len(buffer)
+    attempts = 0
+    while attempts < MAX_ATTEMPTS and (end := buffer.rfind(b",", 0, end)) > 0:
+        if hint and _preceding(buffer, end) != hint:
+            continue
+        attempts += 1
+        try:
+            return end, _parse(opening, buffer[:end])
+        except orjson.JSONDecodeError:
+            continue
+    return None
+
+
+def iter_json_file(
+    path: Path, chunk_size: int = CHUNK_SIZE
+) -> Iterator[tuple[str | None, Any]]:
+    """
+    Parse the members of the top-level JSON array, or object, of a file.
+
+    Only about one chunk of the file, and the members parsed from it, are kept in
+    memory. Members larger than a chunk are read whole.
+
+    Parameters
+    ----------
+    path : Path
+        The JSON file.
+    chunk_size : int, optional
+        Number of bytes read at once (default: 1 MiB).
+
+    Yields
+    ------
+    tuple[str | None, Any]
+        The key of the member (``None`` for array items) and its value.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a JSON array or object (``orjson.JSONDecodeError`` is
+        a subclass of it).
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> ordering = {
+        ...     item["uuid"]: item["order"]
+        ...     for _, item in iter_json_file(Path("export_ordering.json"))
+        ... }
+    """
+    chunk_size = max(chunk_size, 1)
+    with open(path, "rb") as fh:
+        buffer = fh.read(chunk_size).lstrip(_WHITESPACE)
+        while not buffer and (chunk := fh.read(chunk_size)):
+            buffer = chunk.lstrip(_WHITESPACE)
+        opening = buffer[:1]
+        if opening not in _BRACKETS:
+            raise ValueError(f"{path} is not a JSON array or object")
+        buffer = buffer[1:]
+        # Byte ending the last members, used to skip commas inside them
+        hint = b""
+        read_size = chunk_size
+        while chunk := fh.read(read_size):
+            buffer += chunk
+            result = _cut(opening, buffer, hint)
+            if result is None and hint:
+                result = _cut(opening, buffer, b"")
+            if result is None:
+                # No member ends in the buffer, read until its size doubles
+                read_size = len(buffer)
+                continue
+            end, members = result
+            hint = _preceding(buffer, end)
+            yield from members
+            buffer = buffer[end + 1 :]
+            read_size = chunk_size
+        buffer = buffer.rstrip(_WHITESPACE)
+        if buffer[-1:] != _BRACKETS[opening]:
+            raise ValueError(f"{path} is not a JSON array or object")
+        buffer = buffer[:-1]
+        if hint and not buffer.strip(_WHITESPACE):
+            raise ValueError(f"{path} has a trailing comma")
+        yield from _parse(opening, buffer)
@@ -0,0 +1,246 @@
+"""
+Source discovery for ``collective.transmute``.
+
+This module lists the JSON files of a ``collective.exportimport`` export with
+``os.scandir``, scanning the directories of each level of the tree in a thread
+pool. The listing is cached, with the modification time of every directory, so
+the next runs against an unchanged export only need to ``stat`` its directories.
+"""
+
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import hashlib
+import orjson
+import os
+import time
+
+
+CACHE_VERSION = 1
+"""Version of the format of the listing cache."""
+
+METADATA_FILES = ("errors.json", "paths.json")
+"""Names of metadata files without the ``export_`` prefix."""
+
+SCAN_WORKERS = min(8, os.cpu_count() or 1)
+"""Number of threads scanning directories."""
+
+RACY_NS = 2_000_000_000
+"""Folders modified this recently, in nanoseconds, are not cached.
+
+Some file systems update modification times with a coarse resolution, so a file
+added right after the listing could leave the time of its folder unchanged.
+"""
+
+
+def is_metadata_file(name: str) -> bool:
+    """
+    Check if a JSON file of an export holds metadata, instead of a content item.
+
+    Parameters
+    ----------
+    name : str
+        Name of the file.
+
+    Returns
+    -------
+    bool
+        ``True`` for metadata files.
+    """
+    return name.startswith("export_") or name in METADATA_FILES
+
+
+def content_sort_key(name: str) -> tuple[int, int, str]:
+    """
+    Return the sort key of a content file.
+
+    Files named after a number, like ``collective.exportimport`` writes them,
+    are sorted numerically. Other files come after them, sorted by name.
+
+    Parameters
+    ----------
+    name : str
+        Name, or relative path, of the file.
+
+    Returns
+    -------
+    tuple[int, int, str]
+        The sort key.
+    """
+    stem = os.path.basename(name).split(".", 1)[0]
+    if stem.isdigit():
+        return 0, int(stem), name
+    return 1, 0, name
+
+
+def cache_dir() -> Path:
+    """
+    Return the folder holding the listing caches.
+
+    Uses ``$XDG_CACHE_HOME/collective.transmute``, defaulting to
+    ``~/.cache/collective.transmute``.
+
+    Returns
+    -------
+    Path
+        The cache folder.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "collective.transmute"
+
+
+def cache_key(root: Path) -> str:
+    """
+    Return the key of the caches of an export, derived from its folder.
+
+    Parameters
+    ----------
+    root : Path
+        The resolved export folder.
+
+    Returns
+    -------
+    str
+        A hexadecimal digest of the folder path.
+    """
+    return hashlib.sha256(str(root).encode("utf-8")).hexdigest()[:32]
+
+
+def cache_path(root: Path) -> Path:
+    """
+    Return the path of the listing cache of an export.
+
+    Parameters
+    ----------
+    root : Path
+        The resolved export folder.
+
+    Returns
+    -------
+    Path
+        The path of the cache file.
+    """
+    return cache_dir() / f"listing-{cache_key(root)}.json"
+
+
+def _scan_dir(path: str) -> tuple[int, list[str], list[str]]:
+    """Return the modification time, JSON files and subfolders of a folder."""
+    mtime = os.stat(path).st_mtime_ns
+    files: list[str] = []
+    folders: list[str] = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                folders.append(entry.name)
+            elif entry.name.endswith(".json") and entry.is_file():
+                files.append(entry.name)
+    return mtime, files, folders
+
+
+def _walk(root: Path, pool: ThreadPoolExecutor) -> tuple[dict[str, int], list[str]]:
+    """Return the folders, with their modification time, and JSON files of a tree."""
+    folders: dict[str, int] = {}
+    files: list[str] = []
+    level = [""]
+    while level:
+        paths = [os.path.join(root, rel) for rel in level]
+        next_level: list[str] = []
+        for rel, (mtime, names, subfolders) in zip(
+            level, pool.map(_scan_dir, paths), strict=True
+        ):
+            folders[rel] = mtime
+            files.extend(os.path.join(rel, name) for name in names)
+            next_level.extend(os.path.join(rel, name) for name in subfolders)
+        level = next_level
+    return folders, files
+
+
+def _mtime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_cache(root: Path, pool: ThreadPoolExecutor) -> dict | None:
+    """Return the cached listing of an export, if no folder changed since."""
+    try:
+        data = orjson.loads(cache_path(root).read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return None
+    if data.get("root") != str(root):
+        return None
+    folders: dict[str, int] = data["folders"]
+    paths = [os.path.join(root, rel) for rel in folders]
+    if list(pool.map(_mtime, paths)) != list(folders.values()):
+        return None
+    return data
+
+
+def _save_cache(data: dict, root: Path) -> None:
+    """Write the listing cache, ignoring errors."""
+    path = cache_path(root)
+    tmp_path = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(orjson.dumps(data))
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+
+
+def _paths(root: Path, names: Iterable[str]) -> list[Path]:
+    return [root / name for name in names]
+
+
+def list_src_files(
+    src: Path, cache: bool = True, workers: int = SCAN_WORKERS
+) -> tuple[list[Path], list[Path]]:
+    """
+    List the metadata and content files of an export.
+
+    Parameters
+    ----------
+    src : Path
+        The export folder.
+    cache : bool
+        Use, and update, the listing cache of the export.
+    workers : int
+        Number of threads scanning folders.
+
+    Returns
+    -------
+    tuple[list[Path], list[Path]]
+        Metadata files, sorted by path, and content files, sorted with
+        :func:`content_sort_key`. Paths are inside the resolved ``src`` folder.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> metadata, content = list_src_files(Path("export"))
+    """
+    root = src.resolve()
+    started = time.time_ns()
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        data = _load_cache(root, pool) if cache else None
+        if data is None:
+            folders, files = _walk(root, pool)
+            metadata: list[str] = []
+            content: list[str] = []
+            for name in files:
+                is_metadata = is_metadata_file(os.path.basename(name))
+                (metadata if is_metadata else content).append(name)
+            data = {
+                "version": CACHE_VERSION,
+                "root": str(root),
+                "folders": folders,
+                "metadata": sorted(metadata),
+                "content": sorted(content, key=content_sort_key),
+            }
+            if cache and max(folders.values()) < started - RACY_NS:
+                _save_cache(data, root)
+    return _paths(root, data["metadata"]), _paths(root, data["content"])
@@ -3,13 +3,22 @@ Performance utilities for ``collective.transmute``.
 
 This module provides context managers and helpers for timing and reporting
 performance metrics during the transformation pipeline. Functions support
-logging execution times.
+logging execution times and memory usage.
 """
 
 from collective.transmute import _types as t
 from contextlib import contextmanager
 from datetime import datetime
 
+import sys
+
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # Not available on Windows
+    resource = None  # type: ignore[assignment]
+
 
 @contextmanager
 def report_time(title: str, consoles: t.ConsoleArea):
@@ -37,3 +46,26 @@ def report_time(title: str, consoles: t.ConsoleArea):
     finish = datetime.now()
     msg = f"{title} ended at {finish}\n{title} took {(finish - start).seconds} seconds"
     consoles.print_log(msg)
+
+
+def peak_rss() -> int:
+    """
+    Return the peak resident set size (RSS) of the current process.
+
+    Returns
+    -------
+    int
+        Peak RSS in bytes, or ``0`` if it is not available on this platform.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> peak_rss() > 0
+        True
+    """
+    if resource is None:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return usage if sys.platform == "darwin" else usage * 1024
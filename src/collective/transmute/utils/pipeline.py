@@ -7,11 +7,191 @@ transformation pipeline. Functions support pipeline extensibility
 and dynamic loading.
 """
 
+from collections.abc import Callable
+from collections.abc import Collection
+from collections.abc import Iterable
 from collective.transmute import _types as t
 from functools import cache
+from functools import wraps
 from importlib import import_module
 
 
+SYNC_STEP_ATTR = "__sync_step__"
+"""Attribute holding the function of a step declared with :func:`sync_step`."""
+
+STEP_FILTER_ATTR = "__step_filter__"
+"""Attribute holding the filter of a step declared with :func:`applies_to`."""
+
+HEADER_STEP_ATTR = "__header_step__"
+"""Attribute set on the steps declared with :func:`header_step`."""
+
+
+def sync_step(func: t.SyncPipelineStep) -> t.PipelineStep:
+    """
+    Declare a pipeline step as a synchronous, one-in one-out, function.
+
+    The decorated function receives an item and returns it, or ``None`` to drop
+    it. It cannot produce new items. The returned step is still an async
+    generator, so it can be used like any other step, but the pipeline calls the
+    function directly, and runs consecutive synchronous steps as a single call
+    per item.
+
+    Parameters
+    ----------
+    func : SyncPipelineStep
+        The function processing an item.
+
+    Returns
+    -------
+    PipelineStep
+        The pipeline step.
+
+    Example
+    -------
+    .. code-block:: python
+
+        @sync_step
+        def my_step(item, state, settings):
+            item["title"] = item["title"].strip()
+            return item
+    """
+
+    @wraps(func)
+    async def step(
+        item: t.PloneItem, state: t.PipelineState, settings: t.TransmuteSettings
+    ) -> t.PloneItemGenerator:
+        yield func(item, state, settings)
+
+    setattr(step, SYNC_STEP_ATTR, func)
+    return step
+
+
+def sync_function(step: t.PipelineStep) -> t.SyncPipelineStep | None:
+    """
+    Return the function of a step declared with :func:`sync_step`.
+
+    Parameters
+    ----------
+    step : PipelineStep
+        The pipeline step.
+
+    Returns
+    -------
+    SyncPipelineStep or None
+        The function, or ``None`` for async generator steps.
+    """
+    return getattr(step, SYNC_STEP_ATTR, None)
+
+
+def applies_to(
+    types: Collection[str]
+    | Callable[[t.TransmuteSettings], Collection[str]]
+    | None = None,
+    fields: Iterable[str] = (),
+) -> Callable[[t.PipelineStep], t.PipelineStep]:
+    """
+    Declare the items a pipeline step applies to.
+
+    A step applies to an item if the item ``@type`` is one of ``types``, or if the
+    item has one of ``fields``. The pipeline passes other items on without running
+    the step, and runs, for each type, a plan holding only the steps that may
+    apply to it. Only declare types and fields for which the step does nothing
+    else than passing the item on.
+
+    Parameters
+    ----------
+    types : Collection[str] or Callable, optional
+        Item types, or a function returning them from the settings.
+    fields : Iterable[str], optional
+        Item fields.
+
+    Returns
+    -------
+    Callable
+        Decorator setting the filter of a step.
+
+    Example
+    -------
+    .. code-block:: python
+
+        @applies_to(types=("Collection", "Topic"), fields=("query",))
+        async def my_step(item, state, settings):
+            ...
+    """
+    step_filter = t.StepFilter(types, frozenset(fields))
+
+    def decorator(step: t.PipelineStep) -> t.PipelineStep:
+        setattr(step, STEP_FILTER_ATTR, step_filter)
+        return step
+
+    return decorator
+
+
+def step_filter(step: t.PipelineStep) -> t.StepFilter | None:
+    """
+    Return the filter of a step declared with :func:`applies_to`.
+
+    Parameters
+    ----------
+    step : PipelineStep
+        The pipeline step.
+
+    Returns
+    -------
+    StepFilter or None
+        The filter, or ``None`` if the step applies to all items.
+    """
+    return getattr(step, STEP_FILTER_ATTR, None)
+
+
+def header_step(step: t.PipelineStep) -> t.PipelineStep:
+    """
+    Declare a pipeline step as only reading the header of items.
+
+    The header of an item is the item without the payloads of its blob fields.
+    The header steps at the start of a pipeline form its pre-filter: they run
+    before the payloads are loaded, so the items they drop are never fully
+    loaded. Only declare steps that neither read nor write blob payloads.
+
+    Parameters
+    ----------
+    step : PipelineStep
+        The pipeline step.
+
+    Returns
+    -------
+    PipelineStep
+        The same step, declared as a header step.
+
+    Example
+    -------
+    .. code-block:: python
+
+        @header_step
+        async def my_filter(item, state, settings):
+            yield item if item.get("language") == "en" else None
+    """
+    setattr(step, HEADER_STEP_ATTR, True)
+    return step
+
+
+def is_header_step(step: t.PipelineStep) -> bool:
+    """
+    Check if a step was declared with :func:`header_step`.
+
+    Parameters
+    ----------
+    step : PipelineStep
+        The pipeline step.
+
+    Returns
+    -------
+    bool
+        ``True`` for header steps.
+    """
+    return getattr(step, HEADER_STEP_ATTR, False)
+
+
 @cache
 def load_step(name: str) -> t.PipelineStep:
     """
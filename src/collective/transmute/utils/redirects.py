@@ -1,9 +1,12 @@
+from collections.abc import Iterable
+from collections.abc import Iterator
 from collective.transmute import _types as t
 from collective.transmute.settings import get_settings
 
 
 def initialize_redirects(
-    raw_redirects: dict[str, str], settings: t.TransmuteSettings | None = None
+    raw_redirects: dict[str, str] | Iterable[tuple[str, str]],
+    settings: t.TransmuteSettings | None = None,
 ) -> dict[str, str]:
     """
     Initialize and normalize a mapping of redirects for migration.
@@ -14,7 +17,8 @@ def initialize_redirects(
     destination root, ensuring all redirects are valid for the target site.
 
     Args:
-        raw_redirects (dict[str, str]): Raw mapping of source paths to target paths.
+        raw_redirects (dict[str, str] | Iterable[tuple[str, str]]): Raw mapping,
+            or pairs, of source paths to target paths.
         settings (TransmuteSettings | None): The transmute settings object. If
             `None`, the default settings will be used.
 
@@ -33,7 +37,9 @@ def initialize_redirects(
     src_root: str = site_root["src"]
     dest_root: str = site_root["dest"]
     same_root = src_root == dest_root
-    for src, dest in raw_redirects.items():
+    if isinstance(raw_redirects, dict):
+        raw_redirects = raw_redirects.items()
+    for src, dest in raw_redirects:
         if not same_root:
             if src.startswith(src_root):
                 src = src.replace(src_root, dest_root, 1)
@@ -70,6 +76,30 @@ def add_redirect(
     redirects[src] = dest
 
 
+def iter_redirects(
+    raw_redirects: dict[str, str], valid_paths: set[str]
+) -> Iterator[tuple[str, str]]:
+    """
+    Iterate over the redirects with valid destination paths, sorted by source.
+
+    Args:
+        raw_redirects (dict[str, str]):
+            Mapping of source paths to destination paths.
+        valid_paths (set[str]):
+            Set of valid internal destination paths. Should include site root prefix.
+
+    Yields:
+        tuple[str, str]:
+            Source and destination paths of the redirects kept.
+    """
+    for src in sorted(raw_redirects):
+        dst = raw_redirects[src]
+        is_internal = dst.startswith("/")
+        if is_internal and dst not in valid_paths:
+            continue
+        yield src, dst
+
+
 def filter_redirects(
     raw_redirects: dict[str, str], valid_paths: set[str]
 ) -> dict[str, str]:
@@ -92,12 +122,4 @@ def filter_redirects(
     Example:
         >>> filtered = filter_redirects(raw_redirects, valid_paths)
     """
-    redirects = {}
-    # Sort paths first
-    to_process = sorted(raw_redirects.items())
-    for src, dst in to_process:
-        is_internal = dst.startswith("/")
-        if is_internal and dst not in valid_paths:
-            continue
-        redirects[src] = dst
-    return redirects
+    return dict(iter_redirects(raw_redirects, valid_paths))
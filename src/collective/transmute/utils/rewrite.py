@@ -0,0 +1,311 @@
+"""
+Path rewrite rules for ``collective.transmute``.
+
+This module compiles, once per settings object, the rules applied to the ``@id``
+of every item: the removal of ``paths.export_prefixes``, the replacements of
+``paths.cleanup`` and the ``steps.paths.prefix_replacement`` prefixes.
+
+Rules are still applied one after the other, in the order of the settings, but
+only the rules matching a path are visited. Prefix rules are indexed by prefix
+length, like :class:`collective.transmute._types.PrefixSet`. Large sets of
+cleanup rules are matched with an Aho-Corasick automaton, whose state after the
+parent path of an item is cached, so only the last segment of each path is
+scanned.
+"""
+
+from collections import deque
+from collections.abc import Iterable
+from collections.abc import Sequence
+from collective.transmute import _types as t
+from functools import lru_cache
+from urllib import parse
+
+
+AUTOMATON_MIN_RULES = 16
+"""Number of cleanup rules from which they are matched with an automaton."""
+
+PARENT_CACHE_SIZE = 4096
+"""Number of parent paths whose automaton state is cached."""
+
+
+class _Automaton:
+    """Aho-Corasick automaton reporting which patterns occur in a text."""
+
+    def __init__(self, patterns: Sequence[str]):
+        goto: list[dict[str, int]] = [{}]
+        out: list[frozenset[int]] = [frozenset()]
+        for idx, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                if (next_node := goto[node].get(char)) is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    out.append(frozenset())
+                node = next_node
+            out[node] |= {idx}
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in goto[node].items():
+                queue.append(next_node)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[next_node] = goto[state].get(char, 0)
+                out[next_node] |= out[fail[next_node]]
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def scan(
+        self, text: str, node: int = 0, found: frozenset[int] = frozenset()
+    ) -> tuple[int, frozenset[int]]:
+        """
+        Scan a text, resuming from a state of the automaton.
+
+        Parameters
+        ----------
+        text : str
+            The text to scan.
+        node : int, optional
+            State of the automaton after the text preceding ``text``.
+        found : frozenset[int], optional
+            Patterns found in the text preceding ``text``.
+
+        Returns
+        -------
+        tuple[int, frozenset[int]]
+            The state of the automaton after ``text``, and the indexes of the
+            patterns found.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found |= out[node]
+        return node, found
+
+
+class PrefixRules:
+    """
+    Ordered rules applied to paths starting with a prefix.
+
+    Parameters
+    ----------
+    prefixes : Iterable[str]
+        The prefixes of the rules, in the order they are applied.
+    """
+
+    def __init__(self, prefixes: Iterable[str]):
+        self._index: dict[str, list[int]] = {}
+        for idx, prefix in enumerate(prefixes):
+            self._index.setdefault(prefix, []).append(idx)
+        self._lengths = sorted({len(prefix) for prefix in self._index})
+
+    def match(self, path: str, start: int = 0) -> int | None:
+        """
+        Return the first rule, from ``start``, whose prefix starts a path.
+
+        Parameters
+        ----------
+        path : str
+            The path.
+        start : int, optional
+            Index of the first rule to consider.
+
+        Returns
+        -------
+        int | None
+            The index of the rule, or ``None`` if no rule matches.
+        """
+        found: int | None = None
+        for length in self._lengths:
+            if length > len(path):
+                break
+            for idx in self._index.get(path[:length], ()):
+                if idx >= start:
+                    if found is None or idx < found:
+                        found = idx
+                    break
+        return found
+
+
+class ReplaceRules:
+    """
+    Ordered substring replacements, each applied to the whole path.
+
+    A rule is applied, like ``str.replace``, if its source occurs in the path left
+    by the previous rules.
+
+    Parameters
+    ----------
+    rules : Iterable[tuple[str, str]]
+        The ``(source, replacement)`` pairs, in the order they are applied.
+    """
+
+    def __init__(self, rules: Iterable[tuple[str, str]]):
+        self._rules = tuple(rules)
+        self._automaton: _Automaton | None = None
+        if len(self._rules) >= AUTOMATON_MIN_RULES and all(
+            src for src, _ in self._rules
+        ):
+            self._automaton = _Automaton([src for src, _ in self._rules])
+            self._scan_parent = lru_cache(maxsize=PARENT_CACHE_SIZE)(
+                self._automaton.scan
+            )
+
+    def apply(self, path: str) -> str:
+        """
+        Apply the rules to a path.
+
+        Parameters
+        ----------
+        path : str
+            The path.
+
+        Returns
+        -------
+        str
+            The rewritten path.
+        """
+        automaton = self._automaton
+        if automaton is None:
+            for src, rpl in self._rules:
+                if src in path:
+                    path = path.replace(src, rpl)
+            return path
+        # Siblings share their parent, only the last segment is scanned again
+        parent, sep, name = path.rpartition("/")
+        node, found = self._scan_parent(parent)
+        pending = sorted(automaton.scan(sep + name, node, found)[1])
+        while pending:
+            idx = pending[0]
+            src, rpl = self._rules[idx]
+            path = path.replace(src, rpl)
+            # The replacement may add, or remove, sources of the next rules
+            found = automaton.scan(path)[1]
+            pending = sorted(other for other in found if other > idx)
+        return path
+
+
+class PathRewriter:
+    """
+    Rewrite rules of item paths, compiled from the settings.
+
+    Parameters
+    ----------
+    settings : TransmuteSettings
+        The transmute settings object.
+
+    Example
+    -------
+    .. code-block:: pycon
+
+        >>> rewriter = get_path_rewriter(settings)
+        >>> rewriter.cleanup(rewriter.remove_export_prefixes(item["@id"]))
+    """
+
+    def __init__(self, settings: t.TransmuteSettings):
+        self._export_prefixes = tuple(settings.paths["export_prefixes"])
+        self._export_rules = PrefixRules(self._export_prefixes)
+        self._cleanup_rules = ReplaceRules(settings.paths["cleanup"].items())
+        self._prefixes: Sequence[tuple[str, str]] | None = None
+        self._prefix_rules = PrefixRules(())
+
+    def remove_export_prefixes(self, path: str) -> str:
+        """
+        Remove the export prefixes from a path.
+
+        Each prefix starting the path is removed, with all its occurrences.
+
+        Parameters
+        ----------
+        path : str
+            The ``@id`` of an item.
+
+        Returns
+        -------
+        str
+            The path without export prefixes.
+        """
+        rules = self._export_rules
+        idx = rules.match(path)
+        while idx is not None:
+            path = path.replace(self._export_prefixes[idx], "")
+            idx = rules.match(path, idx + 1)
+        return path
+
+    def cleanup(self, path: str) -> str:
+        """
+        Unquote a path, replace its spaces, and apply the ``paths.cleanup`` rules.
+
+        Parameters
+        ----------
+        path : str
+            The path.
+
+        Returns
+        -------
+        str
+            The cleaned up path.
+        """
+        path = parse.unquote(path).replace(" ", "_")
+        return self._cleanup_rules.apply(path)
+
+    def replace_prefixes(self, path: str, prefixes: Sequence[tuple[str, str]]) -> str:
+        """
+        Replace path prefixes, only matching full path segments.
+
+        Parameters
+        ----------
+        path : str
+            The path.
+        prefixes : Sequence[tuple[str, str]]
+            The ``(prefix, replacement)`` pairs, in the order they are applied.
+            Rules are compiled again when a different sequence is passed.
+
+        Returns
+        -------
+        str
+            The path with its prefixes replaced.
+        """
+        if prefixes is not self._prefixes:
+            self._prefixes = prefixes
+            self._prefix_rules = PrefixRules(prefix for prefix, _ in prefixes)
+        rules = self._prefix_rules
+        idx = rules.match(path)
+        while idx is not None:
+            prefix, replacement = prefixes[idx]
+            if path == prefix:
+                path = replacement
+            else:
+                path = path.replace(f"{prefix}/", f"{replacement}/", 1)
+            idx = rules.match(path, idx + 1)
+        return path
+
+
+_REWRITER: tuple[t.TransmuteSettings, PathRewriter] | None = None
+
+
+def get_path_rewriter(settings: t.TransmuteSettings) -> PathRewriter:
+    """
+    Return the path rewriter of a settings object, compiling it once.
+
+    Parameters
+    ----------
+    settings : TransmuteSettings
+        The transmute settings object.
+
+    Returns
+    -------
+    PathRewriter
+        The compiled rewrite rules.
+    """
+    global _REWRITER
+    if _REWRITER is None or _REWRITER[0] is not settings:
+        _REWRITER = (settings, PathRewriter(settings))
+    return _REWRITER[1]
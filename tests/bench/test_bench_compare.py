@@ -0,0 +1,61 @@
+from collective.transmute import _types as t
+from collective.transmute import bench
+
+import json
+import pytest
+
+
+def _result(elapsed: float, **phases: float) -> dict:
+    return {
+        "version": 1,
+        "items_per_second": round(100 / elapsed, 2),
+        "elapsed": elapsed,
+        "peak_rss": 1000,
+        "phases": phases,
+        "timings": [{"stage": "step", "step": "process_blocks", "total_s": 0.5}],
+    }
+
+
+@pytest.mark.parametrize(
+    "baseline,current,higher_is_better,expected",
+    [
+        (10.0, 10.5, False, False),
+        (10.0, 11.5, False, True),
+        (10.0, 5.0, False, False),
+        (100.0, 85.0, True, True),
+        (100.0, 150.0, True, False),
+        (0.0, 1.0, False, False),
+    ],
+)
+def test_comparison_regression(
+    baseline: float, current: float, higher_is_better: bool, expected: bool
+):
+    comparison = t.BenchComparison("metric", baseline, current, higher_is_better)
+    assert comparison.regression is expected
+
+
+def test_compare_results():
+    baseline = _result(1.0, process_items=0.8, post_process=0.01)
+    current = _result(2.0, process_items=1.6, post_process=0.04)
+    comparisons = {
+        item.metric: item for item in bench.compare_results(baseline, current)
+    }
+    assert list(comparisons) == [
+        "items_per_second",
+        "elapsed",
+        "peak_rss",
+        "phase:process_items",
+        "step:process_blocks",
+    ]
+    regressions = [metric for metric, item in comparisons.items() if item.regression]
+    assert regressions == ["items_per_second", "elapsed", "phase:process_items"]
+    assert comparisons["elapsed"].change == pytest.approx(1.0)
+
+
+def test_load_result(tmp_path):
+    path = tmp_path / "result.json"
+    path.write_text(json.dumps(_result(1.0)))
+    assert bench.load_result(path)["elapsed"] == 1.0
+    path.write_text(json.dumps({"version": 0}))
+    with pytest.raises(ValueError, match="not a supported benchmark result"):
+        bench.load_result(path)
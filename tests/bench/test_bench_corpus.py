@@ -0,0 +1,88 @@
+from collective.transmute import _types as t
+from collective.transmute import bench
+from collective.transmute.bench import corpus
+from collective.transmute.utils import files as file_utils
+from pathlib import Path
+
+import json
+import pytest
+
+
+@pytest.fixture
+def spec() -> t.BenchCorpus:
+    return t.BenchCorpus(items=60, depth=2, blob_size=64, seed=3)
+
+
+def _read_tree(path: Path) -> dict[str, bytes]:
+    return {
+        str(filepath.relative_to(path)): filepath.read_bytes()
+        for filepath in sorted(path.glob("**/*.json"))
+    }
+
+
+def test_generate_reproducible(tmp_path, spec):
+    first = bench.generate_corpus(tmp_path / "first", spec)
+    second = bench.generate_corpus(tmp_path / "second", spec)
+    assert first == second
+    assert _read_tree(tmp_path / "first") == _read_tree(tmp_path / "second")
+
+
+def test_generate_seed(tmp_path, spec):
+    bench.generate_corpus(tmp_path / "first", spec)
+    spec.seed = 4
+    bench.generate_corpus(tmp_path / "second", spec)
+    assert _read_tree(tmp_path / "first") != _read_tree(tmp_path / "second")
+
+
+def test_generate_files(tmp_path, spec):
+    counts = bench.generate_corpus(tmp_path, spec)
+    src_files = file_utils.get_src_files(tmp_path)
+    assert len(src_files.content) == spec.items == counts["items"]
+    names = sorted(path.name for path in src_files.metadata)
+    assert names == [
+        "export_bench_corpus.json",
+        "export_defaultpages.json",
+        "export_redirects.json",
+        "export_relations.json",
+    ]
+    assert bench.read_corpus(tmp_path) == {
+        "corpus": json.loads(json.dumps(spec.__dict__)),
+        "counts": counts,
+    }
+
+
+def test_generate_shape(tmp_path, spec):
+    bench.generate_corpus(tmp_path, spec)
+    items = [
+        json.loads(path.read_text())
+        for path in file_utils.get_src_files(tmp_path).content
+    ]
+    uids = {item["UID"] for item in items}
+    assert len(uids) == spec.items
+    root = f"{corpus.SITE_URL}/"
+    for item in items:
+        depth = item["@id"].removeprefix(root).count("/")
+        assert depth <= spec.depth
+        if blob := item.get("file") or item.get("image"):
+            assert len(blob["data"]) == 88
+    default_pages = json.loads((tmp_path / "export_defaultpages.json").read_text())
+    for entry in default_pages:
+        assert {entry["uuid"], entry["default_page_uuid"]} <= uids
+    relations = json.loads((tmp_path / "export_relations.json").read_text())
+    for entry in relations:
+        assert {entry["from_uuid"], entry["to_uuid"]} <= uids
+
+
+def test_generate_type_mix(tmp_path, spec):
+    spec.types = {"Folder": 1, "Collection": 1}
+    spec.uid_queries = 1.0
+    counts = bench.generate_corpus(tmp_path, spec)
+    assert counts["Folder"] + counts["Collection"] == spec.items
+    for path in file_utils.get_src_files(tmp_path).content:
+        item = json.loads(path.read_text())
+        paths = [entry["v"] for entry in item.get("query", []) if entry["i"] == "path"]
+        assert all(value.endswith("::-1") for value in paths)
+
+
+def test_read_corpus_missing(test_src):
+    assert bench.read_corpus(test_src) is None
@@ -0,0 +1,38 @@
+from collective.transmute import _types as t
+from collective.transmute import bench
+
+import pytest
+
+
+@pytest.fixture
+def corpus_src(tmp_path):
+    src = tmp_path / "corpus"
+    bench.generate_corpus(src, t.BenchCorpus(items=40, blob_size=32))
+    return src
+
+
+def test_run_benchmark(corpus_src, tmp_path, transmute_settings):
+    result = bench.run_benchmark(
+        corpus_src, tmp_path / "output", transmute_settings, repeat=3
+    )
+    assert result["version"] == bench.runner.RESULT_VERSION
+    assert result["corpus"] == bench.read_corpus(corpus_src)
+    assert result["items"] == 40
+    assert result["exported"] + result["dropped"] >= 40
+    assert len(result["runs"]) == 3
+    assert result["elapsed"] in result["runs"]
+    assert result["items_per_second"] > 0
+    assert result["peak_rss"] > 0
+    assert {"prepare_pipeline", "process_items", "other"} <= set(result["phases"])
+    steps = {(row["stage"], row["step"]) for row in result["timings"]}
+    assert ("step", "process_paths") in steps
+    # The settings object is not changed by the runs
+    assert not transmute_settings.paths["filter"]["drop"]
+    assert (tmp_path / "output" / "report_step_timings.json").exists()
+
+
+def test_run_benchmark_results_stable(corpus_src, tmp_path, transmute_settings):
+    first = bench.run_benchmark(corpus_src, tmp_path / "first", transmute_settings)
+    second = bench.run_benchmark(corpus_src, tmp_path / "second", transmute_settings)
+    keys = ("items", "exported", "dropped")
+    assert [first[key] for key in keys] == [second[key] for key in keys]
@@ -0,0 +1,50 @@
+from collective.transmute.cli import app
+from typer.testing import CliRunner
+
+import json
+
+
+runner = CliRunner()
+
+
+def test_bench(test_dir):
+    corpus = test_dir / "corpus"
+    args = ["bench", "generate", str(corpus), "--items", "20", "--blob-size", "16"]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+    assert "Generated a corpus of 20 items" in result.stdout
+    output = test_dir / "result.json"
+    args = ["bench", "run", str(corpus), "--output", str(output)]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+    assert "Processed 20 items" in result.stdout
+    assert json.loads(output.read_text())["items"] == 20
+    result = runner.invoke(app, ["bench", "compare", str(output), str(output)])
+    assert result.exit_code == 0
+    assert "No regressions found" in result.stdout
+
+
+def test_bench_compare_regression(test_dir):
+    baseline = {
+        "version": 1,
+        "items_per_second": 100.0,
+        "elapsed": 1.0,
+        "peak_rss": 1000,
+        "phases": {},
+        "timings": [],
+    }
+    current = {**baseline, "items_per_second": 50.0, "elapsed": 2.0}
+    paths = []
+    for name, data in (("baseline", baseline), ("current", current)):
+        path = test_dir / f"{name}.json"
+        path.write_text(json.dumps(data))
+        paths.append(str(path))
+    result = runner.invoke(app, ["bench", "compare", *paths])
+    assert result.exit_code == 1
+    assert "Found 2 regressions" in result.stdout
+
+
+def test_bench_generate_invalid_type(test_dir):
+    args = ["bench", "generate", str(test_dir / "corpus"), "--type", "Document"]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 2
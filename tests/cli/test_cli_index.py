@@ -0,0 +1,22 @@
+from collective.transmute.cli import app
+from typer.testing import CliRunner
+
+
+runner = CliRunner()
+
+
+def test_index(test_src):
+    args = ["index", str(test_src)]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0
+    assert " - Added: 5" in result.stdout
+    result = runner.invoke(app, [*args, "--rebuild"])
+    assert result.exit_code == 0
+    assert " - Added: 5" in result.stdout
+    assert " - Unchanged: 0" in result.stdout
+
+
+def test_index_missing_src(tmp_path):
+    result = runner.invoke(app, ["index", str(tmp_path / "missing")])
+    assert result.exit_code == 1
+    assert "does not exist" in result.stdout
@@ -106,3 +106,59 @@ class TestWriteTypeReport:
             assert len(rows) > 0
             for row in rows:
                 assert row["review_state"]
+
+
+class TestParallelReport:
+    """Tests for reports counted by a process pool."""
+
+    def test_same_report(self, monkeypatch, report_layout, src_files, tmp_path):
+        """A parallel report is identical to a serial one."""
+        from collective.transmute.commands import report
+
+        monkeypatch.setattr(report, "REPORT_CHUNK_SIZE", 2)
+        report_types = ["Folder", "Document"]
+        outputs = []
+        for workers in (1, 2):
+            dst = tmp_path / str(workers)
+            dst.mkdir()
+            state = report._create_state(report_layout, src_files.content)
+            asyncio.run(_create_report(dst, state, report_types, workers))
+            outputs.append({
+                path.name: path.read_bytes() for path in sorted(dst.iterdir())
+            })
+        assert outputs[0] == outputs[1]
+        assert set(outputs[0]) == {
+            "report-raw-data.json",
+            "report_Document.csv",
+            "report_Folder.csv",
+        }
+
+
+class TestIndexReport:
+    """Tests for reports counted from the source index."""
+
+    def test_same_report(self, report_layout, src_files, test_src, tmp_path):
+        """A report from the source index is identical to one from the files."""
+        from collective.transmute.commands import report
+        from collective.transmute.utils import index
+
+        report_types = ["Folder", "Document"]
+        outputs = []
+        with index.SourceIndex(test_src.resolve()) as source_index:
+            source_index.update(src_files.content)
+            for use_index in (False, True):
+                dst = tmp_path / str(use_index)
+                dst.mkdir()
+                state = report._create_state(report_layout, src_files.content)
+                asyncio.run(
+                    _create_report(
+                        dst,
+                        state,
+                        report_types,
+                        index=source_index if use_index else None,
+                    )
+                )
+                outputs.append({
+                    path.name: path.read_bytes() for path in sorted(dst.iterdir())
+                })
+        assert outputs[0] == outputs[1]
@@ -0,0 +1,39 @@
+from collective.transmute.cli import app
+from typer.testing import CliRunner
+
+import pytest
+
+
+runner = CliRunner()
+
+
+@pytest.mark.parametrize("option", [["--clean-up"], ["--workers", "2"]])
+def test_run_incremental_incompatible(test_src, test_dst, option: list[str]):
+    args = ["run", "--no-ui", "--incremental", *option, str(test_src), str(test_dst)]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 1
+    assert "--incremental cannot be used with" in result.stdout
+
+
+@pytest.mark.parametrize(
+    "option", [["--clean-up"], ["--incremental"], ["--workers", "2"]]
+)
+def test_run_resume_incompatible(test_src, test_dst, option: list[str]):
+    args = ["run", "--no-ui", "--resume", *option, str(test_src), str(test_dst)]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 1
+    assert "cannot be used with" in result.stdout
+
+
+@pytest.mark.parametrize("option", ["--incremental", "--resume"])
+def test_run_sqlite_store_incompatible(test_dir, test_src, test_dst, option: str):
+    config = test_dir / "transmute.toml"
+    config.write_text(
+        config.read_text().replace(
+            "report=1000\n", 'report=1000\nstate_store="sqlite"\n'
+        )
+    )
+    args = ["run", "--no-ui", option, str(test_src), str(test_dst)]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 1
+    assert 'cannot be used with state_store="sqlite"' in result.stdout
@@ -58,6 +58,14 @@ def test_dir(monkeypatch, tmp_path, transmute_config) -> Path:
     return tmp_path
 
 
+@pytest.fixture(autouse=True)
+def listing_cache(monkeypatch, tmp_path_factory) -> Path:
+    """Keep the source listing caches out of the user cache folder."""
+    path = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(path))
+    return path / "collective.transmute"
+
+
 @pytest.fixture
 def copy_transmute_config(test_dir):
     def func(filename: str) -> Path:
@@ -113,6 +121,7 @@ def pipeline_runner(
     def func(
         trasmute_config: str = "complete.toml",
         write_report: bool = False,
+        workers: int = 1,
     ) -> None:
         # Write transmute configuration
         copy_transmute_config(trasmute_config)
@@ -120,7 +129,9 @@ def pipeline_runner(
         consoles.no_ui = True
         app_layout.update_layout(pipeline_state)
         pipeline_state.write_report = write_report
-        asyncio.run(pipeline(src_files, test_dst, pipeline_state, consoles))
+        asyncio.run(
+            pipeline(src_files, test_dst, pipeline_state, consoles, workers=workers)
+        )
 
     return func
 
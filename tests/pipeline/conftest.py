@@ -0,0 +1,86 @@
+from collective.transmute import pipeline
+from pathlib import Path
+from typing import Any
+
+import asyncio
+import json
+import pytest
+import shutil
+
+
+def _normalize(value: Any) -> Any:
+    """Sort lists of strings, built from sets in some steps."""
+    if isinstance(value, dict):
+        return {key: _normalize(sub_value) for key, sub_value in value.items()}
+    if isinstance(value, list):
+        if all(isinstance(sub_value, str) for sub_value in value):
+            return sorted(value)
+        return [_normalize(sub_value) for sub_value in value]
+    return value
+
+
+def _read_item(path: Path) -> dict:
+    """Read an exported item, replacing the random block ids by their order."""
+    item = json.loads(path.read_text())
+    if layout := item.pop("blocks_layout", None):
+        blocks = item.pop("blocks")
+        item["blocks"] = [blocks[block_id] for block_id in layout["items"]]
+    return _normalize(item)
+
+
+@pytest.fixture
+def read_results():
+    """Read the results of a pipeline run, in a comparable form."""
+
+    def func(dst: Path) -> dict:
+        content = dst / "content"
+        metadata = json.loads((content / "__metadata__.json").read_text())
+        items = {
+            path.parent.name: _read_item(path) for path in content.glob("*/data.json")
+        }
+        return {
+            "metadata": metadata,
+            "items": items,
+            "redirects": json.loads((dst / "redirects.json").read_text()),
+            "relations": json.loads((dst / "relations.json").read_text()),
+        }
+
+    return func
+
+
+@pytest.fixture
+def export_src(tmp_path, test_src) -> Path:
+    src = tmp_path / "export"
+    shutil.copytree(test_src, src)
+    return src
+
+
+@pytest.fixture
+def processed_files(monkeypatch) -> list[str]:
+    """Record the names of the files processed by the pipeline steps."""
+    processed: list[str] = []
+    process_items = pipeline.process_items
+
+    async def func(steps, content_files, *args, **kwargs):
+        processed.extend(path.name for path in content_files)
+        return await process_items(steps, content_files, *args, **kwargs)
+
+    monkeypatch.setattr(pipeline, "process_items", func)
+    return processed
+
+
+@pytest.fixture
+def run_pipeline(app_layout, test_dst):
+    from collective.transmute.commands.transmute import _create_state
+    from collective.transmute.utils import files as file_utils
+
+    def func(src: Path, **kwargs):
+        src_files = file_utils.get_src_files(src)
+        state = _create_state(app_layout, total=len(src_files.content))
+        consoles = app_layout.consoles
+        consoles.no_ui = True
+        app_layout.update_layout(state)
+        asyncio.run(pipeline.pipeline(src_files, test_dst, state, consoles, **kwargs))
+        return state
+
+    return func
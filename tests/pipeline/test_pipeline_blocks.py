@@ -0,0 +1,48 @@
+from collective.transmute.utils import blocks
+
+
+def test_pipeline_blocks_workers(
+    monkeypatch, run_pipeline, read_results, export_src, test_dst
+):
+    """Blocks converted in a process pool are the same as inline ones."""
+    run_pipeline(export_src)
+    expected = read_results(test_dst)
+    converters = []
+    stop = blocks.BlocksConverter.stop
+
+    def func(self):
+        converters.append(self)
+        return stop(self)
+
+    monkeypatch.setattr(blocks.BlocksConverter, "stop", func)
+    config = test_dst.parent / "transmute.toml"
+    options = "blocks_workers=2\nblocks_cache=false\n"
+    config.write_text(
+        config.read_text().replace("report=1000\n", f"report=1000\n{options}")
+    )
+    run_pipeline(export_src)
+    assert read_results(test_dst) == expected
+    assert len(converters) == 1
+    assert converters[0].hits > 0
+
+
+def test_pipeline_blocks_cache(
+    run_pipeline, read_results, export_src, test_dst, listing_cache
+):
+    """A second run reuses the blocks converted by the first one."""
+    state = run_pipeline(export_src)
+    expected = read_results(test_dst)
+    assert state.blocks_cache.misses > 0
+    assert (listing_cache / blocks.CACHE_FILE).exists()
+    lookups = state.blocks_cache.hits + state.blocks_cache.misses
+    state = run_pipeline(export_src)
+    assert read_results(test_dst) == expected
+    assert (state.blocks_cache.hits, state.blocks_cache.misses) == (lookups, 0)
+
+
+def test_pipeline_blocks_cache_workers(run_pipeline, export_src):
+    """Shard workers share the blocks cache."""
+    state = run_pipeline(export_src)
+    lookups = state.blocks_cache.hits + state.blocks_cache.misses
+    state = run_pipeline(export_src, workers=2)
+    assert (state.blocks_cache.hits, state.blocks_cache.misses) == (lookups, 0)
@@ -0,0 +1,102 @@
+from collective.transmute.pipeline import checkpoint
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "interval,offset,positions",
+    [
+        (0, 0, []),
+        (2, 0, [1, 3]),
+        (2, 3, [0, 2, 4]),
+        (1, 0, [0, 1, 2, 3, 4]),
+    ],
+)
+def test_due(tmp_path, interval: int, offset: int, positions: list[int]):
+    checkpointer = checkpoint.Checkpointer(tmp_path, "abc", interval)
+    checkpointer.offset = offset
+    assert [pos for pos in range(5) if checkpointer.due(pos)] == positions
+
+
+def test_due_seconds(tmp_path):
+    checkpointer = checkpoint.Checkpointer(tmp_path, "abc", 1, seconds=60)
+    assert not checkpointer.due(0)
+    checkpointer.last_save -= 60
+    assert checkpointer.due(1)
+
+
+@pytest.fixture
+def checkpoint_interval(test_dir):
+    config = test_dir / "transmute.toml"
+    text = config.read_text()
+    text = text.replace(
+        "report=1000\n", "report=1000\ncheckpoint_interval=2\ncheckpoint_seconds=0\n"
+    )
+    config.write_text(text)
+
+
+@pytest.fixture
+def interrupt(monkeypatch) -> dict:
+    """Interrupt the run after the first checkpoint, while enabled."""
+    status = {"enabled": False}
+    save = checkpoint.Checkpointer.save
+
+    async def func(self, *args, **kwargs):
+        path = await save(self, *args, **kwargs)
+        if status["enabled"]:
+            raise RuntimeError("Interrupted")
+        return path
+
+    monkeypatch.setattr(checkpoint.Checkpointer, "save", func)
+    return status
+
+
+def test_resume(
+    checkpoint_interval,
+    interrupt,
+    run_pipeline,
+    read_results,
+    processed_files,
+    export_src,
+    test_dst,
+):
+    checkpoint_path = test_dst / checkpoint.CHECKPOINT_FILE
+    full_state = run_pipeline(export_src)
+    expected = read_results(test_dst)
+    assert not checkpoint_path.exists()
+
+    interrupt["enabled"] = True
+    with pytest.raises(RuntimeError, match="Interrupted"):
+        run_pipeline(export_src)
+    assert checkpoint_path.exists()
+
+    interrupt["enabled"] = False
+    processed_files.clear()
+    state = run_pipeline(export_src, resume=True)
+    assert processed_files == ["3.json", "4.json", "5.json"]
+    assert read_results(test_dst) == expected
+    assert (state.processed, state.total) == (full_state.processed, full_state.total)
+    assert state.exported == full_state.exported
+    assert state.dropped == full_state.dropped
+    assert not checkpoint_path.exists()
+
+
+def test_resume_without_checkpoint(
+    checkpoint_interval, run_pipeline, processed_files, export_src
+):
+    run_pipeline(export_src, resume=True)
+    assert len(processed_files) == 5
+
+
+def test_resume_changed_settings(
+    checkpoint_interval, interrupt, run_pipeline, processed_files, export_src, test_dir
+):
+    interrupt["enabled"] = True
+    with pytest.raises(RuntimeError, match="Interrupted"):
+        run_pipeline(export_src)
+    interrupt["enabled"] = False
+    config = test_dir / "transmute.toml"
+    config.write_text(config.read_text().replace("keep = false", "keep = true"))
+    processed_files.clear()
+    run_pipeline(export_src, resume=True)
+    assert len(processed_files) == 5
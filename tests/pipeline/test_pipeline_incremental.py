@@ -0,0 +1,156 @@
+from collective.transmute.pipeline import incremental
+from pathlib import Path
+
+import json
+import pytest
+import shutil
+
+
+@pytest.mark.parametrize(
+    "rerun,expected",
+    [
+        ([], []),
+        ([True], [(True, 0, 1)]),
+        ([False, False, True], [(False, 0, 2), (True, 2, 3)]),
+        ([True, False, True], [(True, 0, 1), (False, 1, 2), (True, 2, 3)]),
+    ],
+)
+def test_segments(rerun: list[bool], expected: list):
+    assert incremental._segments(rerun) == expected
+
+
+def test_types_hash(transmute_settings):
+    first = incremental.types_hash(transmute_settings, ["Folder", "Topic"])
+    assert first == incremental.types_hash(transmute_settings, ["Topic", "Folder"])
+    transmute_settings.types["Topic"] = {"portal_type": "Document"}
+    assert first != incremental.types_hash(transmute_settings, ["Folder", "Topic"])
+
+
+def _change_title(path: Path):
+    data = json.loads(path.read_text())
+    data["title"] = f"{data['title']} (changed)"
+    path.write_text(json.dumps(data, indent=4))
+
+
+def test_manifest_written(run_pipeline, export_src, test_dst):
+    manifest_path = test_dst / incremental.MANIFEST_FILE
+    run_pipeline(export_src, incremental=True)
+    manifest = json.loads(manifest_path.read_text())
+    assert manifest["version"] == incremental.MANIFEST_VERSION
+    assert len(manifest["files"]) == 5
+    # A full run removes the manifest
+    run_pipeline(export_src)
+    assert not manifest_path.exists()
+
+
+def test_unchanged_files_replayed(
+    run_pipeline, read_results, processed_files, export_src, test_dst
+):
+    full_state = run_pipeline(export_src)
+    expected = read_results(test_dst)
+    run_pipeline(export_src, incremental=True)
+    processed_files.clear()
+    state = run_pipeline(export_src, incremental=True)
+    # Items scheduled for post-processing are always processed again
+    assert processed_files == ["4.json"]
+    assert read_results(test_dst) == expected
+    assert (state.processed, state.total) == (full_state.processed, full_state.total)
+    assert state.exported == full_state.exported
+    assert state.dropped == full_state.dropped
+
+
+@pytest.mark.parametrize(
+    "filename,expected",
+    [
+        # Leaf item
+        ("4.json", ["4.json"]),
+        # Folder and its children
+        ("3.json", ["3.json", "4.json", "5.json"]),
+        # Default page of my-folder, processed with its parent and descendants
+        ("2.json", ["1.json", "2.json", "3.json", "4.json", "5.json"]),
+    ],
+)
+def test_changed_files_processed(
+    run_pipeline,
+    read_results,
+    processed_files,
+    export_src,
+    test_dst,
+    filename: str,
+    expected: list[str],
+):
+    run_pipeline(export_src, incremental=True)
+    _change_title(export_src / "Plone" / filename)
+    processed_files.clear()
+    run_pipeline(export_src, incremental=True)
+    assert sorted(processed_files) == expected
+    result = read_results(test_dst)
+    # Compare with a full run
+    shutil.rmtree(test_dst / "content")
+    (test_dst / "content").mkdir()
+    run_pipeline(export_src)
+    assert result == read_results(test_dst)
+
+
+def test_changed_type_settings(run_pipeline, processed_files, export_src, test_dir):
+    run_pipeline(export_src, incremental=True)
+    config = test_dir / "transmute.toml"
+    text = config.read_text()
+    config.write_text(
+        text.replace("[types.Topic]\n", '[types.Topic]\nblocks=[{"@type"= "title"}]\n')
+    )
+    processed_files.clear()
+    run_pipeline(export_src, incremental=True)
+    assert sorted(processed_files) == ["4.json", "5.json"]
+
+
+def test_changed_files_headers(monkeypatch, run_pipeline, processed_files, export_src):
+    """Changed files are identified from the headers of the source index."""
+    from collective.transmute.pipeline import shards
+    from collective.transmute.utils import files as file_utils
+    from collective.transmute.utils import index
+
+    run_pipeline(export_src, incremental=True)
+    _change_title(export_src / "Plone" / "3.json")
+    content = file_utils.get_src_files(export_src).content
+    with index.SourceIndex(export_src.resolve()) as source_index:
+        source_index.update(content)
+        headers = source_index.headers(content)
+
+    def func(files):
+        raise AssertionError("Content files scanned")
+
+    monkeypatch.setattr(shards, "_scan_files", func)
+    processed_files.clear()
+    run_pipeline(export_src, incremental=True, headers=headers)
+    assert sorted(processed_files) == ["3.json", "4.json", "5.json"]
+
+
+def test_dropped_folder_string_prefix(
+    run_pipeline, read_results, processed_files, export_src, test_dst
+):
+    """Siblings matching the path of a dropped folder as a string are processed."""
+    sibling = json.loads((export_src / "Plone" / "2.json").read_text())
+    sibling.update({
+        "@id": "http://localhost:8080/Plone/my-folder/my-subfolder-news",
+        "UID": "6d0d4d3a0c8e4c3c9b3f6a2a8e2c7f01",
+        "id": "my-subfolder-news",
+    })
+    (export_src / "Plone" / "6.json").write_text(json.dumps(sibling, indent=4))
+    run_pipeline(export_src, incremental=True)
+    assert sibling["UID"] in read_results(test_dst)["items"]
+    folder = export_src / "Plone" / "3.json"
+    data = json.loads(folder.read_text())
+    data["review_state"] = "private"
+    folder.write_text(json.dumps(data, indent=4))
+    processed_files.clear()
+    state = run_pipeline(export_src, incremental=True)
+    assert "6.json" in processed_files
+    result = read_results(test_dst)
+    assert sibling["UID"] not in result["items"]
+    # Compare with a full run
+    shutil.rmtree(test_dst / "content")
+    (test_dst / "content").mkdir()
+    full_state = run_pipeline(export_src)
+    assert result == read_results(test_dst)
+    assert state.dropped == full_state.dropped
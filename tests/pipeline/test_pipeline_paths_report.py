@@ -0,0 +1,210 @@
+from collective.transmute import _types as t
+from collective.transmute.pipeline import checkpoint
+from collective.transmute.reports import paths
+
+import csv
+import gzip
+import pickle
+import pytest
+
+
+def _report(idx: int, dropped: bool = False) -> dict:
+    return {
+        "filename": f"{idx}.json",
+        "src_path": f"/Plone/item-{idx}",
+        "src_uid": None if dropped else f"uid-{idx}",
+        "src_type": "Document",
+        "src_state": "published",
+        "dst_path": "--" if dropped else f"/item-{idx}",
+        "dst_uid": "--" if dropped else f"uid-{idx}",
+        "dst_type": "--" if dropped else "Document",
+        "dst_state": "--" if dropped else "published",
+        "last_step": "process_paths",
+        "status": "dropped" if dropped else "processed",
+        "src_level": 1,
+        "dst_level": "--" if dropped else 0,
+        "src_workflow": "",
+        "dst_workflow": "--",
+    }
+
+
+@pytest.fixture
+def reports() -> list[dict]:
+    return [_report(idx, dropped=idx % 3 == 0) for idx in range(10)]
+
+
+def test_path_transforms(reports):
+    transforms = t.PathTransforms(reports)
+    assert len(transforms) == transforms.total == 10
+    assert list(transforms) == reports
+    assert list(transforms.rows(8)) == reports[8:]
+    # Repeated values are interned
+    assert len(transforms._strings) < 15
+    rows = transforms.take()
+    assert rows[0] == tuple(reports[0].values())
+    assert (len(transforms), transforms.total) == (0, 10)
+    transforms.append(reports[0])
+    assert list(transforms.rows(10)) == reports[:1]
+    with pytest.raises(IndexError):
+        list(transforms.rows(5))
+
+
+def test_path_transforms_pickle(tmp_path, reports):
+    transforms = t.PathTransforms(reports)
+    paths.PathsReportSpool(tmp_path / paths.REPORT_FILE, transforms)
+    assert transforms.sink is not None
+    data = pickle.loads(pickle.dumps(transforms))  # noqa: S301
+    assert data.sink is None
+    assert list(data) == reports
+
+
+def _read(path) -> list[dict]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", newline="") as fh:
+        return list(csv.DictReader(fh))
+
+
+def _as_csv(reports: list[dict]) -> list[dict]:
+    return [
+        {key: "" if value is None else str(value) for key, value in report.items()}
+        for report in reports
+    ]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_spool(tmp_path, reports, compress: bool):
+    report_path = tmp_path / f"{paths.REPORT_FILE}{'.gz' if compress else ''}"
+    transforms = t.PathTransforms()
+    spool = paths.PathsReportSpool(
+        report_path, transforms, chunk_size=3, compress=compress
+    )
+    transforms.extend(reports[:5])
+    # Full chunks are written
+    assert (len(transforms), transforms.spilled) == (2, 3)
+    transforms.append(reports[5])
+    transforms.spill()
+    assert len(transforms) == 0
+    transforms.extend(reports[6:])
+    assert spool._finish() == report_path
+    assert not spool.spool_path.exists()
+    assert transforms.sink is None
+    assert _read(report_path) == _as_csv(reports)
+
+
+def test_spool_resume(tmp_path, reports):
+    """A spool opened from a pickled state drops the rows written after it."""
+    report_path = tmp_path / paths.REPORT_FILE
+    transforms = t.PathTransforms()
+    spool = paths.PathsReportSpool(report_path, transforms, chunk_size=2)
+    transforms.extend(reports[:5])
+    snapshot = pickle.dumps(transforms)
+    transforms.extend(reports[5:])
+    spool.close()
+
+    transforms = pickle.loads(snapshot)  # noqa: S301
+    spool = paths.PathsReportSpool(report_path, transforms, chunk_size=2)
+    transforms.extend(reports[5:])
+    spool._finish()
+    assert _read(report_path) == _as_csv(reports)
+
+
+def test_spool_missing(tmp_path, reports):
+    """A spool restored from a checkpoint must hold the rows written before it."""
+    report_path = tmp_path / paths.REPORT_FILE
+    transforms = t.PathTransforms()
+    spool = paths.PathsReportSpool(report_path, transforms, chunk_size=2)
+    transforms.extend(reports)
+    spool.discard()
+    with pytest.raises(RuntimeError, match="missing or shorter"):
+        paths.PathsReportSpool(report_path, transforms, chunk_size=2)
+
+
+@pytest.fixture
+def report_config(test_dir):
+    def func(options: str):
+        config = test_dir / "transmute.toml"
+        text = config.read_text().replace("report=1000\n", f"report=1000\n{options}")
+        config.write_text(text)
+
+    return func
+
+
+def test_pipeline_chunks(report_config, run_pipeline, export_src, test_dir):
+    report_path = test_dir / paths.REPORT_FILE
+    run_pipeline(export_src)
+    expected = report_path.read_text()
+    report_path.unlink()
+    report_config("paths_report_chunk_size=1\n")
+    state = run_pipeline(export_src)
+    assert report_path.read_text() == expected
+    assert state.path_transforms.spilled == state.path_transforms.total
+    assert not list(test_dir.rglob(f"*{paths.SPOOL_SUFFIX}"))
+
+
+def test_pipeline_compress(report_config, run_pipeline, export_src, test_dir):
+    run_pipeline(export_src)
+    expected = _read(test_dir / paths.REPORT_FILE)
+    report_config("paths_report_compress=true\n")
+    run_pipeline(export_src)
+    assert _read(test_dir / f"{paths.REPORT_FILE}.gz") == expected
+
+
+def test_pipeline_resume(
+    monkeypatch, report_config, run_pipeline, export_src, test_dir
+):
+    report_path = test_dir / paths.REPORT_FILE
+    run_pipeline(export_src)
+    expected = report_path.read_text()
+    report_path.unlink()
+    report_config(
+        "checkpoint_interval=2\ncheckpoint_seconds=0\npaths_report_chunk_size=1\n"
+    )
+    calls = []
+    save = checkpoint.Checkpointer.save
+
+    def func(self, *args, **kwargs):
+        calls.append(args)
+        if len(calls) > 1:
+            # Interrupted after rows were written past the first checkpoint
+            raise RuntimeError("Interrupted")
+        return save(self, *args, **kwargs)
+
+    monkeypatch.setattr(checkpoint.Checkpointer, "save", func)
+    with pytest.raises(RuntimeError, match="Interrupted"):
+        run_pipeline(export_src)
+    assert not report_path.exists()
+
+    monkeypatch.setattr(checkpoint.Checkpointer, "save", save)
+    run_pipeline(export_src, resume=True)
+    assert report_path.read_text() == expected
+
+
+def test_pipeline_resume_spool_missing(
+    monkeypatch, report_config, run_pipeline, processed_files, export_src, test_dst
+):
+    """Without the spool of the paths report, the checkpoint is not used."""
+    report_path = test_dst.parent / paths.REPORT_FILE
+    run_pipeline(export_src)
+    expected = report_path.read_text()
+    report_path.unlink()
+    report_config(
+        "checkpoint_interval=2\ncheckpoint_seconds=0\npaths_report_chunk_size=1\n"
+    )
+    save = checkpoint.Checkpointer.save
+
+    async def func(self, *args, **kwargs):
+        await save(self, *args, **kwargs)
+        raise RuntimeError("Interrupted")
+
+    monkeypatch.setattr(checkpoint.Checkpointer, "save", func)
+    with pytest.raises(RuntimeError, match="Interrupted"):
+        run_pipeline(export_src)
+    spool = test_dst / f"{paths.REPORT_FILE}{paths.SPOOL_SUFFIX}"
+    assert (test_dst / checkpoint.CHECKPOINT_FILE).exists()
+    spool.unlink()
+
+    monkeypatch.setattr(checkpoint.Checkpointer, "save", save)
+    processed_files.clear()
+    run_pipeline(export_src, resume=True)
+    assert len(processed_files) == 5
+    assert report_path.read_text() == expected
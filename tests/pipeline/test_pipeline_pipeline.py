@@ -1,4 +1,10 @@
+from collective.transmute import _types as t
+from collective.transmute.pipeline.pipeline import StepPlanner
 from collective.transmute.pipeline.pipeline import _add_to_drop
+from collective.transmute.pipeline.pipeline import run_pipeline
+from collective.transmute.utils import applies_to
+from collective.transmute.utils import header_step
+from collective.transmute.utils import sync_step
 
 import pytest
 
@@ -34,3 +40,208 @@ def test__add_to_drop(settings_factory, path, overrides, expected):
     func = _add_to_drop
     func(path, settings)
     assert (path in settings.paths["filter"]["drop"]) is expected
+
+
+@sync_step
+def upper_title(
+    item: t.PloneItem, state: t.PipelineState, settings: t.TransmuteSettings
+) -> t.PloneItem:
+    item["title"] = item["title"].upper()
+    return item
+
+
+@sync_step
+def drop_private(
+    item: t.PloneItem, state: t.PipelineState, settings: t.TransmuteSettings
+) -> t.PloneItem | None:
+    return None if item.get("review_state") == "private" else item
+
+
+@header_step
+@sync_step
+def strip_title(
+    item: t.PloneItem, state: t.PipelineState, settings: t.TransmuteSettings
+) -> t.PloneItem:
+    item["title"] = item["title"].strip()
+    return item
+
+
+async def add_suffix(
+    item: t.PloneItem, state: t.PipelineState, settings: t.TransmuteSettings
+) -> t.PloneItemGenerator:
+    item["title"] = f"{item['title']}!"
+    yield item
+
+
+def _item(**kwargs) -> dict:
+    return {"@id": "/foo", "UID": "abc", "title": "foo", **kwargs}
+
+
+async def test_sync_step_is_a_step(pipeline_state, transmute_settings):
+    """Steps declared with sync_step can still be iterated."""
+    results = [
+        item async for item in upper_title(_item(), pipeline_state, transmute_settings)
+    ]
+    assert results == [_item(title="FOO")]
+
+
+@pytest.mark.parametrize(
+    "item,expected",
+    [
+        (_item(), [(_item(title="FOO!"), "add_suffix", False)]),
+        (_item(review_state="private"), [(None, "drop_private", False)]),
+    ],
+)
+async def test_run_pipeline_fused(
+    app_layout, pipeline_state, transmute_settings, item, expected
+):
+    steps = (upper_title, drop_private, add_suffix)
+    results = [
+        result
+        async for result in run_pipeline(
+            steps, item, pipeline_state, app_layout.consoles, transmute_settings
+        )
+    ]
+    assert results == expected
+    timings = pipeline_state.timings.steps
+    assert timings["step", "upper_title"].calls == 1
+    assert timings["step", "drop_private"].dropped == int(results[0][0] is None)
+
+
+async def test_run_pipeline_fused_drop_children(
+    app_layout, pipeline_state, transmute_settings
+):
+    """A folderish item dropped by a synchronous step drops its children."""
+    item = _item(review_state="private", is_folderish=True)
+    steps = (drop_private,)
+    async for _ in run_pipeline(
+        steps, item, pipeline_state, app_layout.consoles, transmute_settings
+    ):
+        pass
+    assert "/foo" in transmute_settings.paths["filter"]["drop"]
+
+
+@applies_to(types=("Document",))
+@sync_step
+def document_only(
+    item: t.PloneItem, state: t.PipelineState, settings: t.TransmuteSettings
+) -> t.PloneItem:
+    item["steps"] = [*item.get("steps", []), "document_only"]
+    return item
+
+
+@applies_to(types=lambda settings: ("News Item",), fields=("text",))
+async def news_or_text(
+    item: t.PloneItem, state: t.PipelineState, settings: t.TransmuteSettings
+) -> t.PloneItemGenerator:
+    item["steps"] = [*item.get("steps", []), "news_or_text"]
+    yield item
+
+
+@sync_step
+def to_document(
+    item: t.PloneItem, state: t.PipelineState, settings: t.TransmuteSettings
+) -> t.PloneItem:
+    item["@type"] = "Document"
+    return item
+
+
+def test_step_planner(transmute_settings):
+    steps = (upper_title, document_only, news_or_text, add_suffix)
+    planner = StepPlanner(steps, transmute_settings)
+    assert planner.filtered
+    fused, guarded, last = planner.plan("File").entries
+    assert fused.names == ("upper_title",)
+    assert (guarded.step, guarded.guard) == (news_or_text, {"text"})
+    assert (last.step, last.guard) == (add_suffix, frozenset())
+    plan = planner.plan("News Item", start=1)
+    assert [(entry.step, entry.guard) for entry in plan.entries] == [
+        (news_or_text, frozenset()),
+        (add_suffix, frozenset()),
+    ]
+    assert planner.plan("Document").entries[0].names == (
+        "upper_title",
+        "document_only",
+    )
+    assert planner.plan("File") is planner.plan("File")
+    disabled = StepPlanner(steps, transmute_settings, enabled=False)
+    assert not disabled.filtered
+    assert len(disabled.plan("File").entries) == 3
+
+
+def test_step_planner_prefilter(transmute_settings):
+    """Fused steps are split at the end of the pre-filter."""
+    steps = (strip_title, drop_private, add_suffix)
+    planner = StepPlanner(
+        steps, transmute_settings, prefilter=True, payload_fields=("file",)
+    )
+    assert planner.header == 1
+    assert planner.payload_fields == ("file",)
+    first, second, _ = planner.plan(None).entries
+    assert first.names == ("strip_title",)
+    assert second.names == ("drop_private",)
+    disabled = StepPlanner(steps, transmute_settings, payload_fields=("file",))
+    assert (disabled.header, disabled.payload_fields) == (0, ())
+    assert disabled.plan(None).entries[0].names == ("strip_title", "drop_private")
+
+
+@pytest.mark.parametrize(
+    "item,expected",
+    [
+        (_item(**{"@type": "File"}), None),
+        (_item(**{"@type": "File", "text": ""}), ["news_or_text"]),
+        (_item(**{"@type": "Document"}), ["document_only"]),
+        (_item(**{"@type": "News Item"}), ["news_or_text"]),
+    ],
+)
+async def test_run_pipeline_plans(
+    app_layout, pipeline_state, transmute_settings, item, expected
+):
+    steps = (upper_title, document_only, news_or_text)
+    results = [
+        result
+        async for result in run_pipeline(
+            steps, item, pipeline_state, app_layout.consoles, transmute_settings
+        )
+    ]
+    assert len(results) == 1
+    assert results[0][0].get("steps") == expected
+    assert results[0][0]["title"] == "FOO"
+    timings = pipeline_state.timings.steps
+    assert (("step", "document_only") in timings) is (expected == ["document_only"])
+
+
+async def test_run_pipeline_plans_type_change(
+    app_layout, pipeline_state, transmute_settings
+):
+    """Steps are planned again when a step changes the type of the item."""
+    item = _item(**{"@type": "File"})
+    steps = (to_document, document_only, news_or_text)
+    results = [
+        result
+        async for result in run_pipeline(
+            steps, item, pipeline_state, app_layout.consoles, transmute_settings
+        )
+    ]
+    assert results == [
+        (
+            {**item, "@type": "Document", "steps": ["document_only"]},
+            "document_only",
+            False,
+        )
+    ]
+
+
+def test_pipeline_default_page_parked_keys(run_pipeline, export_src):
+    """A parent waiting for its default page only keeps the merged keys."""
+    # Remove my-folder-link, the default page of my-folder
+    (export_src / "Plone" / "2.json").unlink()
+    state = run_pipeline(export_src)
+    parked = state.metadata.__processing_default_page__
+    assert list(parked) == ["714cbe2b3fe74c608d4ae20a608eab67"]
+    assert set(parked["714cbe2b3fe74c608d4ae20a608eab67"]) == {
+        "@id",
+        "id",
+        "UID",
+        "title",
+    }
@@ -0,0 +1,13 @@
+def test_pipeline_step_plans(run_pipeline, read_results, export_src, test_dst):
+    """Steps left out of the plan of a type do not change the results."""
+    skipped = ("step", "process_image_to_preview_image_link")
+    state = run_pipeline(export_src)
+    expected = read_results(test_dst)
+    assert skipped not in state.timings.steps
+    config = test_dst.parent / "transmute.toml"
+    config.write_text(
+        config.read_text().replace("report=1000\n", "report=1000\nstep_plans=false\n")
+    )
+    state = run_pipeline(export_src)
+    assert read_results(test_dst) == expected
+    assert state.timings.steps[skipped].calls == 4
@@ -0,0 +1,60 @@
+from collections import Counter
+from collective.transmute.utils import files as file_utils
+
+import pytest
+
+
+@pytest.fixture
+def data_writes(monkeypatch) -> Counter:
+    """Count the writes of each data file."""
+    writes: Counter = Counter()
+    write_item_export = file_utils.write_item_export
+
+    async def func(export):
+        if export.write_data:
+            writes[export.data_path.parent.name] += 1
+        return await write_item_export(export)
+
+    monkeypatch.setattr(file_utils, "write_item_export", func)
+    return writes
+
+
+@pytest.fixture
+def expected(run_pipeline, read_results, export_src, test_dir, test_dst) -> dict:
+    """Results of a run reading back the items to post-process."""
+    config = test_dir / "transmute.toml"
+    original = config.read_text()
+    config.write_text(
+        original.replace("report=1000\n", "report=1000\ndefer_post_processing=false\n")
+    )
+    state = run_pipeline(export_src)
+    config.write_text(original)
+    assert state.post_processing
+    return read_results(test_dst)
+
+
+def test_post_process_read_back(data_writes, expected):
+    """Without deferring, items to post-process are written twice."""
+    assert data_writes.most_common(1)[0][1] == 2
+
+
+def test_post_process_deferred(
+    run_pipeline, read_results, export_src, test_dst, data_writes, expected
+):
+    """Items scheduled for post-processing are written once, with the same data."""
+    data_writes.clear()
+    state = run_pipeline(export_src)
+    assert read_results(test_dst) == expected
+    assert set(data_writes.values()) == {1}
+    assert state.deferred == {}
+
+
+def test_post_process_deferred_workers(
+    run_pipeline, read_results, export_src, test_dst, data_writes, expected
+):
+    """Items deferred by shard workers are written by the main process."""
+    data_writes.clear()
+    state = run_pipeline(export_src, workers=2)
+    assert read_results(test_dst) == expected
+    scheduled = {state.uids[uid] for uid in state.post_processing}
+    assert {uid: data_writes[uid] for uid in scheduled} == dict.fromkeys(scheduled, 1)
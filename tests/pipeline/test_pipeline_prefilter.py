@@ -0,0 +1,81 @@
+from base64 import b64encode
+from collective.transmute import _types as t
+
+import json
+import pytest
+
+
+PAYLOAD = b64encode(b"%PDF-1.4" * 64).decode("utf-8")
+
+
+def _file_item(name: str, review_state: str) -> dict:
+    return {
+        "@id": f"http://localhost:8080/Plone/{name}",
+        "@type": "File",
+        "UID": f"{name:0>32}",
+        "created": "2020-01-01T00:00:00+00:00",
+        "file": {
+            "content-type": "application/pdf",
+            "data": PAYLOAD,
+            "encoding": "base64",
+            "filename": f"{name}.pdf",
+        },
+        "id": name,
+        "is_folderish": False,
+        "modified": "2020-01-01T00:00:00+00:00",
+        "parent": {"@id": "http://localhost:8080/Plone", "UID": "x"},
+        "review_state": review_state,
+        "title": name,
+        "workflow_history": {},
+    }
+
+
+@pytest.fixture
+def files_src(export_src, test_dst):
+    for idx, review_state in ((10, "published"), (11, "private"), (12, "published")):
+        item = _file_item(f"file{idx}", review_state)
+        (export_src / "Plone" / f"{idx}.json").write_text(json.dumps(item, indent=4))
+    config = test_dst.parent / "transmute.toml"
+    config.write_text(config.read_text().replace("drop=[]", 'drop=["/file12"]'))
+    return export_src
+
+
+@pytest.fixture
+def payload_reads(monkeypatch) -> list[str]:
+    """Record the names of the source files blob payloads are read from."""
+    reads: list[str] = []
+    read = t.BlobReference.read
+
+    def func(self):
+        reads.append(self.path.name)
+        return read(self)
+
+    monkeypatch.setattr(t.BlobReference, "read", func)
+    return reads
+
+
+def test_pipeline_prefilter(
+    run_pipeline, read_results, files_src, test_dst, payload_reads
+):
+    """Items dropped by the pre-filter are reported without loading their blobs."""
+    state = run_pipeline(files_src)
+    expected = read_results(test_dst)
+    dropped = dict(state.dropped)
+    report = (test_dst.parent / "report_transmute.csv").read_text()
+    # The review state filter runs after process_type, once payloads are read
+    assert payload_reads == ["10.json", "11.json"]
+    assert dropped["process_paths"] == 1
+    assert dropped["process_review_state"] == 1
+    assert "file11,File" in report
+    assert "file12,File" in report
+    assert expected["items"]["00000000000000000000000000file10"]["file"]
+    config = test_dst.parent / "transmute.toml"
+    config.write_text(
+        config.read_text().replace("report=1000\n", "report=1000\nprefilter=false\n")
+    )
+    payload_reads.clear()
+    state = run_pipeline(files_src)
+    assert read_results(test_dst) == expected
+    assert dict(state.dropped) == dropped
+    assert (test_dst.parent / "report_transmute.csv").read_text() == report
+    assert payload_reads == []
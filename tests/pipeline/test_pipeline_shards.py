@@ -0,0 +1,126 @@
+from collections import defaultdict
+from collective.transmute.pipeline import shards
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "item_id,expected",
+    [
+        ("http://localhost:8080/Plone/my-folder", "my-folder"),
+        ("http://localhost:8080/Plone/my-folder/my-subfolder/old", "my-folder"),
+        ("http://localhost:8080/Plone/news", "news"),
+        ("/Plone/events/2024", "events"),
+        ("", ""),
+    ],
+)
+def test_shard_key(transmute_settings, item_id: str, expected: str):
+    assert shards.shard_key(item_id, transmute_settings) == expected
+
+
+@pytest.mark.parametrize(
+    "keys,total,expected",
+    [
+        (["a", "b", "a", "c"], 2, [[0, 2], [1, 3]]),
+        (["a", "a", "a"], 4, [[0, 1, 2]]),
+        (["a", "b", "c", "d"], 1, [[0, 1, 2, 3]]),
+        (["a", "b", "b", "b", "c", "a"], 2, [[1, 2, 3], [0, 4, 5]]),
+    ],
+)
+def test_plan_shards(keys: list[str], total: int, expected: list[list[int]]):
+    assert shards.plan_shards(keys, total) == expected
+
+
+def test_colocate_default_pages():
+    plan = [[0, 2], [1, 3]]
+    uids = ["parent", "other", "x", "page"]
+    result = shards.colocate_default_pages(plan, uids, {"parent": "page"})
+    assert result == [[0, 2, 3], [1]]
+
+
+def test_merge_annotations():
+    base = {"counter": {"a": 1}, "drop_uids": {"u1": True, "u2": True}}
+    annotations = {"counter": {"a": 1}, "drop_uids": {"u1": True, "u2": True}}
+    shard_1 = {"counter": {"a": 3}, "drop_uids": {"u2": True}, "new": {"x": "y"}}
+    shard_2 = {"counter": {"a": 2, "b": 1}, "drop_uids": {"u1": True, "u2": True}}
+    shards._merge_annotations(annotations, base, shard_1)
+    shards._merge_annotations(annotations, base, shard_2)
+    assert annotations["counter"] == {"a": 4, "b": 1}
+    assert annotations["drop_uids"] == {"u2": True}
+    assert annotations["new"] == {"x": "y"}
+
+
+def test_merge_annotations_keeps_dict_type():
+    annotations: dict = {}
+    shard = {"counter": defaultdict(int, {"a": 1})}
+    shards._merge_annotations(annotations, {}, shard)
+    assert isinstance(annotations["counter"], defaultdict)
+    assert annotations["counter"]["a"] == 1
+
+
+@pytest.fixture
+def isolated_keys(monkeypatch):
+    """Route each file to its own shard."""
+
+    def func(item_id: str, settings) -> str:
+        return item_id
+
+    monkeypatch.setattr(shards, "shard_key", func)
+
+
+@pytest.mark.parametrize("isolate", [False, True])
+def test_pipeline_workers(
+    request,
+    pipeline_runner,
+    read_results,
+    test_dst,
+    src_files,
+    pipeline_state,
+    isolate: bool,
+):
+    """Sharded runs produce the same results as single process runs."""
+    from collective.transmute.commands.transmute import _create_state
+    from collective.transmute.layout import TransmuteLayout
+
+    pipeline_runner(write_report=True)
+    expected = read_results(test_dst)
+    expected_state = (pipeline_state.exported, pipeline_state.dropped)
+    report = (test_dst.parent / "report_transmute.csv").read_text()
+
+    if isolate:
+        request.getfixturevalue("isolated_keys")
+    for path in test_dst.parent.glob("report_*.csv"):
+        path.unlink()
+    for path in (test_dst / "content").glob("*/data.json"):
+        path.unlink()
+    # Reset the pipeline state
+    app_layout = TransmuteLayout(title="Test Run")
+    new_state = _create_state(app_layout, total=len(src_files.content))
+    pipeline_state.__dict__.update(new_state.__dict__)
+    pipeline_runner(write_report=True, workers=2)
+
+    assert read_results(test_dst) == expected
+    assert (pipeline_state.exported, pipeline_state.dropped) == expected_state
+    assert (test_dst.parent / "report_transmute.csv").read_text() == report
+
+
+def test_pipeline_workers_headers(
+    monkeypatch, run_pipeline, read_results, export_src, test_dst
+):
+    """Shards are planned from the headers of the source index."""
+    from collective.transmute.utils import files as file_utils
+    from collective.transmute.utils import index
+
+    run_pipeline(export_src)
+    expected = read_results(test_dst)
+    content = file_utils.get_src_files(export_src).content
+    with index.SourceIndex(export_src.resolve()) as source_index:
+        source_index.update(content)
+        headers = source_index.headers(content)
+
+    def func(*args):
+        raise AssertionError("Content files scanned")
+
+    monkeypatch.setattr(shards, "_scan", func)
+    run_pipeline(export_src, workers=2, headers=headers)
+    assert read_results(test_dst) == expected
@@ -0,0 +1,115 @@
+from collections.abc import Iterator
+from collective.transmute.pipeline import store
+
+import pytest
+
+
+@pytest.fixture
+def state_store(monkeypatch, tmp_path) -> Iterator[store.StateStore]:
+    monkeypatch.setattr(store, "BATCH_SIZE", 2)
+    state_store = store.StateStore(tmp_path / store.STORE_FILE, cache_size=2)
+    yield state_store
+    state_store.close()
+
+
+def test_stored_dict(state_store):
+    mapping = store.StoredDict(state_store, "uids")
+    mapping.update({"a": "1", "b": "2", "c": "3"})
+    mapping["a"] = "4"
+    assert mapping["a"] == "4"
+    assert mapping.get("d") is None
+    assert "b" in mapping
+    del mapping["b"]
+    assert "b" not in mapping
+    with pytest.raises(KeyError):
+        del mapping["b"]
+    assert sorted(mapping.items()) == [("a", "4"), ("c", "3")]
+    assert len(mapping) == 2
+
+
+def test_stored_dict_cache(state_store):
+    mapping = store.StoredDict(state_store, "uids")
+    mapping.update({f"key-{idx}": str(idx) for idx in range(10)})
+    assert [mapping[f"key-{idx}"] for idx in range(10)] == [
+        str(idx) for idx in range(10)
+    ]
+    # Only the most recently used keys are cached
+    assert list(mapping._table._cache) == ["key-8", "key-9"]
+
+
+def test_stored_set(state_store):
+    values = store.StoredSet(state_store, "seen")
+    values.update(["a", "b", "c"])
+    values.add("a")
+    values.discard("b")
+    values.discard("d")
+    assert "a" in values
+    assert "b" not in values
+    assert 1 not in values
+    assert sorted(values) == ["a", "c"]
+    values |= {"d"}
+    assert len(values) == 3
+
+
+def test_stored_paths(state_store):
+    paths = store.StoredPaths(state_store)
+    records = [
+        ("/b", "2", "2/data.json"),
+        ("/a", "1", "1/data.json"),
+        ("/c", "3", "3/data.json"),
+    ]
+    paths.extend(records)
+    assert len(paths) == 3
+    assert list(paths) == records
+    assert paths[0] == records[0]
+    assert paths[-1] == records[-1]
+    assert paths[1:] == records[1:]
+    assert list(store.sorted_paths(paths)) == sorted(records)
+    with pytest.raises(IndexError):
+        paths[3]
+    with pytest.raises(NotImplementedError):
+        paths[0] = records[1]
+    with pytest.raises(NotImplementedError):
+        paths.insert(0, records[1])
+
+
+def test_attach(state_store, pipeline_state):
+    pipeline_state.seen.add("a")
+    pipeline_state.uids["a"] = "a"
+    pipeline_state.paths.append(("/a", "a", "a/data.json"))
+    state_store.attach(pipeline_state)
+    assert isinstance(pipeline_state.seen, store.StoredSet)
+    assert isinstance(pipeline_state.uids, store.StoredDict)
+    assert isinstance(pipeline_state.uid_path, store.StoredDict)
+    assert isinstance(pipeline_state.paths, store.StoredPaths)
+    assert "a" in pipeline_state.seen
+    assert pipeline_state.uids["a"] == "a"
+    assert list(pipeline_state.paths) == [("/a", "a", "a/data.json")]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pipeline_sqlite_store(
+    monkeypatch, run_pipeline, read_results, export_src, test_dst, workers: int
+):
+    full_state = run_pipeline(export_src, workers=workers)
+    expected = read_results(test_dst)
+    stores = []
+    attach = store.StateStore.attach
+
+    def func(self, state):
+        stores.append(self)
+        return attach(self, state)
+
+    monkeypatch.setattr(store.StateStore, "attach", func)
+    config = test_dst.parent / "transmute.toml"
+    config.write_text(
+        config.read_text().replace(
+            "report=1000\n", 'report=1000\nstate_store="sqlite"\n'
+        )
+    )
+    state = run_pipeline(export_src, workers=workers)
+    assert len(stores) == 1
+    assert not (test_dst / store.STORE_FILE).exists()
+    assert read_results(test_dst) == expected
+    assert state.exported == full_state.exported
+    assert state.dropped == full_state.dropped
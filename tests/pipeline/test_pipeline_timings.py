@@ -0,0 +1,78 @@
+from collective.transmute import _types as t
+from collective.transmute.reports import timings as timings_report
+
+import csv
+import json
+import pytest
+
+
+@pytest.fixture
+def stats() -> t.StepStats:
+    stats = t.StepStats()
+    for idx in range(1, 101):
+        stats.add(idx / 1000, dropped=idx % 10 == 0, produced=1 if idx == 1 else 0)
+    return stats
+
+
+def test_step_stats(stats):
+    assert stats.calls == 100
+    assert stats.dropped == 10
+    assert stats.produced == 1
+    assert stats.max == pytest.approx(0.1)
+    assert stats.mean == pytest.approx(0.0505)
+    # Percentiles are estimated with 10% wide buckets
+    assert stats.percentile(50) == pytest.approx(0.05, rel=0.1)
+    assert stats.percentile(95) == pytest.approx(0.095, rel=0.1)
+    assert stats.percentile(100) == pytest.approx(0.1)
+
+
+def test_step_stats_merge(stats):
+    other = t.StepStats()
+    other.add(1.0)
+    stats.merge(other)
+    assert stats.calls == 101
+    assert stats.max == 1.0
+    assert stats.percentile(100) == 1.0
+
+
+def test_timings_measure():
+    timings = t.StepTimings()
+    with timings.measure("report", "my_report"):
+        pass
+    with pytest.raises(ValueError), timings.measure("report", "my_report"):
+        raise ValueError()
+    assert timings.steps[("report", "my_report")].calls == 2
+
+
+def test_timings_rows_order():
+    timings = t.StepTimings()
+    timings.record("report", "report_a", 1.0)
+    timings.record("step", "fast", 0.1)
+    timings.record("step", "slow", 0.5)
+    timings.record("run", "process_items", 2.0)
+    rows = timings_report.timings_rows(timings)
+    assert [(row["stage"], row["step"]) for row in rows] == [
+        ("run", "process_items"),
+        ("step", "slow"),
+        ("step", "fast"),
+        ("report", "report_a"),
+    ]
+    assert rows[1]["mean_ms"] == 500.0
+
+
+def test_pipeline_step_timings(pipeline_runner, pipeline_state, test_dir):
+    pipeline_runner()
+    steps = pipeline_state.timings.steps
+    assert steps[("step", "process_export_prefix")].calls == 5
+    # my-folder-link is merged into its parent
+    assert steps[("step", "process_default_page")].dropped == 1
+    assert steps[("export", "write_item_export")].calls == 4
+    assert ("prepare", "prepare_pipeline") not in steps
+    assert ("run", "prepare_pipeline") in steps
+    assert ("post_process", "export_item") in steps
+    with open(test_dir / "report_step_timings.csv") as fh:
+        rows = list(csv.DictReader(fh))
+    assert rows[0]["stage"] == "run"
+    assert {"stage", "step", "calls", "p95_ms"} <= set(rows[0])
+    data = json.loads((test_dir / "report_step_timings.json").read_text())
+    assert len(data) == len(rows)
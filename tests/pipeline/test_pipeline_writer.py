@@ -0,0 +1,113 @@
+from base64 import b64encode
+from collective.transmute.pipeline.writer import ItemWriter
+
+import json
+import pytest
+
+
+def _item(idx: int) -> dict:
+    return {
+        "@id": f"/item-{idx}",
+        "@type": "File",
+        "UID": f"uid-{idx}",
+        "id": f"item-{idx}",
+        "_blob_files_": {
+            "file": {
+                "filename": f"file-{idx}.txt",
+                "data": b64encode(f"content {idx}".encode()).decode("utf-8"),
+            }
+        },
+    }
+
+
+@pytest.mark.parametrize("workers", [0, 1, 4])
+async def test_writer_writes_items(app_layout, tmp_path, workers: int):
+    async with ItemWriter(tmp_path, app_layout.consoles, workers=workers) as writer:
+        results = [await writer.submit(_item(idx)) for idx in range(10)]
+    assert [result.data for result in results] == [
+        f"uid-{idx}/data.json" for idx in range(10)
+    ]
+    assert [result.blob_files for result in results] == [
+        [f"uid-{idx}/file/file-{idx}.txt"] for idx in range(10)
+    ]
+    assert writer.written == 10
+    assert writer.errors == 0
+    for idx in range(10):
+        data = json.loads((tmp_path / f"uid-{idx}" / "data.json").read_text())
+        assert data["file"]["blob_path"] == f"uid-{idx}/file/file-{idx}.txt"
+        blob = tmp_path / f"uid-{idx}" / "file" / f"file-{idx}.txt"
+        assert blob.read_text() == f"content {idx}"
+
+
+async def test_writer_queue_is_bounded(app_layout, tmp_path):
+    writer = ItemWriter(tmp_path, app_layout.consoles, workers=1, queue_size=2)
+    async with writer:
+        for idx in range(20):
+            await writer.submit(_item(idx))
+    assert writer.max_depth <= 2
+    assert writer.written == 20
+
+
+async def test_writer_flush(app_layout, tmp_path):
+    async with ItemWriter(tmp_path, app_layout.consoles, workers=2) as writer:
+        await writer.submit(_item(1))
+        await writer.flush()
+        assert (tmp_path / "uid-1" / "data.json").exists()
+
+
+async def test_writer_errors(app_layout, tmp_path):
+    (tmp_path / "uid-1").write_text("not a folder")
+    async with ItemWriter(tmp_path, app_layout.consoles, workers=2) as writer:
+        await writer.submit(_item(1))
+        await writer.submit(_item(2))
+    assert writer.errors == 1
+    assert writer.written == 1
+
+
+async def test_writer_callbacks(app_layout, tmp_path):
+    """Callbacks are called in submission order, with the outcome of each write."""
+    (tmp_path / "uid-2").write_text("not a folder")
+    outcomes = []
+    async with ItemWriter(tmp_path, app_layout.consoles, workers=4) as writer:
+        for idx in range(5):
+            await writer.submit(
+                _item(idx),
+                on_written=lambda files: outcomes.append(files.data),
+                on_failed=lambda exc, idx=idx: outcomes.append(f"error-{idx}"),
+            )
+    assert outcomes == [
+        "uid-0/data.json",
+        "uid-1/data.json",
+        "error-2",
+        "uid-3/data.json",
+        "uid-4/data.json",
+    ]
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_pipeline_write_errors(
+    monkeypatch, run_pipeline, export_src, test_dst, workers: int
+):
+    """Items that could not be written are not listed in the metadata."""
+    from collective.transmute.utils import files as file_utils
+
+    uid = "cbebd70218b348f68d6bb1b7dd7830c4"
+    write_item_export = file_utils.write_item_export
+
+    async def func(export):
+        if export.data["UID"] == uid:
+            raise OSError("Disk full")
+        return await write_item_export(export)
+
+    monkeypatch.setattr(file_utils, "write_item_export", func)
+    config = test_dst.parent / "transmute.toml"
+    config.write_text(
+        config.read_text().replace("report=1000\n", f"report=1000\nwriters={workers}\n")
+    )
+    state = run_pipeline(export_src)
+    metadata = json.loads((test_dst / "content" / "__metadata__.json").read_text())
+    assert f"{uid}/data.json" not in metadata["_data_files_"]
+    assert uid not in state.seen
+    assert uid not in state.uid_path
+    assert state.dropped["_error"] == 1
+    assert not (test_dst / "content" / uid).exists()
@@ -1,5 +1,7 @@
+from collective.transmute import _types as t
 from collective.transmute.steps import paths
 
+import pickle
 import pytest
 
 
@@ -116,3 +118,42 @@ class TestProcessPathsAnnotationInitialization:
         async for _ in paths.process_paths(base_item, pipeline_state, settings):
             pass
         assert "dropped_by_path_prefix" in pipeline_state.annotations
+
+
+class TestPrefixSet:
+    def test_settings_cast(self, transmute_settings):
+        assert isinstance(transmute_settings.paths["filter"]["drop"], t.PrefixSet)
+        assert isinstance(transmute_settings.paths_filter_allowed, t.PrefixSet)
+
+    @pytest.mark.parametrize(
+        "path,expected",
+        [
+            ("/public", "/public"),
+            ("/public/private/item", "/public"),
+            ("/publicity", "/public"),
+            ("/other/item", "/other/item"),
+            ("/other", None),
+            ("/", None),
+        ],
+    )
+    def test_match(self, path: str, expected: str | None):
+        prefixes = t.PrefixSet(["/public", "/public/private", "/other/item"])
+        assert prefixes.match(path) == expected
+
+    def test_index_updated(self):
+        prefixes = t.PrefixSet(["/a/b"])
+        prefixes.add("/a")
+        assert prefixes.match("/a/b/c") == "/a"
+        prefixes.discard("/a")
+        assert prefixes.match("/a/b/c") == "/a/b"
+        prefixes -= {"/a/b"}
+        assert prefixes.match("/a/b/c") is None
+        assert prefixes.lengths == []
+        prefixes |= {"/x"}
+        assert prefixes.match("/x/y") == "/x"
+
+    def test_pickle(self):
+        data = pickle.dumps(t.PrefixSet(["/a", "/b/c"]))
+        prefixes = pickle.loads(data)  # noqa: S301
+        assert isinstance(prefixes, t.PrefixSet)
+        assert prefixes.match("/b/c/d") == "/b/c"
@@ -0,0 +1,130 @@
+from base64 import b64encode
+from base64 import encodebytes
+from collective.transmute import _types as t
+from collective.transmute.utils import blobs
+from collective.transmute.utils import files
+
+import json
+import pytest
+
+
+FIELDS = ("file", "image", "preview_image")
+
+PAYLOAD = b64encode(bytes(range(256)) * 8).decode("utf-8")
+
+
+def _item(**kwargs) -> dict:
+    item = {
+        "@id": "/my-file",
+        "UID": "abc",
+        "id": "my-file",
+        "file": {
+            "content-type": "application/pdf",
+            "data": PAYLOAD,
+            "encoding": "base64",
+            "filename": "file.pdf",
+        },
+    }
+    item.update(kwargs)
+    return item
+
+
+@pytest.fixture
+def source(tmp_path):
+    def func(item: dict, indent: int | None = 4):
+        path = tmp_path / "1.json"
+        path.write_text(json.dumps(item, indent=indent))
+        return path
+
+    return func
+
+
+@pytest.mark.parametrize("indent", [None, 2, 4])
+def test_load_item_references(source, indent):
+    path = source(_item(), indent=indent)
+    data = path.read_bytes()
+    item = blobs.load_item(path, data, FIELDS)
+    reference = item["file"]["data"]
+    assert isinstance(reference, t.BlobReference)
+    assert reference.read() == PAYLOAD
+    assert item["file"]["filename"] == "file.pdf"
+    assert item["@id"] == "/my-file"
+
+
+def test_load_item_without_blobs(source):
+    path = source({"@id": "/page", "text": {"data": "<p>Hello</p>"}})
+    item = blobs.load_item(path, path.read_bytes(), FIELDS)
+    assert item == {"@id": "/page", "text": {"data": "<p>Hello</p>"}}
+
+
+def test_load_item_other_encoding(source):
+    blob = {"data": "plain", "encoding": "utf-8", "filename": "a.txt"}
+    path = source(_item(file=blob))
+    item = blobs.load_item(path, path.read_bytes(), FIELDS)
+    assert item["file"]["data"] == "plain"
+
+
+def test_load_item_escaped_payload(source):
+    blob = {"data": encodebytes(b"hello world" * 20).decode(), "filename": "a.txt"}
+    path = source(_item(file=blob))
+    item = blobs.load_item(path, path.read_bytes(), FIELDS)
+    assert item["file"]["data"] == blob["data"]
+
+
+def test_load_item_restores_nested_fields(source):
+    nested = {"blocks": {"abc": {"image": {"data": "aGVsbG8=", "@type": "x"}}}}
+    path = source(_item(**nested))
+    item = blobs.load_item(path, path.read_bytes(), FIELDS)
+    assert item["blocks"] == nested["blocks"]
+    assert isinstance(item["file"]["data"], t.BlobReference)
+
+
+async def test_export_from_reference(source, tmp_path):
+    path = source(_item())
+    item = blobs.load_item(path, path.read_bytes(), FIELDS)
+    item["_blob_files_"] = {"file": item.pop("file")}
+    content = tmp_path / "content"
+    export = files.prepare_item_export(item, content)
+    await files.write_item_export(export)
+    blob_file = content / "abc" / "file" / "file.pdf"
+    assert blob_file.read_bytes() == bytes(range(256)) * 8
+
+
+def test_json_dumps_reads_references(source):
+    path = source(_item())
+    item = blobs.load_item(path, path.read_bytes(), FIELDS)
+    assert json.loads(files.json_dumps(item)) == _item()
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+async def test_json_reader_blob_fields(source, prefetch):
+    path = source(_item())
+    results = [
+        item
+        async for _, item in files.json_reader(
+            [path], prefetch=prefetch, blob_fields=FIELDS
+        )
+    ]
+    assert isinstance(results[0]["file"]["data"], t.BlobReference)
+
+
+def test_splice_blob_payloads_other_objects():
+    data = json.dumps({
+        "text": {"data": "<p>x</p>"},
+        "file": {"size": [1], "data": "aGVsbG8="},
+    }).encode()
+    assert blobs.splice_blob_payloads(data, FIELDS) == (data, [])
+
+
+def test_load_payloads(source):
+    path = source(_item())
+    item = blobs.load_item(path, path.read_bytes(), FIELDS)
+    assert blobs.load_payloads(item, FIELDS) == _item()
+
+
+def test_load_payloads_kept_data(source):
+    """Payloads are sliced from the contents kept in memory, not read again."""
+    path = source(_item())
+    item = blobs.load_item(path, path.read_bytes(), FIELDS, keep_data=True)
+    path.unlink()
+    assert blobs.load_payloads(item, FIELDS) == _item()
@@ -0,0 +1,154 @@
+from collective.html2blocks.converter import html_to_blocks
+from collective.transmute import _types as t
+from collective.transmute.settings import get_settings
+from collective.transmute.utils import blocks
+
+import asyncio
+import orjson
+import pytest
+
+
+HTML = "<h2>Title</h2><p>A <strong>paragraph</strong></p>"
+
+
+@pytest.mark.parametrize(
+    "item,expected",
+    [
+        ({"text": {"data": HTML}}, HTML),
+        ({"text": {"data": None}}, ""),
+        ({"text": None}, ""),
+        ({}, ""),
+    ],
+)
+def test_item_html(item: dict, expected: str):
+    assert blocks.item_html(item) == expected
+
+
+async def _items(sources: list[str]):
+    for idx, source in enumerate(sources):
+        yield f"{idx}.json", {"text": {"data": source}}
+
+
+def test_read_ahead():
+    sources = [HTML, "<p>Other</p>", HTML, "", "<p>Last</p>"]
+    converter = blocks.BlocksConverter(workers=1, queue_size=2)
+
+    async def run() -> list:
+        results = []
+        async for filename, item in converter.read_ahead(_items(sources)):
+            source = blocks.item_html(item)
+            results.append((filename, await converter.convert(source)))
+        # A text changed after the item was read is converted again
+        results.append(("changed", await converter.convert("<p>Changed</p>")))
+        return results
+
+    converter.start()
+    try:
+        results = asyncio.run(run())
+    finally:
+        converter.stop()
+    expected = [html_to_blocks(source) if source else [] for source in sources]
+    assert [name for name, _ in results[:-1]] == [f"{idx}.json" for idx in range(5)]
+    assert [value for _, value in results[:-1]] == expected
+    assert results[-1][1] == html_to_blocks("<p>Changed</p>")
+    # Items sharing a text get their own copy of the blocks
+    assert results[0][1] is not results[2][1]
+    assert (converter.hits, converter.misses) == (4, 1)
+    assert converter._pending == {}
+
+
+def test_convert_blocks_inline():
+    info = asyncio.run(blocks.convert_blocks(HTML, [{"@type": "title"}], []))
+    values = [info["blocks"][uid] for uid in info["blocks_layout"]["items"]]
+    assert values == [{"@type": "title"}, *html_to_blocks(HTML)]
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / blocks.CACHE_FILE
+
+
+def test_blocks_cache(cache_path):
+    stats = t.BlocksCacheStats()
+    cache = blocks.BlocksCache(cache_path, stats=stats)
+    assert cache.get(HTML) is None
+    cache.put(HTML, html_to_blocks(HTML))
+    # Buffered entries are found before they are written
+    assert cache.has(HTML)
+    cache.close()
+
+    cache = blocks.BlocksCache(cache_path, stats=stats)
+    result = cache.get(HTML)
+    assert result == html_to_blocks(HTML)
+    # Each lookup returns a copy
+    assert cache.get(HTML) is not result
+    assert not cache.has("<p>Other</p>")
+    cache.close()
+    assert (stats.hits, stats.misses) == (2, 1)
+
+
+def test_blocks_cache_version(monkeypatch, cache_path):
+    cache = blocks.BlocksCache(cache_path)
+    key = cache.key(HTML)
+    cache.put(HTML, [])
+    cache.close()
+    monkeypatch.setattr(blocks, "_cache_salt", lambda: b"html2blocks-99.0\0")
+    assert blocks.BlocksCache.key(HTML) != key
+    cache = blocks.BlocksCache(cache_path)
+    assert not cache.has(HTML)
+    cache.close()
+
+
+def test_blocks_cache_eviction(monkeypatch, cache_path):
+    sources = [f"<p>Paragraph {idx}</p>" for idx in range(10)]
+    now = 1000
+
+    def func() -> int:
+        return now
+
+    monkeypatch.setattr(blocks.time, "time", func)
+    cache = blocks.BlocksCache(cache_path)
+    for source in sources:
+        cache.put(source, html_to_blocks(source))
+    cache.close()
+    size = len(orjson.dumps(html_to_blocks(sources[0])))
+
+    now = 2000
+    cache = blocks.BlocksCache(cache_path, max_size=size * 5)
+    # Recently used entries are kept
+    assert cache.get(sources[0]) is not None
+    cache.close()
+    assert cache.evicted == 6
+    cache = blocks.BlocksCache(cache_path)
+    kept = [source for source in sources if cache.has(source)]
+    cache.close()
+    assert len(kept) == 4
+    assert sources[0] in kept
+
+
+def test_convert_blocks_cached(monkeypatch, test_dir):
+    settings = get_settings()
+    calls = []
+
+    def func(source: str) -> list:
+        calls.append(source)
+        return html_to_blocks(source)
+
+    monkeypatch.setattr(blocks, "html_to_blocks", func)
+
+    async def run() -> list:
+        with blocks.blocks_cache(settings, stats) as cache:
+            assert blocks.active_cache() is cache
+            return [
+                await blocks.convert_blocks(HTML, [], [{"@type": "listing"}])
+                for _ in range(2)
+            ]
+
+    stats = t.BlocksCacheStats()
+    first, second = asyncio.run(run())
+    assert calls == [HTML]
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert list(first["blocks"].values()) == list(second["blocks"].values())
+    # Block ids are not reused
+    assert first["blocks_layout"] != second["blocks_layout"]
+    assert blocks.active_cache() is None
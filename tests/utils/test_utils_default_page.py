@@ -94,3 +94,34 @@ def test___merge_items_value(
     func = default_page._merge_items
     result = func(item_folder, item_document, keys_from_parent)
     assert result[key] == expected
+
+
+def test_parent_keys(item_folder, keys_from_parent):
+    """Test that parent_keys only keeps the keys read by the merge."""
+    result = default_page.parent_keys(item_folder, keys_from_parent)
+    assert set(result) == {"@id", "id", "UID", "title"}
+    assert result["UID"] == item_folder["UID"]
+
+
+@pytest.mark.parametrize(
+    "keys_from_parent",
+    [
+        ("@id", "id"),
+        ("@id", "id", "title", "description"),
+        ("@id", "UID", "text", "missing"),
+    ],
+)
+@pytest.mark.parametrize(
+    "document", ["default_page/document.json", "default_page/link.json"]
+)
+def test_parent_keys_merge(load_json_resource, keys_from_parent, document: str):
+    """Test that merging with parent_keys matches merging with the whole parent."""
+    parent = load_json_resource("default_page/folder.json")
+    expected = default_page.handle_default_page(
+        parent, load_json_resource(document), keys_from_parent
+    )
+    parked = default_page.parent_keys(parent, keys_from_parent)
+    result = default_page.handle_default_page(
+        parked, load_json_resource(document), keys_from_parent
+    )
+    assert result == expected
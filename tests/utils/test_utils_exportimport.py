@@ -1,4 +1,5 @@
 from collective.transmute.utils import exportimport
+from collective.transmute.utils import json_stream
 from typing import Any
 
 import pytest
@@ -23,3 +24,17 @@ def test__initialize_localroles(src_data, uuid: str, key: str, expected: Any):
     entry = result.get(uuid)
     assert entry is not None, f"Entry for uuid {uuid} not found in result"
     assert entry.get(key) == expected
+
+
+async def test_initialize_metadata(monkeypatch, src_files, tmp_path):
+    """Metadata files read in small chunks give the same metadata."""
+    expected = await exportimport.initialize_metadata(src_files, tmp_path)
+    iter_json_file = json_stream.iter_json_file
+    monkeypatch.setattr(
+        json_stream, "iter_json_file", lambda path: iter_json_file(path, 16)
+    )
+    result = await exportimport.initialize_metadata(src_files, tmp_path)
+    assert result == expected
+    assert result.path == tmp_path / "__metadata__.json"
+    assert result.default_page
+    assert result.principals
@@ -1,4 +1,7 @@
+from base64 import b64decode
 from base64 import b64encode
+from base64 import encodebytes
+from collective.transmute import _types as t
 from collective.transmute.utils import files
 
 import pytest
@@ -155,6 +158,42 @@ class TestJsonReader:
         assert results[1][0] == "2.json"
         assert results[1][1]["@type"] == "Folder"
 
+    @pytest.mark.parametrize("prefetch,max_bytes", [(1, 0), (4, 0), (4, 10)])
+    async def test_prefetch_keeps_order(self, tmp_path, prefetch, max_bytes):
+        file_list = []
+        for idx in range(20):
+            path = tmp_path / f"{idx}.json"
+            path.write_text(f'{{"@id": "/item-{idx}"}}')
+            file_list.append(path)
+        stats = t.ReaderStats()
+        results = [
+            (filename, data["@id"])
+            async for filename, data in files.json_reader(
+                file_list, prefetch=prefetch, max_bytes=max_bytes, stats=stats
+            )
+        ]
+        assert results == [(f"{idx}.json", f"/item-{idx}") for idx in range(20)]
+        assert stats.hits + stats.misses == 20
+
+
+class TestIterBase64Decode:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 4, 7, 64, 4096])
+    @pytest.mark.parametrize("size", [0, 1, 2, 3, 100, 1000])
+    def test_matches_b64decode(self, chunk_size, size):
+        raw = bytes(range(256)) * 4
+        data = encodebytes(raw[:size]).decode("utf-8")
+        result = b"".join(files.iter_base64_decode(data, chunk_size=chunk_size))
+        assert result == b64decode(data.encode("utf-8"))
+
+
+class TestWriteBlob:
+    async def test_writes_file(self, tmp_path):
+        filepath = tmp_path / "blob.bin"
+        raw = bytes(range(256)) * 100
+        size = await files.write_blob(filepath, b64encode(raw).decode("utf-8"))
+        assert size == len(raw)
+        assert filepath.read_bytes() == raw
+
 
 class TestExportBlob:
     async def test_writes_blob_file(self, tmp_path):
@@ -183,6 +222,44 @@ class TestExportBlob:
         assert (content_path / "file" / "fallback-id").exists()
 
 
+class TestPrepareItemExport:
+    def test_computes_paths(self, tmp_path):
+        item = {
+            "UID": "abc",
+            "id": "my-file",
+            "@id": "/my-file",
+            "_internal": True,
+            "_blob_files_": {
+                "file": {"filename": "", "data": b64encode(b"data").decode("utf-8")}
+            },
+        }
+        export = files.prepare_item_export(item, tmp_path)
+        assert export.files.data == "abc/data.json"
+        assert export.files.blob_files == ["abc/file/my-file"]
+        assert export.data_path == tmp_path / "abc" / "data.json"
+        assert export.data["file"] == {
+            "filename": "",
+            "blob_path": "abc/file/my-file",
+        }
+        assert "_internal" not in export.data
+        # Nothing is written to disk
+        assert not (tmp_path / "abc").exists()
+
+    async def test_write_item_export(self, tmp_path):
+        item = {
+            "UID": "abc",
+            "id": "my-file",
+            "_blob_files_": {
+                "file": {"filename": "a.txt", "data": b64encode(b"data").decode()}
+            },
+        }
+        export = files.prepare_item_export(item, tmp_path)
+        result = await files.write_item_export(export)
+        assert result == export.files
+        assert (tmp_path / "abc" / "file" / "a.txt").read_bytes() == b"data"
+        assert (tmp_path / "abc" / "data.json").exists()
+
+
 class TestRemoveData:
     def test_removes_files(self, tmp_path):
         (tmp_path / "a.txt").write_text("a")
@@ -219,3 +296,31 @@ class TestJsonDump:
         assert result == path
         assert path.exists()
         assert b'"key"' in path.read_bytes()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"a": 1, "b": [], "c": {}},
+        {"a": {"b": [1, {"c": "d\ne"}], "f": None}, "g": [[], [{}]]},
+    ],
+)
+def test_iter_json(data: dict):
+    """Streamed objects and arrays are encoded like json_dumps."""
+    streamed = t.JSONObject(
+        (key, t.JSONArray(value) if isinstance(value, list) else value)
+        for key, value in data.items()
+    )
+    assert b"".join(files.iter_json(streamed)) == files.json_dumps(data)
+    values = list(data.values())
+    streamed_list = t.JSONArray(iter(values))
+    assert b"".join(files.iter_json(streamed_list)) == files.json_dumps(values)
+
+
+async def test_stream_json(tmp_path):
+    data = {str(idx): {"value": idx} for idx in range(100)}
+    path = tmp_path / "data.json"
+    result = await files.stream_json(t.JSONObject(data.items()), path, buffer_size=100)
+    assert result == path
+    assert path.read_bytes() == files.json_dumps(data)
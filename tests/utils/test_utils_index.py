@@ -0,0 +1,184 @@
+from collective.transmute.pipeline import shards
+from collective.transmute.utils import files as file_utils
+from collective.transmute.utils import index
+from dataclasses import astuple
+from pathlib import Path
+
+import base64
+import json
+import os
+import pytest
+import shutil
+import time
+
+
+FIELDS = ("file", "image")
+
+
+def _age(*paths: Path) -> None:
+    """Move the modification time of files out of the racy window."""
+    mtime = time.time() - 60
+    for path in paths:
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def export(tmp_path, test_src) -> Path:
+    src = tmp_path / "export"
+    shutil.copytree(test_src, src)
+    _age(*src.rglob("*.json"))
+    return src
+
+
+@pytest.fixture
+def source_index(export):
+    with index.SourceIndex(export.resolve(), FIELDS) as source_index:
+        yield source_index
+
+
+def _content(src: Path) -> list[Path]:
+    return file_utils.get_src_files(src, cache=False).content
+
+
+def test_index_path(listing_cache, test_src):
+    path = index.index_path(test_src.resolve())
+    assert path.parent == listing_cache
+    assert path.name.startswith("index-")
+    assert path.suffix == ".sqlite"
+
+
+@pytest.mark.parametrize(
+    "item,expected",
+    [
+        (
+            {"@id": "http://localhost:8080/Plone/a/b"},
+            "http://localhost:8080/Plone/a",
+        ),
+        (
+            {
+                "@id": "http://localhost:8080/Plone/a/b",
+                "parent": {"@id": "http://localhost:8080/Plone/c"},
+            },
+            "http://localhost:8080/Plone/c",
+        ),
+    ],
+)
+def test_item_entry_parent(item: dict, expected: str):
+    assert index.item_entry(item).parent == expected
+
+
+def test_item_entry():
+    entry = index.item_entry({
+        "@id": "http://localhost:8080/Plone/a",
+        "@type": "Document",
+        "UID": "a",
+        "review_state": None,
+        "workflow_history": {"simple_publication_workflow": [], "other": []},
+        "subjects": None,
+        "creators": ["admin"],
+    })
+    assert (entry.uid, entry.type, entry.review_state) == ("a", "Document", None)
+    assert entry.workflow == "simple_publication_workflow"
+    assert (entry.subjects, entry.creators, entry.blobs) == ([], ["admin"], {})
+
+
+def test_update(source_index, export):
+    files = _content(export)
+    stats = source_index.update(files)
+    assert astuple(stats) == (5, 0, 0, 0)
+    entries = list(source_index.entries(files))
+    assert [entry.path for entry in entries] == [
+        str(path.relative_to(export.resolve())) for path in files
+    ]
+    assert source_index.headers(files) == shards._scan_files(files)
+
+
+def test_update_incremental(monkeypatch, source_index, export):
+    files = _content(export)
+    source_index.update(files)
+    read = []
+    read_entry = index._read_entry
+
+    def func(filepath, *args):
+        read.append(filepath.name)
+        return read_entry(filepath, *args)
+
+    monkeypatch.setattr(index, "_read_entry", func)
+    stats = source_index.update(files)
+    assert (stats.unchanged, read) == (5, [])
+    # Change a file, remove another one
+    changed = export / "Plone" / "3.json"
+    data = json.loads(changed.read_text())
+    data["title"] = "Changed title"
+    changed.write_text(json.dumps(data))
+    _age(changed)
+    (export / "Plone" / "5.json").unlink()
+    files = _content(export)
+    stats = source_index.update(files)
+    assert astuple(stats) == (0, 1, 1, 3)
+    assert read == ["3.json"]
+    titles = {entry.path: entry.title for entry in source_index.entries(files)}
+    assert titles[os.path.join("Plone", "3.json")] == "Changed title"
+    with pytest.raises(KeyError):
+        list(source_index.entries([export.resolve() / "Plone" / "5.json"]))
+
+
+def test_update_racy_files(tmp_path, test_src):
+    """Files modified right before an update are read again by the next one."""
+    src = tmp_path / "fresh"
+    shutil.copytree(test_src, src)
+    for path in src.rglob("*.json"):
+        path.touch()
+    files = _content(src)
+    with index.SourceIndex(src.resolve(), FIELDS) as source_index:
+        source_index.update(files)
+        stats = source_index.update(files)
+    assert (stats.updated, stats.unchanged) == (5, 0)
+
+
+def test_update_workers(monkeypatch, source_index, export, listing_cache):
+    files = _content(export)
+    source_index.update(files)
+    expected = list(source_index.entries(files))
+    monkeypatch.setattr(index, "INDEX_CHUNK_SIZE", 2)
+    path = listing_cache / "workers.sqlite"
+    with index.SourceIndex(export.resolve(), FIELDS, path) as other:
+        stats = other.update(files, workers=2)
+        assert stats.added == 5
+        assert list(other.entries(files)) == expected
+
+
+def test_clear(source_index, export):
+    files = _content(export)
+    source_index.update(files)
+    source_index.clear()
+    assert source_index.update(files).added == 5
+
+
+def test_field_names_changed(source_index, export):
+    files = _content(export)
+    source_index.update(files)
+    source_index.close()
+    with index.SourceIndex(export.resolve(), ("file",)) as other:
+        assert other.update(files).added == 5
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 100])
+def test_blob_sizes(tmp_path, size: int):
+    src = tmp_path / "blobs"
+    src.mkdir()
+    path = src / "1.json"
+    payload = base64.b64encode(b"x" * size).decode()
+    path.write_text(
+        json.dumps({
+            "@id": "http://localhost:8080/Plone/file",
+            "UID": "a",
+            "file": {"data": payload, "encoding": "base64", "filename": "a.txt"},
+            "image": {"data": "plain", "encoding": "utf-8"},
+        })
+    )
+    _age(path)
+    with index.SourceIndex(src.resolve(), FIELDS) as source_index:
+        source_index.update([path])
+        (entry,) = source_index.entries([path])
+    assert entry.blobs == {"file": size, "image": 5}
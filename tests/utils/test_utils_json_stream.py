@@ -0,0 +1,39 @@
+from collective.transmute.utils import json_stream
+
+import orjson
+import pytest
+
+
+DOCUMENTS = [
+    [],
+    {},
+    [1, 'a"b\\,', {"x": [1, {"y": "]},"}]}, None, True, -1.5e3, [[1, 2], [3]]],
+    {"a": [1, 2], 'b"c': {"d": "},"}, "e": 3, "f": "x,y"},
+    [{"uuid": f"{idx}", "localroles": {"a": ["b", "c"]}} for idx in range(100)],
+]
+
+
+@pytest.mark.parametrize("data", DOCUMENTS)
+@pytest.mark.parametrize("indent", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, json_stream.CHUNK_SIZE])
+def test_iter_json_file(tmp_path, data, indent: bool, chunk_size: int):
+    path = tmp_path / "data.json"
+    option = orjson.OPT_INDENT_2 if indent else None
+    path.write_bytes(b"\n " + orjson.dumps(data, option=option) + b"\n")
+    result = list(json_stream.iter_json_file(path, chunk_size))
+    if isinstance(data, dict):
+        assert result == list(data.items())
+    else:
+        assert result == [(None, item) for item in data]
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [b"", b"1", b"[1,", b"[1 2]", b"[1]x", b'{"a" 1}', b"[,1]", b"[1,]"],
+)
+@pytest.mark.parametrize("chunk_size", [2, json_stream.CHUNK_SIZE])
+def test_iter_json_file_invalid(tmp_path, raw: bytes, chunk_size: int):
+    path = tmp_path / "data.json"
+    path.write_bytes(raw)
+    with pytest.raises(ValueError):
+        list(json_stream.iter_json_file(path, chunk_size))
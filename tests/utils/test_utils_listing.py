@@ -0,0 +1,77 @@
+from collective.transmute.utils import listing
+
+import os
+import pytest
+
+
+def _age(root, seconds: int = 60):
+    """Move the modification time of all folders to the past."""
+    for path in [root, *root.rglob("*")]:
+        if path.is_dir():
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 10**9))
+
+
+@pytest.fixture
+def export(tmp_path):
+    root = tmp_path / "export"
+    content = root / "content"
+    (content / "nested").mkdir(parents=True)
+    for name in ("10.json", "2.json", "item.json", "1.json"):
+        (content / name).write_text("{}")
+    (content / "nested" / "3.json").write_text("{}")
+    (content / "notes.txt").write_text("")
+    (root / "export_redirects.json").write_text("{}")
+    (root / "errors.json").write_text("{}")
+    _age(root)
+    return root
+
+
+@pytest.mark.parametrize(
+    "names,expected",
+    [
+        (["10.json", "2.json", "1.json"], ["1.json", "2.json", "10.json"]),
+        (["b.json", "3.json", "a.json"], ["3.json", "a.json", "b.json"]),
+        (["10000000.json", "9999999.json"], ["9999999.json", "10000000.json"]),
+    ],
+)
+def test_content_sort_key(names: list[str], expected: list[str]):
+    assert sorted(names, key=listing.content_sort_key) == expected
+
+
+def test_list_src_files(export):
+    metadata, content = listing.list_src_files(export, cache=False)
+    root = export.resolve()
+    assert metadata == [root / "errors.json", root / "export_redirects.json"]
+    assert [path.relative_to(root).as_posix() for path in content] == [
+        "content/1.json",
+        "content/2.json",
+        "content/nested/3.json",
+        "content/10.json",
+        "content/item.json",
+    ]
+    assert not listing.cache_path(root).exists()
+
+
+def test_cache(monkeypatch, export):
+    expected = listing.list_src_files(export)
+    assert listing.cache_path(export.resolve()).exists()
+
+    def walk(*args):
+        raise AssertionError("Listing not cached")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(listing, "_walk", walk)
+        assert listing.list_src_files(export) == expected
+
+    # Adding a file changes the modification time of its folder
+    (export / "content" / "nested" / "4.json").write_text("{}")
+    _, content = listing.list_src_files(export)
+    assert [path.name for path in content][2:4] == ["3.json", "4.json"]
+
+
+def test_cache_racy(export):
+    """Folders modified during the listing are not cached."""
+    (export / "content" / "5.json").write_text("{}")
+    listing.list_src_files(export)
+    assert not listing.cache_path(export.resolve()).exists()
@@ -31,3 +31,8 @@ class TestReportTime:
             pass
         # Start message is logged even if the body raises
         assert consoles.print_log.call_count >= 1
+
+
+class TestPeakRss:
+    def test_returns_bytes(self):
+        assert performance.peak_rss() > 1024 * 1024
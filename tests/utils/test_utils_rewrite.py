@@ -0,0 +1,97 @@
+from collective.transmute.utils import rewrite
+
+import pytest
+
+
+@pytest.fixture
+def rules() -> list[tuple[str, str]]:
+    """Cleanup rules, enough to be matched by the automaton."""
+    items = [(f"/old-{idx}/", f"/new-{idx}/") for idx in range(20)]
+    # Chained rules: the output of a rule is the source of a later one
+    items.extend([("/new-1/", "/newer-1/"), ("/_", "/"), ("er-1", "est-1")])
+    return items
+
+
+def _apply(rules: list[tuple[str, str]], path: str) -> str:
+    for src, rpl in rules:
+        if src in path:
+            path = path.replace(src, rpl)
+    return path
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "",
+        "/",
+        "/foo/bar",
+        "/old-1/item",
+        "/a/old-1/old-2/_item",
+        "/old-10/old-1/",
+        "/old-3//old-3/",
+        "/_/old-19/_new-1/",
+    ],
+)
+def test_replace_rules(rules, path: str):
+    replace_rules = rewrite.ReplaceRules(rules)
+    assert replace_rules._automaton is not None
+    assert replace_rules.apply(path) == _apply(rules, path)
+    # Paths sharing the same parent reuse its scan
+    assert replace_rules.apply(f"{path}/_child") == _apply(rules, f"{path}/_child")
+
+
+def test_replace_rules_parent_cache(rules):
+    replace_rules = rewrite.ReplaceRules(rules)
+    for idx in range(10):
+        replace_rules.apply(f"/old-1/folder/item-{idx}")
+    info = replace_rules._scan_parent.cache_info()
+    assert (info.hits, info.misses) == (9, 1)
+
+
+@pytest.mark.parametrize(
+    "path,start,expected",
+    [
+        ["/a/b/c", 0, 0],
+        ["/a/b/c", 1, 2],
+        ["/a/b/c", 3, None],
+        ["/x", 0, None],
+        ["", 0, None],
+    ],
+)
+def test_prefix_rules(path: str, start: int, expected: int | None):
+    prefix_rules = rewrite.PrefixRules(["/a", "/b", "/a/b", "/a/b/c/d"])
+    assert prefix_rules.match(path, start) == expected
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ["http://localhost:8080/Plone/foo", "/foo"],
+        ["http://localhost:8080/Plone", ""],
+        ["/foo", "/foo"],
+    ],
+)
+def test_remove_export_prefixes(transmute_settings, path: str, expected: str):
+    rewriter = rewrite.get_path_rewriter(transmute_settings)
+    assert rewriter.remove_export_prefixes(path) == expected
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ["/a", "/z"],
+        ["/a/b", "/y"],
+        ["/a/b/c", "/y/c"],
+        ["/ab/c", "/ab/c"],
+        ["/b", "/b"],
+    ],
+)
+def test_replace_prefixes(transmute_settings, path: str, expected: str):
+    rewriter = rewrite.get_path_rewriter(transmute_settings)
+    prefixes = (("/a/b", "/y"), ("/a", "/z"))
+    assert rewriter.replace_prefixes(path, prefixes) == expected
+
+
+def test_get_path_rewriter(transmute_settings):
+    rewriter = rewrite.get_path_rewriter(transmute_settings)
+    assert rewrite.get_path_rewriter(transmute_settings) is rewriter